@@ -5,8 +5,6 @@ import os
 from datetime import datetime, timedelta, timezone
 from typing import Iterable, List
 
-import requests
-
 from my_scalping_kabu_station_example.application.ports.feature_engine import FeatureVector
 from my_scalping_kabu_station_example.application.service.pipelines.inference_pipeline import InferencePipeline
 from my_scalping_kabu_station_example.application.service.state.stream_state import StreamState
@@ -36,12 +34,11 @@ from my_scalping_kabu_station_example.domain.market.orderbook_snapshot import Or
 from my_scalping_kabu_station_example.domain.market.time import Timestamp
 from my_scalping_kabu_station_example.domain.market.types import Quantity, Side, Symbol, price_key_from
 from my_scalping_kabu_station_example.infrastructure.compute.feature_engine_pandas import PandasOrderBookFeatureEngine
+from my_scalping_kabu_station_example.infrastructure.main.startup_profile import StartupProfile
 from my_scalping_kabu_station_example.infrastructure.memory.ring_buffer import InMemoryMarketBuffer
-from my_scalping_kabu_station_example.infrastructure.api.broker_client import BrokerClient, KabuOrderPort
 from my_scalping_kabu_station_example.infrastructure.memory.order_store import InMemoryOrderStore
 from my_scalping_kabu_station_example.infrastructure.persistence.csv_history_store import CsvHistoryStore
 from my_scalping_kabu_station_example.infrastructure.persistence.model_store_fs import ModelStoreFs
-from my_scalping_kabu_station_example.infrastructure.websocket.client import WebSocketClient
 from my_scalping_kabu_station_example.infrastructure.websocket.dto import OrderBookDto
 from my_scalping_kabu_station_example.infrastructure.websocket.mapper import to_domain
 
@@ -62,6 +59,8 @@ class SimpleMarketDataSource:
 
 class WebSocketMarketDataSource:
     def __init__(self, url: str, api_key: str | None = None) -> None:
+        from my_scalping_kabu_station_example.infrastructure.websocket.client import WebSocketClient
+
         self.client = WebSocketClient(url=url, api_key=api_key)
 
     def subscribe(self) -> None:
@@ -118,6 +117,8 @@ class FixedPositionPort:
 
 
 def _fetch_api_token(base_url: str, api_password: str) -> str:
+    import requests
+
     response = requests.post(
         f"{base_url}/token",
         json={"APIPassword": api_password},
@@ -179,6 +180,8 @@ def _mock_snapshots(count: int) -> List[OrderBookSnapshot]:
 
 
 def main() -> None:
+    target_ms = os.getenv("STARTUP_TARGET_MS")
+    startup = StartupProfile(target_ms=float(target_ms) if target_ms else None)
     api_base_url = os.getenv("KABU_API_BASE_URL", "http://localhost:18080/kabusapi")
     skip_auth = os.getenv("SKIP_KABU_AUTH", "").lower() in {"1", "true", "yes"}
     if not skip_auth:
@@ -226,6 +229,8 @@ def main() -> None:
             "ExpireDay": int(os.getenv("ORDER_EXPIRE_DAY", "0")),
             "FrontOrderType": int(os.getenv("ORDER_FRONT_ORDER_TYPE", "10")),
         }
+        from my_scalping_kabu_station_example.infrastructure.api.broker_client import BrokerClient, KabuOrderPort
+
         order_store = InMemoryOrderStore()
         broker_client = BrokerClient(base_url=api_base_url)
         order_port = KabuOrderPort(
@@ -257,6 +262,7 @@ def main() -> None:
     state = StreamState()
     for _ in range(max_iterations):
         pipeline.run_once(state)
+        startup.first_tick()
     if ws_url:
         market_data.close()
 
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import logging
 import os
+import signal
+import time
 from datetime import datetime, timedelta, timezone
 from typing import List
 
-import requests
-
+from application.service.order_handler import OrderHandler
 from application.service.pipelines.inference_pipeline import (
     InferencePipeline,
 )
@@ -45,18 +47,14 @@ from domain.market.types import (
     Symbol,
     price_key_from,
 )
-from infrastructure.api.auth_client import AuthClient
-from infrastructure.api.broker_client import (
-    BrokerClient,
-    KabuOrderPort,
-)
-from infrastructure.compute.feature_engine_pandas import (
-    PandasOrderBookFeatureEngine,
+from infrastructure.compute.feature_engine_factory import (
+    build_feature_engine,
 )
 from infrastructure.config.settings import load_settings
-from infrastructure.main.training_bootstrap import (
-    train_models_from_history,
-)
+from infrastructure.main.gc_control import GC_MODE_DEFAULT, GcController
+from infrastructure.main.sampling_profiler import SamplingProfiler
+from infrastructure.main.startup_profile import StartupProfile
+from infrastructure.main.warmup import WarmUp
 from infrastructure.memory.simple_broker import (
     FixedPositionPort,
     LoggingOrderPort,
@@ -64,9 +62,11 @@ from infrastructure.memory.simple_broker import (
 from infrastructure.memory.simple_market_data import (
     SimpleMarketDataSource,
 )
+from infrastructure.memory.metrics import InMemoryMetrics
 from infrastructure.memory.order_store import (
     InMemoryOrderStore,
 )
+from infrastructure.memory.position_ledger import PositionLedger
 from infrastructure.memory.ring_buffer import (
     InMemoryMarketBuffer,
 )
@@ -76,18 +76,16 @@ from infrastructure.persistence.csv_history_store import (
 from infrastructure.persistence.model_store_memory import (
     InMemoryModelStore,
 )
-from infrastructure.persistence.model_store_fs import (
-    ModelStoreFs,
-)
-from infrastructure.websocket.client import (
-    WebSocketClient,
-)
-from infrastructure.websocket.market_data import (
-    WebSocketMarketDataSource,
-)
+
+# Adapters with heavy dependencies (requests, websockets, numpy, xgboost) are
+# imported inside the branches that use them, so a mock run starts without them.
+
+logger = logging.getLogger(__name__)
 
 
 def _fetch_api_token(base_url: str, api_password: str) -> str:
+    import requests
+
     response = requests.post(
         f"{base_url}/token",
         json={"APIPassword": api_password},
@@ -152,34 +150,78 @@ def _mock_snapshots(count: int) -> List[OrderBookSnapshot]:
 
 
 def run_trader() -> None:
-    train_models_from_history()
+    metrics = InMemoryMetrics()
+    target_ms = os.getenv("STARTUP_TARGET_MS")
+    startup = StartupProfile(
+        target_ms=float(target_ms) if target_ms else None, metrics=metrics
+    )
+    feature_spec = _build_feature_spec()
+    startup_training = os.getenv("STARTUP_TRAINING", "background").lower()
+    background_trainer = None
+    if startup_training == "sync":
+        with startup.imports("training"):
+            from infrastructure.main.training_bootstrap import (
+                train_models_from_history,
+            )
+        with startup.phase("training"):
+            train_models_from_history(feature_spec=feature_spec, skip_existing=True)
     api_base_url = os.getenv("KABU_API_BASE_URL", "http://localhost:18081/kabusapi")
     skip_auth = os.getenv("SKIP_KABU_AUTH", "").lower() in {"1", "true", "yes"}
     if not skip_auth:
         api_password = os.getenv("KABU_API_PASSWORD")
         if not api_password:
             raise RuntimeError("KABU_API_PASSWORD is required to fetch API token")
-        token = _fetch_api_token(api_base_url, api_password)
+        with startup.phase("auth"):
+            token = _fetch_api_token(api_base_url, api_password)
         os.environ["KABU_API_TOKEN"] = token
 
     ws_url = os.getenv("WEBSOCKET_URL")
     max_iterations = int(os.getenv("MAX_ITERATIONS", "5"))
 
     if ws_url:
-        ws_client = WebSocketClient(url=ws_url, api_key=os.getenv("KABU_API_TOKEN"))
-        market_data = WebSocketMarketDataSource(client=ws_client)
-        market_data.subscribe()
+        with startup.imports("websocket"):
+            from infrastructure.websocket.client import (
+                WebSocketClient,
+            )
+            from infrastructure.websocket.market_data import (
+                WebSocketMarketDataSource,
+            )
+        with startup.phase("market data"):
+            ws_client = WebSocketClient(url=ws_url, api_key=os.getenv("KABU_API_TOKEN"))
+            market_data = WebSocketMarketDataSource(client=ws_client)
+            market_data.subscribe()
     else:
         market_data = SimpleMarketDataSource(_mock_snapshots(max_iterations))
 
-    history_store = CsvHistoryStore(path=os.getenv("HISTORY_PATH", "data/history.csv"))
+    with startup.phase("history store"):
+        history_store = CsvHistoryStore(
+            path=os.getenv("HISTORY_PATH", "data/history.csv"),
+            write_mode=os.getenv("HISTORY_WRITE_MODE", "full"),
+            keyframe_interval=int(os.getenv("HISTORY_KEYFRAME_INTERVAL", "100")),
+        )
     buffer = InMemoryMarketBuffer()
-    feature_engine = PandasOrderBookFeatureEngine()
+    with startup.phase("feature engine"):
+        feature_engine = build_feature_engine(
+            os.getenv("FEATURE_ENGINE", "pandas"),
+            codegen_dump_dir=os.getenv("FEATURE_CODEGEN_DUMP_DIR") or None,
+        )
     use_inmemory = os.getenv("USE_INMEMORY_MODEL", "").lower() in {"1", "true", "yes"}
+    model_symbols: List[Symbol] = []
     if use_inmemory:
         model_store = InMemoryModelStore()
     else:
-        model_store = ModelStoreFs(base_dir=os.getenv("MODEL_DIR", "models"))
+        with startup.imports("model store"):
+            from infrastructure.persistence.model_artifact_store import (
+                SymbolModelArtifactStore,
+            )
+        with startup.phase("model store"):
+            model_store = SymbolModelArtifactStore(
+                base_dir=os.getenv("MODEL_DIR", "models"),
+                spec=feature_spec,
+                # Background training replaces models of an outdated spec.
+                mismatch_as_missing=startup_training == "background",
+            )
+            model_symbols = [Symbol(name) for name in model_store.validate_all()]
     use_api_order = os.getenv("USE_API_ORDER", "").lower() in {"1", "true", "yes"}
     if use_api_order:
         api_token = os.getenv("KABU_API_TOKEN")
@@ -187,6 +229,19 @@ def run_trader() -> None:
             raise RuntimeError(
                 "KABU_API_TOKEN is required when USE_API_ORDER is enabled"
             )
+        with startup.imports("broker api"):
+            from infrastructure.api.broker_client import (
+                BrokerClient,
+                KabuOrderPort,
+            )
+            from infrastructure.api.order_gateway import AsyncOrderGateway
+            from infrastructure.api.order_status_poller import OrderStatusPoller
+            from infrastructure.api.position_reconciler import (
+                PositionReconciler,
+            )
+            from infrastructure.api.request_scheduler import (
+                kabu_request_scheduler,
+            )
         side_override_value = os.getenv("ORDER_SIDE_OVERRIDE", "").upper()
         side_override = None
         if side_override_value in {"BUY", "SELL"}:
@@ -204,20 +259,92 @@ def run_trader() -> None:
             "FrontOrderType": int(os.getenv("ORDER_FRONT_ORDER_TYPE", "10")),
         }
         order_store = InMemoryOrderStore()
-        broker_client = BrokerClient(base_url=api_base_url)
-        order_port = KabuOrderPort(
-            client=broker_client,
-            api_key=api_token,
-            base_payload=order_payload,
-            side_override=side_override,
+        position_port = PositionLedger()
+        journal = None
+        journal_dir = os.getenv("ORDER_JOURNAL_DIR")
+        if journal_dir:
+            with startup.imports("order journal"):
+                from infrastructure.persistence.order_journal import (
+                    JournaledOrderStore,
+                    JournaledPositionLedger,
+                    OrderJournal,
+                )
+            with startup.phase("order journal"):
+                journal = OrderJournal(
+                    directory=journal_dir,
+                    snapshot_every=int(
+                        os.getenv("ORDER_JOURNAL_SNAPSHOT_EVERY", "10000")
+                    ),
+                )
+                journal.recover(order_store, position_port)
+                journal.start()
+            order_store = JournaledOrderStore(order_store, journal)
+            position_port = JournaledPositionLedger(position_port, journal)
+        poll_max_wait = os.getenv("API_POLL_MAX_WAIT_SECONDS")
+        scheduler = kabu_request_scheduler(
+            order_rate=float(os.getenv("API_ORDER_RATE", "5")),
+            info_rate=float(os.getenv("API_INFO_RATE", "10")),
+            poll_max_wait_seconds=float(poll_max_wait) if poll_max_wait else None,
+        )
+        broker_client = BrokerClient(
+            base_url=api_base_url,
+            timeout_seconds=float(os.getenv("ORDER_HTTP_TIMEOUT_SECONDS", "5")),
+            scheduler=scheduler,
+        )
+        order_port = AsyncOrderGateway(
+            order_port=KabuOrderPort(
+                client=broker_client,
+                api_key=api_token,
+                base_payload=order_payload,
+                side_override=side_override,
+            ),
             order_store=order_store,
+            max_in_flight_per_symbol=int(os.getenv("ORDER_MAX_IN_FLIGHT", "1")),
+            max_queue_seconds=float(os.getenv("ORDER_QUEUE_TIMEOUT_SECONDS", "2")),
+            resolve_interval_seconds=float(os.getenv("ORDER_RESOLVE_SECONDS", "1")),
+            unknown_timeout_seconds=float(
+                os.getenv("ORDER_UNKNOWN_TIMEOUT_SECONDS", "30")
+            ),
+        )
+        order_poller = OrderStatusPoller(
+            handler=OrderHandler(
+                order_store=order_store,
+                broker_client=broker_client,
+                api_key=api_token,
+                position_ledger=position_port,
+            ),
+            interval_seconds=float(os.getenv("ORDER_POLL_SECONDS", "1")),
+            metrics=metrics,
+        )
+        order_poller.start()
+        reconciler = PositionReconciler(
+            ledger=position_port,
+            broker_client=broker_client,
+            api_key=api_token,
+            interval_seconds=float(os.getenv("POSITION_RECONCILE_SECONDS", "30")),
         )
+        reconciler.start()
     else:
+        order_store = None
         order_port = LoggingOrderPort()
-    position_port = FixedPositionPort()
-    feature_spec = _build_feature_spec()
+        position_port = FixedPositionPort()
     decision_policy = DecisionPolicy(score_threshold=0.0, lot_size=1.0)
     risk_params = RiskParams(max_position=1.0, stop_loss=1.0, take_profit=1.0)
+    warmup_steps = [("history writer", lambda: history_store.prepare(time.time_ns()))]
+    if use_api_order:
+        warmup_steps.append(
+            ("broker http", lambda: broker_client.list_positions(api_token))
+        )
+    warmup = WarmUp(
+        feature_engine=feature_engine,
+        model_store=model_store,
+        feature_spec=feature_spec,
+        decision_policy=decision_policy,
+        risk_params=risk_params,
+        symbols=model_symbols,
+        steps=warmup_steps,
+        ticks=int(os.getenv("WARMUP_TICKS", "30")),
+    )
     pipeline = InferencePipeline(
         market_data=market_data,
         history_store=history_store,
@@ -229,25 +356,92 @@ def run_trader() -> None:
         feature_spec=feature_spec,
         decision_policy=decision_policy,
         risk_params=risk_params,
+        order_state=order_store,
+        metrics=metrics,
+        ready=warmup.ready,
     )
+    warmup_mode = os.getenv("WARMUP_MODE", "sync").lower()
+    if warmup_mode == "sync":
+        with startup.phase("warm-up"):
+            warmup.run()
+    elif warmup_mode == "background":
+        warmup.start()
+    else:
+        warmup.ready.set()
 
+    gc_controller = GcController(
+        mode=os.getenv("GC_MODE", GC_MODE_DEFAULT).lower(),
+        idle_gap_seconds=float(os.getenv("GC_IDLE_GAP_SECONDS", "0.05")),
+        full_interval_seconds=float(os.getenv("GC_FULL_INTERVAL_SECONDS", "60")),
+        metrics=metrics,
+        publish_interval_seconds=float(os.getenv("GC_METRICS_INTERVAL_SECONDS", "10")),
+    )
+    with startup.phase("gc"):
+        gc_controller.start()
+    profiler = None
+    profile_dir = os.getenv("PROFILE_DIR")
+    if profile_dir:
+        control_file = os.getenv("PROFILE_CONTROL_FILE")
+        profiler = SamplingProfiler(
+            output_dir=profile_dir,
+            interval_seconds=float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000.0,
+            control_path=control_file or os.path.join(profile_dir, "profile.on"),
+            stage_of=lambda: pipeline.stage,
+        )
+        if hasattr(signal, "SIGUSR2"):
+            profiler.install_signal(signal.SIGUSR2)
+        profiler.start()
+    if startup_training == "background":
+        # Started only once startup succeeded: the training process is not a
+        # daemon, so an orphaned one would keep the interpreter from exiting.
+        with startup.imports("training"):
+            from infrastructure.main.background_training import (
+                BackgroundTrainer,
+            )
+        background_trainer = BackgroundTrainer(feature_spec=feature_spec)
+        background_trainer.start()
     state = StreamState()
-    if ws_url:
-        while True:
-            pipeline.run_once(state)
-    else:
-        for _ in range(max_iterations):
-            pipeline.run_once(state)
+    try:
+        if ws_url:
+            while True:
+                pipeline.run_once(state)
+                startup.first_tick()
+                gc_controller.safe_point()
+        else:
+            for _ in range(max_iterations):
+                pipeline.run_once(state)
+                startup.first_tick()
+                gc_controller.safe_point()
+    except BaseException:
+        if background_trainer is not None:
+            background_trainer.stop()
+        raise
+    gc_controller.stop()
+    logger.info("gc stats: %s", gc_controller.stats)
+    if profiler is not None:
+        profiler.stop()
     if ws_url:
         market_data.close()
+    if use_api_order:
+        order_poller.stop()
+        order_port.close()
+        reconciler.stop()
+        if journal is not None:
+            journal.close()
+    if background_trainer is not None:
+        background_trainer.wait()
 
 
 def main() -> None:
     settings = load_settings()
     api_password = os.environ.get("API_PASSWORD")
     if api_password and settings.api_base_url:
+        from infrastructure.api.auth_client import AuthClient
+
         token = AuthClient(base_url=settings.api_base_url).fetch_token(api_password)
         os.environ["X_API_KEY"] = token
+    from infrastructure.main.training_bootstrap import train_models_from_history
+
     train_models_from_history()
 
 
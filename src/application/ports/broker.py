@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Iterable, Protocol
 
-from domain.decision.signal import TradeIntent
+from domain.decision.signal import OrderSide, TradeIntent
 from domain.instruments.instrument import Instrument
 from domain.instruments.registry import InstrumentList
 from domain.market.types import Symbol
@@ -12,11 +12,18 @@ from domain.order.realtime_order import RealTimeOrder
 
 
 class OrderPort(Protocol):
-    def place_order(self, intent: TradeIntent) -> str: ...
+    # None: the intent was not placed (e.g. the symbol's in-flight limit).
+    def place_order(self, intent: TradeIntent) -> str | None: ...
 
 
 class PositionPort(Protocol):
-    def current_position(self) -> float: ...
+    def current_position(self, symbol: Symbol | None = None) -> float: ...
+
+
+class PositionLedgerPort(PositionPort, Protocol):
+    def record_fill(
+        self, order_id: str, symbol: Symbol, side: OrderSide, cum_qty: float
+    ) -> None: ...
 
 
 class OrderStatePort(Protocol):
@@ -28,6 +35,12 @@ class OrderStatePort(Protocol):
 
     def remove(self, order_id: str) -> bool: ...
 
+    def acknowledge(self, intent_id: str, order_id: str) -> bool: ...
+
+    def mark_unknown(self, intent_id: str) -> bool: ...
+
+    def reject(self, intent_id: str) -> bool: ...
+
 
 class InstrumentPort(Protocol):
     def list(self) -> InstrumentList: ...
@@ -0,0 +1,39 @@
+"""Feature cache port."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Protocol
+
+import numpy as np
+
+from domain.features.spec import FeatureSpec
+
+
+@dataclass
+class FeaturePartition:
+    """Unlabeled feature rows of one symbol and day, with the inputs labels need."""
+
+    feature_names: List[str]
+    features: np.ndarray
+    timestamps_ns: np.ndarray
+    mids: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.features.shape[0])
+
+
+class FeatureCachePort(Protocol):
+    def load(
+        self, spec: FeatureSpec, symbol: str, day: date, source_signature: str
+    ) -> FeaturePartition | None: ...
+
+    def store(
+        self,
+        spec: FeatureSpec,
+        symbol: str,
+        day: date,
+        source_signature: str,
+        partition: FeaturePartition,
+    ) -> None: ...
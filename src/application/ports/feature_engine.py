@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, Protocol, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, Protocol, Sequence, Tuple
 
 from domain.features.spec import FeatureSpec
 from domain.market.orderbook_snapshot import (
@@ -12,6 +12,9 @@ from application.service.state.feature_state import (
     FeatureState,
 )
 
+if TYPE_CHECKING:
+    import numpy as np
+
 FeatureVector = Dict[str, float]
 FeatureTable = Iterable[FeatureVector]
 
@@ -25,6 +28,29 @@ class FeatureEnginePort(Protocol):
         state: FeatureState | None,
     ) -> Tuple[FeatureVector, FeatureState]: ...
 
+    def advance_unchanged(
+        self,
+        spec: FeatureSpec,
+        features: FeatureVector,
+        now_snapshot: OrderBookSnapshot,
+        state: FeatureState,
+    ) -> Tuple[FeatureVector, FeatureState]:
+        """Refresh only time-dependent features of a book equal to the last two.
+
+        ``features`` must have been computed for the same book with an unchanged
+        previous book, so every other feature is known to be identical.
+        """
+        ...
+
     def compute_batch(
         self, spec: FeatureSpec, snapshots: Iterable[OrderBookSnapshot]
     ) -> FeatureTable: ...
+
+    def compute_matrix(
+        self,
+        spec: FeatureSpec,
+        snapshots: Sequence[OrderBookSnapshot],
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Fill a ``(len(snapshots), len(spec.features))`` matrix in spec order."""
+        ...
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Iterable, Protocol
+from typing import Iterable, Iterator, Protocol
 
 from domain.market.orderbook_snapshot import (
     OrderBookSnapshot,
@@ -16,3 +16,9 @@ class HistoryStorePort(Protocol):
     def read_range(
         self, start: datetime, end: datetime
     ) -> Iterable[OrderBookSnapshot]: ...
+
+    def iter_range(
+        self, start: datetime, end: datetime, symbol: str | None = None
+    ) -> Iterator[OrderBookSnapshot]: ...
+
+    def source_signature(self, start: datetime, end: datetime) -> str: ...
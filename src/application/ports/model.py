@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Iterable, Protocol
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Protocol
 
 from domain.features.spec import FeatureSpec
 from domain.decision.signal import InferenceResult
@@ -10,13 +10,26 @@ from application.ports.feature_engine import (
     FeatureVector,
 )
 
+if TYPE_CHECKING:
+    from application.service.dataset import TrainingDataset
+
 
 class ModelPredictorPort(Protocol):
     def predict(self, features: dict[str, float]) -> InferenceResult: ...
 
 
 class ModelTrainerPort(Protocol):
-    def train(self, spec: FeatureSpec, dataset: Iterable[FeatureVector]) -> Any: ...
+    def train(
+        self,
+        spec: FeatureSpec,
+        dataset: "TrainingDataset | Iterable[FeatureVector]",
+    ) -> Any: ...
+
+    def train_chunks(
+        self,
+        spec: FeatureSpec,
+        chunks: Callable[[], Iterable["TrainingDataset"]],
+    ) -> Any: ...
 
 
 class ModelStorePort(Protocol):
@@ -2,31 +2,200 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
-from typing import Iterable, List
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Sequence
 
+import numpy as np
+
+from application.ports.feature_cache import (
+    FeatureCachePort,
+    FeaturePartition,
+)
 from application.ports.feature_engine import (
     FeatureEnginePort,
+    FeatureVector,
 )
 from application.ports.history import HistoryStorePort
+from application.service.labeling import (
+    LabelSpec,
+    compute_labels,
+    snapshot_arrays,
+)
 from domain.features.spec import FeatureSpec
 from domain.market.orderbook_snapshot import (
     OrderBookSnapshot,
 )
+from domain.market.time import day_bounds
+
+
+@dataclass
+class TrainingDataset:
+    """Dense feature matrix with labels and timestamps aligned by row.
+
+    ``features`` is C-contiguous with columns in ``feature_names`` order.
+    ``labels`` is the training target (None when the rows are unlabeled) and
+    ``label_columns`` keeps every computed label column for horizon sweeps.
+    """
+
+    feature_names: List[str]
+    features: np.ndarray
+    timestamps_ns: np.ndarray
+    labels: np.ndarray | None = None
+    label_columns: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return int(self.features.shape[0])
+
+    def select(self, rows: np.ndarray) -> "TrainingDataset":
+        """Return the subset selected by a boolean mask or index array."""
+
+        return TrainingDataset(
+            feature_names=self.feature_names,
+            features=np.ascontiguousarray(self.features[rows]),
+            timestamps_ns=self.timestamps_ns[rows],
+            labels=None if self.labels is None else self.labels[rows],
+            label_columns={
+                name: column[rows] for name, column in self.label_columns.items()
+            },
+        )
+
+    def for_label(self, column: str) -> "TrainingDataset":
+        """Use ``column`` as the target and drop rows where it is undefined."""
+
+        target = self.label_columns[column]
+        dataset = self.select(~np.isnan(target))
+        dataset.labels = dataset.label_columns[column]
+        return dataset
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[FeatureVector],
+        feature_names: Sequence[str],
+        label_key: str = "label",
+        dtype: type = np.float32,
+    ) -> "TrainingDataset":
+        """Adapt dict rows; labels are None unless every row carries one."""
+
+        row_list = list(rows)
+        names = list(feature_names)
+        features = np.zeros((len(row_list), len(names)), dtype=dtype)
+        labels = np.empty(len(row_list), dtype=np.float64)
+        has_labels = True
+        for i, row in enumerate(row_list):
+            features[i] = [row.get(name, 0.0) for name in names]
+            label = row.get(label_key)
+            if label is None:
+                has_labels = False
+            else:
+                labels[i] = label
+        return cls(
+            feature_names=names,
+            features=features,
+            timestamps_ns=np.zeros(len(row_list), dtype=np.int64),
+            labels=labels if has_labels else None,
+        )
 
 
 class DatasetBuilder:
     def __init__(
-        self, history_store: HistoryStorePort, feature_engine: FeatureEnginePort
+        self,
+        history_store: HistoryStorePort,
+        feature_engine: FeatureEnginePort,
+        feature_cache: FeatureCachePort | None = None,
     ) -> None:
         self.history_store = history_store
         self.feature_engine = feature_engine
+        self.feature_cache = feature_cache
 
     def build(self, spec: FeatureSpec, snapshots: Iterable[OrderBookSnapshot]):
         """Compute feature vectors for the provided snapshots."""
 
         return list(self.feature_engine.compute_batch(spec, snapshots))
 
+    def build_labeled_columns(
+        self,
+        spec: FeatureSpec,
+        snapshots: Iterable[OrderBookSnapshot],
+        label_specs: Sequence[LabelSpec],
+        dtype: type = np.float32,
+    ) -> TrainingDataset:
+        """Compute the feature matrix once and every requested label column."""
+
+        snapshot_list = _sorted_snapshots(snapshots)
+        features = np.empty((len(snapshot_list), len(spec.features)), dtype=dtype)
+        self.feature_engine.compute_matrix(spec, snapshot_list, out=features)
+        timestamps_ns, mids = snapshot_arrays(snapshot_list)
+        return TrainingDataset(
+            feature_names=[feature.name for feature in spec.features],
+            features=features,
+            timestamps_ns=timestamps_ns,
+            label_columns=compute_labels(timestamps_ns, mids, label_specs),
+        )
+
+    def build_day_columns(
+        self,
+        spec: FeatureSpec,
+        symbol: str,
+        day: date,
+        label_specs: Sequence[LabelSpec],
+    ) -> TrainingDataset:
+        """Like ``build_labeled_columns`` for one symbol-day read from history.
+
+        Features come from the feature cache when it holds the day for this spec
+        and the day's history files are unchanged; otherwise they are computed
+        and written back. Labels are always recomputed, so label sweeps are cheap.
+        """
+
+        partition = self.feature_partition(spec, symbol, day)
+        return TrainingDataset(
+            feature_names=partition.feature_names,
+            features=partition.features,
+            timestamps_ns=partition.timestamps_ns,
+            label_columns=compute_labels(
+                partition.timestamps_ns, partition.mids, label_specs
+            ),
+        )
+
+    def feature_partition(
+        self, spec: FeatureSpec, symbol: str, day: date
+    ) -> FeaturePartition:
+        start, end = day_bounds(day)
+        signature = ""
+        if self.feature_cache is not None:
+            signature = self.history_store.source_signature(start, end)
+            cached = self.feature_cache.load(spec, symbol, day, signature)
+            if cached is not None:
+                return cached
+
+        snapshot_list = _sorted_snapshots(
+            self.history_store.iter_range(start, end, symbol=symbol)
+        )
+        features = self.feature_engine.compute_matrix(spec, snapshot_list)
+        timestamps_ns, mids = snapshot_arrays(snapshot_list)
+        partition = FeaturePartition(
+            feature_names=[feature.name for feature in spec.features],
+            features=features,
+            timestamps_ns=timestamps_ns,
+            mids=mids,
+        )
+        if self.feature_cache is not None and len(partition):
+            self.feature_cache.store(spec, symbol, day, signature, partition)
+        return partition
+
+    def build_dataset(
+        self,
+        spec: FeatureSpec,
+        snapshots: Iterable[OrderBookSnapshot],
+        label_spec: LabelSpec,
+        dtype: type = np.float32,
+    ) -> TrainingDataset:
+        """Build a training dataset targeting ``label_spec``."""
+
+        dataset = self.build_labeled_columns(spec, snapshots, [label_spec], dtype)
+        return dataset.for_label(label_spec.column)
+
     def build_with_labels(
         self,
         spec: FeatureSpec,
@@ -35,41 +204,24 @@ class DatasetBuilder:
     ) -> List[dict[str, float]]:
         """Compute feature vectors with binary labels based on future mid moves."""
 
-        snapshot_list = sorted(list(snapshots), key=lambda snap: snap.ts)
+        label_spec = LabelSpec(horizon_seconds=horizon_seconds)
+        snapshot_list = _sorted_snapshots(snapshots)
         features = list(self.feature_engine.compute_batch(spec, snapshot_list))
-        labels = _labels_from_future(snapshot_list, horizon_seconds)
-        labeled_rows: List[dict[str, float]] = []
-        for row, label in zip(features, labels):
-            if label is None:
-                continue
-            enriched = dict(row)
-            enriched["label"] = float(label)
-            labeled_rows.append(enriched)
-        return labeled_rows
-
-
-def _labels_from_future(
-    snapshots: List[OrderBookSnapshot],
-    horizon_seconds: float,
-) -> List[int | None]:
-    if horizon_seconds <= 0:
-        raise ValueError("horizon_seconds must be positive")
-
-    labels: List[int | None] = [None] * len(snapshots)
-    j = 0
-    for i, snap in enumerate(snapshots):
-        target_time = snap.ts + timedelta(seconds=horizon_seconds)
-        if j < i + 1:
-            j = i + 1
-        while j < len(snapshots) and snapshots[j].ts < target_time:
-            j += 1
-        if j >= len(snapshots):
-            labels[i] = None
-            continue
-        now_mid = snap.mid
-        future_mid = snapshots[j].mid
-        if now_mid is None or future_mid is None:
-            labels[i] = None
-            continue
-        labels[i] = 1 if float(future_mid) > float(now_mid) else 0
-    return labels
+        timestamps_ns, mids = snapshot_arrays(snapshot_list)
+        labels = compute_labels(timestamps_ns, mids, [label_spec])[label_spec.column]
+        return [
+            {**features[i], "label": float(labels[i])}
+            for i in np.flatnonzero(~np.isnan(labels))
+        ]
+
+
+def _sorted_snapshots(
+    snapshots: Iterable[OrderBookSnapshot],
+) -> List[OrderBookSnapshot]:
+    snapshot_list = list(snapshots)
+    if any(
+        later.ts_ns < earlier.ts_ns
+        for earlier, later in zip(snapshot_list, snapshot_list[1:])
+    ):
+        snapshot_list.sort(key=lambda snap: snap.ts_ns)
+    return snapshot_list
@@ -0,0 +1,114 @@
+"""Vectorized future-mid labeling over timestamp and mid arrays."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from domain.market.orderbook_snapshot import (
+    OrderBookSnapshot,
+)
+from domain.market.time import NS_PER_SECOND
+
+LABEL_UPDOWN = "updown"
+LABEL_TERNARY = "ternary"
+LABEL_RETURN = "return"
+_LABEL_KINDS = {LABEL_UPDOWN, LABEL_TERNARY, LABEL_RETURN}
+
+
+@dataclass(frozen=True)
+class LabelSpec:
+    """One label column: ``kind`` of the mid move after ``horizon_seconds``.
+
+    * updown: 1.0 if the future mid is above the current mid, else 0.0
+    * ternary: +1/-1 outside a ``dead_band`` on the forward return, else 0
+    * return: forward return ``future_mid / mid - 1``
+
+    Rows without a future snapshot or without a mid are NaN.
+    """
+
+    horizon_seconds: float
+    kind: str = LABEL_UPDOWN
+    dead_band: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.horizon_seconds <= 0:
+            raise ValueError("horizon_seconds must be positive")
+        if self.kind not in _LABEL_KINDS:
+            raise ValueError(f"Unsupported label kind: {self.kind}")
+        if self.dead_band < 0:
+            raise ValueError("dead_band must be non-negative")
+
+    @property
+    def column(self) -> str:
+        return f"label_{self.kind}_{self.horizon_seconds:g}s"
+
+    @property
+    def horizon_ns(self) -> int:
+        return int(round(self.horizon_seconds * NS_PER_SECOND))
+
+
+def snapshot_arrays(
+    snapshots: Sequence[OrderBookSnapshot],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(timestamps_ns, mids)`` arrays; missing mids become NaN."""
+
+    n_rows = len(snapshots)
+    timestamps_ns = np.empty(n_rows, dtype=np.int64)
+    mids = np.empty(n_rows, dtype=np.float64)
+    for i, snap in enumerate(snapshots):
+        timestamps_ns[i] = snap.ts_ns
+        mids[i] = math.nan if snap.mid is None else float(snap.mid)
+    return timestamps_ns, mids
+
+
+def future_indices(timestamps_ns: np.ndarray, horizon_ns: int) -> np.ndarray:
+    """Index of the first later row at or after ``ts + horizon``, or -1 if none."""
+
+    n_rows = timestamps_ns.shape[0]
+    idx = np.searchsorted(timestamps_ns, timestamps_ns + horizon_ns, side="left")
+    idx = np.maximum(idx, np.arange(1, n_rows + 1))
+    idx[idx >= n_rows] = -1
+    return idx
+
+
+def compute_labels(
+    timestamps_ns: np.ndarray, mids: np.ndarray, specs: Sequence[LabelSpec]
+) -> Dict[str, np.ndarray]:
+    """Compute every label column in one pass per distinct horizon.
+
+    ``timestamps_ns`` must be sorted ascending; ``mids`` uses NaN for missing mids.
+    """
+
+    timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+    mids = np.asarray(mids, dtype=np.float64)
+    forward_returns: Dict[int, np.ndarray] = {}
+    columns: Dict[str, np.ndarray] = {}
+    for spec in specs:
+        fwd = forward_returns.get(spec.horizon_ns)
+        if fwd is None:
+            idx = future_indices(timestamps_ns, spec.horizon_ns)
+            future_mid = np.where(idx >= 0, mids[np.maximum(idx, 0)], np.nan)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                fwd = future_mid / mids - 1.0
+            fwd[~np.isfinite(fwd)] = np.nan
+            forward_returns[spec.horizon_ns] = fwd
+        columns[spec.column] = _label_from_return(fwd, spec)
+    return columns
+
+
+def _label_from_return(fwd: np.ndarray, spec: LabelSpec) -> np.ndarray:
+    if spec.kind == LABEL_RETURN:
+        return fwd.copy()
+    valid = ~np.isnan(fwd)
+    if spec.kind == LABEL_UPDOWN:
+        label = (fwd > 0).astype(np.float64)
+    else:
+        label = np.where(
+            fwd > spec.dead_band, 1.0, np.where(fwd < -spec.dead_band, -1.0, 0.0)
+        )
+    label[~valid] = math.nan
+    return label
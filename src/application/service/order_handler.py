@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
-from typing import Iterable, Mapping
+from typing import TYPE_CHECKING, Iterable, Mapping
 
-from application.ports.broker import OrderStatePort
-from infrastructure.api.broker_client import (
-    BrokerClient,
-)
+from application.ports.broker import OrderStatePort, PositionLedgerPort
+
+if TYPE_CHECKING:
+    from infrastructure.api.broker_client import BrokerClient
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -16,16 +19,47 @@ class OrderHandler:
     order_store: OrderStatePort
     broker_client: BrokerClient
     api_key: str
+    position_ledger: PositionLedgerPort | None = None
 
-    def refresh(self) -> None:
-        """Poll order status and update in-memory state."""
+    def refresh(self) -> int:
+        """Poll order status, update in-memory state and feed fills to the ledger.
 
+        Blocks on one ``/orders`` call per open order, so run it off the tick
+        path. A failed lookup is logged and skipped; returns how many failed.
+        """
+
+        failed = 0
         for order in list(self.order_store.list()):
-            orders = self.broker_client.list_orders(self.api_key, order.order_id)
+            if order.is_pending or order.is_filled:
+                continue
+            try:
+                orders = self.broker_client.list_orders(self.api_key, order.order_id)
+            except Exception:
+                logger.warning("polling order %s failed", order.order_id, exc_info=True)
+                failed += 1
+                continue
+            if self.position_ledger is not None:
+                cum_qty = self._cum_qty(orders, order.order_id)
+                if cum_qty:
+                    self.position_ledger.record_fill(
+                        order.order_id, order.symbol, order.side, cum_qty
+                    )
             if self._is_filled(orders, order.order_id):
                 self.order_store.mark_filled(order.order_id)
                 if order.cash_margin == 3:
                     self.order_store.remove(order.order_id)
+        return failed
+
+    @staticmethod
+    def _cum_qty(orders: Iterable[Mapping[str, object]], order_id: str) -> float:
+        for entry in orders:
+            if str(entry.get("ID")) != order_id:
+                continue
+            try:
+                return float(entry.get("CumQty") or 0.0)
+            except (TypeError, ValueError):
+                continue
+        return 0.0
 
     @staticmethod
     def _is_filled(orders: Iterable[Mapping[str, object]], order_id: str) -> bool:
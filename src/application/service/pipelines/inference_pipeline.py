@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import threading
+
 from application.ports.buffer import MarketBufferPort
 from application.ports.feature_engine import (
     FeatureEnginePort,
@@ -16,17 +18,26 @@ from application.ports.broker import (
 from application.ports.market_data import (
     MarketDataSourcePort,
 )
+from application.ports.metrics import MetricsPort
 from domain.decision.policy import DecisionPolicy
 from domain.decision.risk import RiskParams
 from domain.decision.signal import DecisionContext
 from domain.features.spec import FeatureSpec
 from application.service.state.stream_state import (
+    InferenceMemo,
     StreamState,
 )
 from application.service.order_handler import (
     OrderHandler,
 )
 
+STAGE_IDLE = "idle"
+STAGE_INGEST = "ingest"
+STAGE_PERSIST = "persist"
+STAGE_FEATURES = "features"
+STAGE_PREDICT = "predict"
+STAGE_ORDER = "order"
+
 
 class InferencePipeline:
     def __init__(
@@ -43,6 +54,8 @@ class InferencePipeline:
         risk_params: RiskParams,
         order_state: OrderStatePort | None = None,
         order_handler: OrderHandler | None = None,
+        metrics: MetricsPort | None = None,
+        ready: threading.Event | None = None,
     ) -> None:
         self.market_data = market_data
         self.history_store = history_store
@@ -56,16 +69,41 @@ class InferencePipeline:
         self.decision_policy = decision_policy
         self.risk_params = risk_params
         self.order_handler = order_handler
+        self.metrics = metrics
+        # Until set (warm-up finished) ticks are ingested but not traded.
+        self.ready = ready
+        # Current stage of run_once, read by the sampling profiler.
+        self.stage = STAGE_IDLE
 
     def run_once(self, state: StreamState) -> None:
         """One inference iteration following normalize -> persist -> features -> predict -> decide -> order."""
 
+        try:
+            self._run_once(state)
+        finally:
+            self.stage = STAGE_IDLE
+
+    def _run_once(self, state: StreamState) -> None:
+        self.stage = STAGE_INGEST
         snapshot = self.market_data.receive()
         prev_snapshot = self.buffer.get_prev()
+        fingerprint = snapshot.book_fingerprint()
+        book_unchanged = (
+            prev_snapshot is not None
+            and state.book_fingerprint == fingerprint
+            and snapshot.same_book_as(prev_snapshot)
+        )
+        state.book_fingerprint = fingerprint
+        self.stage = STAGE_PERSIST
         self.history_store.append(snapshot)
         self.buffer.update(snapshot)
+        self.stage = STAGE_ORDER
         if self.order_handler is not None:
             self.order_handler.refresh()
+        if self.ready is not None and not self.ready.is_set():
+            self._incr("inference.warming_up")
+            state.prev_snapshot = snapshot
+            return
 
         open_order = None
         if self.order_state is not None:
@@ -75,6 +113,8 @@ class InferencePipeline:
                 if order.symbol == snapshot.symbol
             ]
             if symbol_orders:
+                # Also for an unacknowledged order: the order port decides
+                # whether the symbol has room for another in-flight order.
                 open_order = symbol_orders[-1]
                 best_bid = snapshot.best_bid_price
                 best_ask = snapshot.best_ask_price
@@ -84,7 +124,7 @@ class InferencePipeline:
                     if spread > 0:
                         pip_size = spread
                 context = DecisionContext(
-                    position_size=self.position_port.current_position(),
+                    position_size=self.position_port.current_position(snapshot.symbol),
                     risk_budget=self.risk_params.max_position,
                     symbol=snapshot.symbol,
                     price=float(snapshot.mid or 0.0),
@@ -94,12 +134,15 @@ class InferencePipeline:
                     open_order_price=open_order.price,
                     open_order_qty=open_order.qty,
                 )
-                exit_intent = self.decision_policy.exit_intent(context, self.risk_params)
+                exit_intent = self.decision_policy.exit_intent(
+                    context, self.risk_params
+                )
                 if exit_intent is not None:
                     self.order_port.place_order(exit_intent)
                 state.prev_snapshot = snapshot
                 return
 
+        self.stage = STAGE_PREDICT
         try:
             load_active_for = getattr(self.model_store, "load_active_for", None)
             if load_active_for is not None:
@@ -113,33 +156,70 @@ class InferencePipeline:
             state.prev_snapshot = snapshot
             return
 
-        features, feature_state = self.feature_engine.compute_one(
-            spec=self.feature_spec,
-            prev_snapshot=prev_snapshot,
-            now_snapshot=snapshot,
-            state=state.feature_state,
+        self.stage = STAGE_FEATURES
+        memo = state.memo
+        # Fast path: the last features were computed for this very book with an
+        # unchanged predecessor, so only time-decayed features can differ.
+        fast_path = (
+            book_unchanged
+            and memo is not None
+            and memo.stable
+            and memo.snapshot is prev_snapshot
         )
+        if fast_path:
+            features, feature_state = self.feature_engine.advance_unchanged(
+                spec=self.feature_spec,
+                features=memo.features,
+                now_snapshot=snapshot,
+                state=state.feature_state,
+            )
+            self._incr("inference.book_unchanged")
+        else:
+            features, feature_state = self.feature_engine.compute_one(
+                spec=self.feature_spec,
+                prev_snapshot=prev_snapshot,
+                now_snapshot=snapshot,
+                state=state.feature_state,
+            )
+
+        self.stage = STAGE_PREDICT
+        if fast_path and memo.predictor is predictor and features == memo.features:
+            inference = memo.inference
+            self._incr("inference.prediction_reused")
+        else:
+            inference = predictor.predict(features)
 
-        inference = predictor.predict(features)
-
-        best_bid = snapshot.best_bid_price
-        best_ask = snapshot.best_ask_price
-        pip_size = 1.0
-        if best_bid is not None and best_ask is not None:
-            spread = float(best_ask) - float(best_bid)
-            if spread > 0:
-                pip_size = spread
-
-        context = DecisionContext(
-            position_size=self.position_port.current_position(),
-            risk_budget=self.risk_params.max_position,
-            symbol=snapshot.symbol,
-            price=float(snapshot.mid or 0.0),
-            pip_size=pip_size,
-            has_open_order=open_order is not None,
-            open_order_side=open_order.side if open_order else None,
-            open_order_price=open_order.price if open_order else None,
-            open_order_qty=open_order.qty if open_order else None,
+        self.stage = STAGE_ORDER
+        position_size = self.position_port.current_position(snapshot.symbol)
+        if fast_path and memo.context.position_size == position_size:
+            context = memo.context
+        else:
+            best_bid = snapshot.best_bid_price
+            best_ask = snapshot.best_ask_price
+            pip_size = 1.0
+            if best_bid is not None and best_ask is not None:
+                spread = float(best_ask) - float(best_bid)
+                if spread > 0:
+                    pip_size = spread
+
+            context = DecisionContext(
+                position_size=position_size,
+                risk_budget=self.risk_params.max_position,
+                symbol=snapshot.symbol,
+                price=float(snapshot.mid or 0.0),
+                pip_size=pip_size,
+                has_open_order=open_order is not None,
+                open_order_side=open_order.side if open_order else None,
+                open_order_price=open_order.price if open_order else None,
+                open_order_qty=open_order.qty if open_order else None,
+            )
+        state.memo = InferenceMemo(
+            snapshot=snapshot,
+            features=features,
+            stable=book_unchanged,
+            predictor=predictor,
+            inference=inference,
+            context=context,
         )
         intent = self.decision_policy.decide(
             inference=inference, context=context, risk=self.risk_params
@@ -149,3 +229,7 @@ class InferencePipeline:
 
         state.prev_snapshot = snapshot
         state.feature_state = feature_state
+
+    def _incr(self, name: str) -> None:
+        if self.metrics is not None:
+            self.metrics.incr(name)
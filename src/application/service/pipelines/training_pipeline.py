@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+from datetime import date
+from typing import Dict, Iterable, Sequence
 
+from application.ports.feature_cache import FeatureCachePort
 from application.ports.feature_engine import (
     FeatureEnginePort,
 )
@@ -12,11 +14,13 @@ from application.ports.model import (
     ModelStorePort,
     ModelTrainerPort,
 )
-from application.service.dataset import DatasetBuilder
+from application.service.dataset import DatasetBuilder, TrainingDataset
+from application.service.labeling import LabelSpec
 from domain.features.spec import FeatureSpec
 from domain.market.orderbook_snapshot import (
     OrderBookSnapshot,
 )
+from domain.market.time import Timestamp, from_epoch_ns
 
 
 class TrainingPipeline:
@@ -27,24 +31,81 @@ class TrainingPipeline:
         trainer: ModelTrainerPort,
         model_store: ModelStorePort,
         label_horizon_seconds: float = 10.0,
+        feature_cache: FeatureCachePort | None = None,
     ) -> None:
         self.history_store = history_store
         self.feature_engine = feature_engine
         self.trainer = trainer
         self.model_store = model_store
         self.label_horizon_seconds = label_horizon_seconds
+        self.feature_cache = feature_cache
 
     def run(self, spec: FeatureSpec, snapshots: Iterable[OrderBookSnapshot]) -> None:
         """Train a model from snapshots and activate the resulting predictor."""
 
-        builder = DatasetBuilder(
-            history_store=self.history_store, feature_engine=self.feature_engine
-        )
-        dataset = builder.build_with_labels(
+        snapshot_list = list(snapshots)
+        dataset = self._builder().build_dataset(
             spec=spec,
-            snapshots=snapshots,
-            horizon_seconds=self.label_horizon_seconds,
+            snapshots=snapshot_list,
+            label_spec=LabelSpec(horizon_seconds=self.label_horizon_seconds),
         )
         predictor = self.trainer.train(spec, dataset)
+        span: Dict[str, Timestamp] = {}
+        if snapshot_list:
+            _extend_span(
+                span,
+                min(s.ts for s in snapshot_list),
+                max(s.ts for s in snapshot_list),
+            )
+        self._activate(predictor, span)
+
+    def run_days(self, spec: FeatureSpec, symbol: str, days: Sequence[date]) -> int:
+        """Train ``symbol`` on history ``days`` through the feature cache.
+
+        Returns the number of snapshot rows featurized (or read from cache).
+        """
+
+        builder = self._builder()
+        label_spec = LabelSpec(horizon_seconds=self.label_horizon_seconds)
+        span: Dict[str, Timestamp] = {}
+        rows: Dict[date, int] = {}
+
+        def day_dataset(day: date) -> TrainingDataset:
+            columns = builder.build_day_columns(spec, symbol, day, [label_spec])
+            rows[day] = len(columns)
+            if len(columns):
+                _extend_span(
+                    span,
+                    from_epoch_ns(int(columns.timestamps_ns[0])),
+                    from_epoch_ns(int(columns.timestamps_ns[-1])),
+                )
+            return columns.for_label(label_spec.column)
+
+        if len(days) == 1:
+            predictor = self.trainer.train(spec, day_dataset(days[0]))
+        else:
+            predictor = self.trainer.train_chunks(
+                spec, lambda: (day_dataset(day) for day in days)
+            )
+        self._activate(predictor, span)
+        return sum(rows.values())
+
+    def _builder(self) -> DatasetBuilder:
+        return DatasetBuilder(
+            history_store=self.history_store,
+            feature_engine=self.feature_engine,
+            feature_cache=self.feature_cache,
+        )
+
+    def _activate(self, predictor: object, span: Dict[str, Timestamp]) -> None:
+        metadata = getattr(predictor, "metadata", None)
+        if isinstance(metadata, dict) and span:
+            metadata["training_start"] = span["start"].isoformat()
+            metadata["training_end"] = span["end"].isoformat()
         self.model_store.save_candidate(predictor)
         self.model_store.swap_active(predictor)
+
+
+def _extend_span(span: Dict[str, Timestamp], first: Timestamp, last: Timestamp) -> None:
+    span["start"] = min(span.get("start", first), first)
+    span["end"] = max(span.get("end", last), last)
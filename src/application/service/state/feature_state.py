@@ -3,12 +3,24 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
-from domain.market.time import Timestamp
+from domain.features.expr import RollingWindow
+from domain.features.rolling import RollingAccumulator
+from domain.market.time import Timestamp, from_epoch_ns
 
 
 @dataclass
 class FeatureState:
-    last_ts: Optional[Timestamp] = None
+    last_ts_ns: Optional[int] = None
     ema_values: Dict[str, float] = field(default_factory=dict)
+    # Mutable per-node window accumulators, keyed by (feature name, node).
+    windows: Dict[Tuple[str, RollingWindow], RollingAccumulator] = field(
+        default_factory=dict
+    )
+
+    @property
+    def last_ts(self) -> Optional[Timestamp]:
+        if self.last_ts_ns is None:
+            return None
+        return from_epoch_ns(self.last_ts_ns)
@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Dict, Optional
 
+from domain.decision.signal import DecisionContext, InferenceResult
 from domain.market.orderbook_snapshot import (
     OrderBookSnapshot,
 )
@@ -13,7 +14,25 @@ from application.service.state.feature_state import (
 )
 
 
+@dataclass
+class InferenceMemo:
+    """Features, inference and context of the last evaluated tick.
+
+    ``stable`` marks features computed for a book equal to its predecessor,
+    which is what the unchanged-book fast path can build on.
+    """
+
+    snapshot: OrderBookSnapshot
+    features: Dict[str, float]
+    stable: bool
+    predictor: object
+    inference: InferenceResult
+    context: DecisionContext
+
+
 @dataclass
 class StreamState:
     prev_snapshot: Optional[OrderBookSnapshot] = None
     feature_state: FeatureState = field(default_factory=FeatureState)
+    book_fingerprint: Optional[int] = None
+    memo: Optional[InferenceMemo] = None
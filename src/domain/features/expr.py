@@ -131,3 +131,77 @@ class TimeDecayEma(Expr):
 
     def describe(self) -> str:
         return f"TimeDecayEma(tau={self.tau_seconds}, source={self.source.describe()})"
+
+
+ROLLING_OPS = ("sum", "mean", "std", "min", "max")
+
+
+@dataclass(frozen=True)
+class RollingWindow(Expr):
+    """Aggregate of ``source`` over the last ``ticks`` rows or ``seconds``.
+
+    Time windows cover ``(now - seconds, now]``.
+    """
+
+    source: Expr
+    op: str
+    ticks: int | None = None
+    seconds: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.op not in ROLLING_OPS:
+            raise ValueError(f"Unsupported rolling op: {self.op}")
+        if (self.ticks is None) == (self.seconds is None):
+            raise ValueError("Exactly one of ticks or seconds must be set")
+        if self.ticks is not None and self.ticks <= 0:
+            raise ValueError("ticks must be positive")
+        if self.seconds is not None and self.seconds <= 0:
+            raise ValueError("seconds must be positive")
+
+    def describe(self) -> str:
+        window = (
+            f"ticks={self.ticks}"
+            if self.ticks is not None
+            else f"seconds={self.seconds}"
+        )
+        return f"Rolling{self.op.title()}({window}, source={self.source.describe()})"
+
+
+def RollingSum(
+    source: Expr, ticks: int | None = None, seconds: float | None = None
+) -> RollingWindow:
+    return RollingWindow(source, "sum", ticks, seconds)
+
+
+def RollingMean(
+    source: Expr, ticks: int | None = None, seconds: float | None = None
+) -> RollingWindow:
+    return RollingWindow(source, "mean", ticks, seconds)
+
+
+def RollingStd(
+    source: Expr, ticks: int | None = None, seconds: float | None = None
+) -> RollingWindow:
+    return RollingWindow(source, "std", ticks, seconds)
+
+
+def RollingMin(
+    source: Expr, ticks: int | None = None, seconds: float | None = None
+) -> RollingWindow:
+    return RollingWindow(source, "min", ticks, seconds)
+
+
+def RollingMax(
+    source: Expr, ticks: int | None = None, seconds: float | None = None
+) -> RollingWindow:
+    return RollingWindow(source, "max", ticks, seconds)
+
+
+def is_time_dependent(expr: Expr) -> bool:
+    """Whether ``expr`` can change between ticks even when the book does not."""
+
+    if isinstance(expr, (TimeDecayEma, RollingWindow)):
+        return True
+    if isinstance(expr, BinaryExpr):
+        return is_time_dependent(expr.left) or is_time_dependent(expr.right)
+    return False
@@ -0,0 +1,113 @@
+"""Incremental sliding-window aggregates for rolling feature expressions."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, Tuple
+
+from domain.features.expr import RollingWindow
+from domain.market.time import NS_PER_SECOND
+
+
+class RollingAccumulator:
+    """O(1) amortized rolling sum/mean/std/min/max over a tick or time window.
+
+    Sums and means use a running sum, std uses Welford's update with removal
+    (population std), and min/max keep a monotonic deque. NaN samples are
+    skipped. An empty window yields 0.0 for ``sum`` and NaN otherwise.
+    """
+
+    __slots__ = (
+        "_count",
+        "_extrema",
+        "_m2",
+        "_mean",
+        "_samples",
+        "_seq",
+        "_sum",
+        "op",
+        "ticks",
+        "window_ns",
+    )
+
+    def __init__(self, op: str, ticks: int | None, window_ns: int | None) -> None:
+        self.op = op
+        self.ticks = ticks
+        self.window_ns = window_ns
+        self._samples: Deque[Tuple[int, int, float]] = deque()
+        self._extrema: Deque[Tuple[int, float]] = deque()
+        self._seq = 0
+        self._count = 0
+        self._sum = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @classmethod
+    def for_window(cls, window: RollingWindow) -> "RollingAccumulator":
+        window_ns = (
+            None if window.seconds is None else round(window.seconds * NS_PER_SECOND)
+        )
+        return cls(window.op, window.ticks, window_ns)
+
+    def push(self, value: float, ts_ns: int) -> float:
+        """Add the sample at ``ts_ns``, expire old ones and return the aggregate."""
+
+        seq = self._seq
+        self._seq += 1
+        if not math.isnan(value):
+            self._samples.append((seq, ts_ns, value))
+            self._add(seq, value)
+        if self.ticks is not None:
+            oldest_seq = seq - self.ticks + 1
+            while self._samples and self._samples[0][0] < oldest_seq:
+                self._remove(self._samples.popleft())
+        else:
+            cutoff = ts_ns - self.window_ns
+            while self._samples and self._samples[0][1] <= cutoff:
+                self._remove(self._samples.popleft())
+        return self.value()
+
+    def value(self) -> float:
+        if self.op == "sum":
+            return self._sum
+        if self._count == 0:
+            return math.nan
+        if self.op == "mean":
+            return self._sum / self._count
+        if self.op == "std":
+            return math.sqrt(max(self._m2, 0.0) / self._count)
+        return self._extrema[0][1]
+
+    def _add(self, seq: int, value: float) -> None:
+        self._count += 1
+        self._sum += value
+        if self.op == "std":
+            delta = value - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (value - self._mean)
+        elif self.op in ("min", "max"):
+            extrema = self._extrema
+            if self.op == "max":
+                while extrema and extrema[-1][1] <= value:
+                    extrema.pop()
+            else:
+                while extrema and extrema[-1][1] >= value:
+                    extrema.pop()
+            extrema.append((seq, value))
+
+    def _remove(self, sample: Tuple[int, int, float]) -> None:
+        seq, _, value = sample
+        self._count -= 1
+        self._sum -= value
+        if self._count == 0:
+            # Reset so rounding drift does not survive an empty window.
+            self._sum = self._mean = self._m2 = 0.0
+            self._extrema.clear()
+            return
+        if self.op == "std":
+            delta = value - self._mean
+            self._mean -= delta / self._count
+            self._m2 -= delta * (value - self._mean)
+        elif self._extrema and self._extrema[0][0] == seq:
+            self._extrema.popleft()
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 from dataclasses import dataclass, field
 from typing import Dict, Iterable, List, Mapping, Optional
 
@@ -37,6 +39,18 @@ class FeatureSpec:
     def get(self, name: str) -> Optional[FeatureDef]:
         return next((f for f in self.features if f.name == name), None)
 
+    def fingerprint(self) -> str:
+        """Stable content hash of version, eps, params and feature expressions."""
+
+        payload = {
+            "version": self.version,
+            "eps": repr(float(self.eps)),
+            "params": self.params,
+            "features": [[f.name, f.expr.describe()] for f in self.features],
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
     @classmethod
     def from_features(
         cls,
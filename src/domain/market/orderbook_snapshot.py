@@ -11,7 +11,7 @@ from domain.market.invariants import (
     is_sorted_bids,
 )
 from domain.market.level import Level
-from domain.market.time import Timestamp
+from domain.market.time import Timestamp, to_epoch_ns
 from domain.market.types import (
     PriceKey,
     PriceQtyMap,
@@ -23,7 +23,12 @@ from domain.market.types import (
 
 @dataclass(slots=True)
 class OrderBookSnapshot:
-    """Immutable snapshot of the visible order book."""
+    """Immutable snapshot of the visible order book.
+
+    ``ts_ns`` (epoch nanoseconds) is what hot paths compare and subtract;
+    ``ts`` is kept for API and logging boundaries. When only ``ts`` is given,
+    ``ts_ns`` is derived from it once.
+    """
 
     ts: Timestamp
     symbol: Symbol
@@ -34,10 +39,13 @@ class OrderBookSnapshot:
     best_ask_price: Optional[PriceKey] = None
     best_ask_qty: Optional[Quantity] = None
     mid: Optional[PriceKey] = None
+    ts_ns: Optional[int] = None
     bid_map: PriceQtyMap = field(init=False)
     ask_map: PriceQtyMap = field(init=False)
 
     def __post_init__(self) -> None:
+        if self.ts_ns is None:
+            self.ts_ns = to_epoch_ns(self.ts)
         self._validate_levels()
         self.bid_map = {level.price: level.qty for level in self.bid_levels}
         self.ask_map = {level.price: level.qty for level in self.ask_levels}
@@ -75,5 +83,17 @@ class OrderBookSnapshot:
         ) / Decimal(2)
         self.mid = PriceKey(mid_value)
 
+    def book_fingerprint(self) -> int:
+        """Cheap hash of the level arrays, for detecting an unchanged book."""
+
+        return hash((tuple(self.bid_levels), tuple(self.ask_levels)))
+
+    def same_book_as(self, other: "OrderBookSnapshot") -> bool:
+        return (
+            self.symbol == other.symbol
+            and self.bid_levels == other.bid_levels
+            and self.ask_levels == other.ask_levels
+        )
+
     def depth_levels(self, side: Side) -> List[Level]:
         return self.bid_levels if side is Side.BID else self.ask_levels
@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, time, timedelta, timezone
 from math import exp
 from typing import NewType
 
 Timestamp = NewType("Timestamp", datetime)
 Duration = NewType("Duration", timedelta)
 
+NS_PER_SECOND = 1_000_000_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
 
 def utc_now() -> Timestamp:
     """Return a timezone-aware UTC timestamp."""
@@ -23,6 +27,39 @@ def to_duration(seconds: float) -> Duration:
     return Duration(timedelta(seconds=seconds))
 
 
+def to_epoch_ns(ts: datetime) -> int:
+    """Convert a datetime into integer nanoseconds since the Unix epoch (UTC)."""
+
+    aware = ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+    return ((aware - _EPOCH) // _ONE_MICROSECOND) * 1000
+
+
+def parse_epoch_ns(value: str | int | datetime) -> int:
+    """Parse epoch nanoseconds from an int, a digit string or ISO-8601 text."""
+
+    if isinstance(value, int):
+        return value
+    if isinstance(value, datetime):
+        return to_epoch_ns(value)
+    if value.isdigit():
+        return int(value)
+    return to_epoch_ns(datetime.fromisoformat(value))
+
+
+def from_epoch_ns(value: int) -> Timestamp:
+    """Convert integer nanoseconds since the Unix epoch into a UTC timestamp."""
+
+    return Timestamp(_EPOCH + timedelta(microseconds=int(value) // 1000))
+
+
+def day_bounds(day: date) -> tuple[datetime, datetime]:
+    """Return the inclusive UTC [start, end] range covering ``day``."""
+
+    start = datetime.combine(day, time(0, 0, 0), tzinfo=timezone.utc)
+    end = start + timedelta(days=1) - timedelta(microseconds=1)
+    return start, end
+
+
 def delta_seconds(later: Timestamp, earlier: Timestamp) -> float:
     """Compute fractional seconds between two timestamps."""
 
@@ -3,11 +3,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from enum import Enum
 
 from domain.decision.signal import OrderSide
 from domain.market.types import Symbol
 
 
+class OrderStatus(str, Enum):
+    PENDING = "PENDING"  # accepted locally, broker acknowledgement outstanding
+    UNKNOWN = "UNKNOWN"  # send outcome lost (e.g. timeout), broker may have it
+    ACKED = "ACKED"
+
+
 @dataclass
 class RealTimeOrder:
     symbol: Symbol
@@ -17,3 +24,12 @@ class RealTimeOrder:
     order_id: str
     price: float
     is_filled: bool = False
+    status: OrderStatus = OrderStatus.ACKED
+    intent_id: str | None = None
+    placed_at: float | None = None  # wall-clock epoch seconds, async orders only
+
+    @property
+    def is_pending(self) -> bool:
+        """Not yet confirmed by the broker (in flight or of unknown outcome)."""
+
+        return self.status is not OrderStatus.ACKED
@@ -7,21 +7,35 @@ from typing import Any, Mapping
 
 import requests
 
+from infrastructure.api.request_scheduler import (
+    RequestPriority,
+    RequestScheduler,
+)
+
 
 @dataclass
 class AuthClient:
     base_url: str
     timeout_seconds: float = 5.0
+    scheduler: RequestScheduler | None = None
 
     def fetch_token(self, api_password: str) -> str:
         payload = {"APIPassword": api_password}
-        response = requests.post(
-            f"{self.base_url}/token",
-            json=payload,
-            timeout=self.timeout_seconds,
-        )
-        response.raise_for_status()
-        data: Mapping[str, Any] = response.json()
+
+        def request_token() -> Mapping[str, Any]:
+            response = requests.post(
+                f"{self.base_url}/token",
+                json=payload,
+                timeout=self.timeout_seconds,
+            )
+            response.raise_for_status()
+            return response.json()
+
+        if self.scheduler is None:
+            data = request_token()
+        else:
+            # Every other call needs the token, so it goes ahead of new entries.
+            data = self.scheduler.call("token", RequestPriority.EXIT, request_token)
         token = data.get("Token")
         if not token:
             raise ValueError("Token missing from auth response")
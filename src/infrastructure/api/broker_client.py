@@ -2,45 +2,123 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Mapping, TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, TYPE_CHECKING, TypeVar
 
 import requests
 
+from infrastructure.api.request_scheduler import (
+    RequestPriority,
+    RequestScheduler,
+)
+
 if TYPE_CHECKING:
     from application.ports.broker import OrderStatePort
     from domain.decision.signal import OrderSide
 
+T = TypeVar("T")
+
+# kabu station CashMargin value for closing (repaying) a margin position.
+_CASH_MARGIN_REPAY = 3
+
 
 @dataclass
 class BrokerClient:
     base_url: str
     timeout_seconds: float = 5.0
+    scheduler: RequestScheduler | None = None
+    # Shared so every call reuses pooled keep-alive connections.
+    session: requests.Session = field(default_factory=requests.Session, repr=False)
 
     def place_order(
         self, data: Mapping[str, Any], api_key: str | None = None
     ) -> Mapping[str, Any]:
         headers = {"X-API-KEY": api_key} if api_key else None
-        response = requests.post(
-            f"{self.base_url}/sendorder",
-            json=data,
-            headers=headers,
-            timeout=self.timeout_seconds,
+
+        def send() -> Mapping[str, Any]:
+            response = self.session.post(
+                f"{self.base_url}/sendorder",
+                json=data,
+                headers=headers,
+                timeout=self.timeout_seconds,
+            )
+            response.raise_for_status()
+            return response.json()
+
+        priority = (
+            RequestPriority.EXIT
+            if int(data.get("CashMargin", 0)) == _CASH_MARGIN_REPAY
+            else RequestPriority.ENTRY
         )
-        response.raise_for_status()
-        return response.json()
+        return self._schedule("sendorder", priority, send)
 
     def list_orders(self, api_key: str, order_id: str) -> list[Mapping[str, Any]]:
         params = {"id": order_id}
         headers = {"X-API-KEY": api_key}
-        response = requests.get(
-            f"{self.base_url}/orders",
-            params=params,
-            headers=headers,
-            timeout=self.timeout_seconds,
+
+        def fetch() -> list[Mapping[str, Any]]:
+            response = self.session.get(
+                f"{self.base_url}/orders",
+                params=params,
+                headers=headers,
+                timeout=self.timeout_seconds,
+            )
+            response.raise_for_status()
+            return list(response.json())
+
+        return self._schedule(
+            "orders", RequestPriority.POLL, fetch, coalesce_key=("orders", order_id)
         )
-        response.raise_for_status()
-        return list(response.json())
+
+    def list_symbol_orders(self, api_key: str, symbol: str) -> list[Mapping[str, Any]]:
+        """All of today's orders for ``symbol``, e.g. to find one whose id was lost."""
+
+        params = {"symbol": symbol}
+        headers = {"X-API-KEY": api_key}
+
+        def fetch() -> list[Mapping[str, Any]]:
+            response = self.session.get(
+                f"{self.base_url}/orders",
+                params=params,
+                headers=headers,
+                timeout=self.timeout_seconds,
+            )
+            response.raise_for_status()
+            return list(response.json())
+
+        return self._schedule(
+            "orders",
+            RequestPriority.POLL,
+            fetch,
+            coalesce_key=("orders", "symbol", symbol),
+        )
+
+    def list_positions(self, api_key: str) -> list[Mapping[str, Any]]:
+        headers = {"X-API-KEY": api_key}
+
+        def fetch() -> list[Mapping[str, Any]]:
+            response = self.session.get(
+                f"{self.base_url}/positions",
+                headers=headers,
+                timeout=self.timeout_seconds,
+            )
+            response.raise_for_status()
+            return list(response.json())
+
+        return self._schedule(
+            "positions", RequestPriority.POLL, fetch, coalesce_key=("positions",)
+        )
+
+    def _schedule(
+        self,
+        endpoint: str,
+        priority: RequestPriority,
+        fn: Callable[[], T],
+        coalesce_key: Any = None,
+    ) -> T:
+        if self.scheduler is None:
+            return fn()
+        return self.scheduler.call(endpoint, priority, fn, coalesce_key=coalesce_key)
 
 
 @dataclass
@@ -52,30 +130,37 @@ class KabuOrderPort:
     order_store: "OrderStatePort | None" = None
 
     def place_order(self, intent) -> str:
+        payload = self.build_payload(intent)
+        response = self.client.place_order(payload, api_key=self.api_key)
+        order_id = str(response.get("OrderId") or intent.intent_id)
+        if self.order_store is not None:
+            self.order_store.add(self.to_order(intent, payload, order_id))
+        return order_id
+
+    def build_payload(self, intent) -> Mapping[str, Any]:
         from infrastructure.api.mapper import (
             build_order_payload,
         )
 
-        payload = build_order_payload(
+        return build_order_payload(
             intent, base_payload=self.base_payload, side_override=self.side_override
         )
-        response = self.client.place_order(payload, api_key=self.api_key)
-        order_id = str(response.get("OrderId") or intent.intent_id)
-        if self.order_store is not None:
-            from domain.order.realtime_order import (
-                RealTimeOrder,
-            )
 
-            cash_margin = int(payload["CashMargin"])
-            qty = int(payload["Qty"])
-            price = float(payload["Price"])
-            order = RealTimeOrder(
-                symbol=intent.symbol,
-                qty=qty,
-                side=self.side_override or intent.side,
-                cash_margin=cash_margin,
-                order_id=order_id,
-                price=price,
-            )
-            self.order_store.add(order)
-        return order_id
+    def to_order(
+        self, intent, payload: Mapping[str, Any], order_id: str, pending: bool = False
+    ):
+        from domain.order.realtime_order import (
+            OrderStatus,
+            RealTimeOrder,
+        )
+
+        return RealTimeOrder(
+            symbol=intent.symbol,
+            qty=int(payload["Qty"]),
+            side=self.side_override or intent.side,
+            cash_margin=int(payload["CashMargin"]),
+            order_id=order_id,
+            price=float(payload["Price"]),
+            status=OrderStatus.PENDING if pending else OrderStatus.ACKED,
+            intent_id=intent.intent_id,
+        )
@@ -0,0 +1,279 @@
+"""Non-blocking order submission through a background worker."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Mapping, Tuple
+
+from application.ports.broker import OrderPort, OrderStatePort
+from application.ports.metrics import MetricsPort
+from domain.decision.signal import OrderSide, TradeIntent
+from domain.order.realtime_order import RealTimeOrder
+from infrastructure.api.broker_client import KabuOrderPort
+from infrastructure.api.request_scheduler import RequestRejected
+
+logger = logging.getLogger(__name__)
+
+# Broker orders received this long before our send still count as matches
+# (clock skew between this host and kabu station).
+_RECV_TIME_SLACK_SECONDS = 5.0
+
+
+_Submission = Tuple[str, Mapping[str, Any], float]
+
+
+@dataclass
+class _Unresolved:
+    symbol: str
+    side: str
+    qty: float
+    sent_at: float
+    sent_at_wall: float
+
+
+def is_rejection(exc: BaseException) -> bool:
+    """True when a failed send certainly did not create a broker order."""
+
+    if isinstance(exc, RequestRejected):
+        return True
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status is not None and 400 <= status < 500
+
+
+@dataclass
+class AsyncOrderGateway(OrderPort):
+    """Accepts intents immediately and sends them on a worker thread.
+
+    ``place_order`` records the order as pending in ``order_store`` under the
+    intent id and returns that id without waiting on the broker. While the
+    symbol already has ``max_in_flight_per_symbol`` unconfirmed orders it
+    returns ``None`` instead and counts ``orders.in_flight_limited``. The worker
+    sends orders in submission order; the broker's ``OrderId`` replaces the
+    intent id on acknowledgement. HTTP 4xx answers, ``Result`` != 0 and
+    orders that waited longer than ``max_queue_seconds`` remove the pending
+    order again.
+
+    Any other failure (timeout, connection reset, 5xx) may have happened after
+    kabu accepted the order, so the order is kept as ``UNKNOWN`` and still
+    counts as in flight. Every ``resolve_interval_seconds`` the worker looks
+    for it among the symbol's ``/orders``: a matching order not yet in the
+    store is acknowledged; if none shows up within ``unknown_timeout_seconds``
+    the order is rejected. Orders that are still unconfirmed in ``order_store``
+    when the gateway is created (e.g. replayed from the order journal after a
+    crash) are resolved the same way, matching only broker orders received
+    after their recorded ``placed_at``; without one they are rejected.
+    """
+
+    order_port: KabuOrderPort
+    order_store: OrderStatePort
+    max_in_flight_per_symbol: int = 1
+    max_queue_seconds: float = 2.0
+    resolve_interval_seconds: float = 1.0
+    unknown_timeout_seconds: float = 30.0
+    metrics: MetricsPort | None = None
+    clock: Callable[[], float] = time.monotonic
+    wall_clock: Callable[[], float] = time.time
+    _queue: "queue.Queue[_Submission | None]" = field(
+        default_factory=queue.Queue, init=False, repr=False
+    )
+    _worker: threading.Thread | None = field(default=None, init=False, repr=False)
+    _unresolved: Dict[str, _Unresolved] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_in_flight_per_symbol < 1:
+            raise ValueError("max_in_flight_per_symbol must be at least 1")
+        self._next_resolve = 0.0
+        for order in list(self.order_store.list()):
+            if not order.is_pending or not order.intent_id:
+                continue
+            if order.placed_at is None:
+                logger.warning(
+                    "order %s was unconfirmed at startup without a placement "
+                    "time; dropping it",
+                    order.intent_id,
+                )
+                self.order_store.reject(order.intent_id)
+                continue
+            logger.warning(
+                "order %s was unconfirmed at startup; looking it up",
+                order.intent_id,
+            )
+            self._unresolved[order.intent_id] = _unresolved_order(order, self.clock())
+        self._worker = threading.Thread(
+            target=self._run, name="order-gateway", daemon=True
+        )
+        self._worker.start()
+
+    def place_order(self, intent: TradeIntent) -> str | None:
+        in_flight = sum(
+            1
+            for order in self.order_store.list()
+            if order.is_pending and order.symbol == intent.symbol
+        )
+        if in_flight >= self.max_in_flight_per_symbol:
+            self._incr("orders.in_flight_limited")
+            return None
+        payload = self.order_port.build_payload(intent)
+        order = self.order_port.to_order(
+            intent, payload, intent.intent_id, pending=True
+        )
+        order.placed_at = self.wall_clock()
+        self.order_store.add(order)
+        self._queue.put((intent.intent_id, payload, self.clock()))
+        return intent.intent_id
+
+    def flush(self) -> None:
+        """Block until every accepted order was sent or dropped.
+
+        Orders of unknown outcome are still being resolved afterwards.
+        """
+
+        self._queue.join()
+
+    def close(self, timeout: float | None = None) -> None:
+        self._queue.put(None)
+        if self._worker is not None:
+            self._worker.join(timeout)
+        if self._unresolved:
+            logger.warning(
+                "closing with %d order(s) of unknown outcome: %s",
+                len(self._unresolved),
+                ", ".join(sorted(self._unresolved)),
+            )
+
+    def _run(self) -> None:
+        while True:
+            timeout = None
+            if self._unresolved:
+                timeout = max(0.0, self._next_resolve - self.clock())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._resolve_unknown()
+                continue
+            try:
+                if item is None:
+                    return
+                self._send(*item)
+            finally:
+                self._queue.task_done()
+            if self._unresolved and self.clock() >= self._next_resolve:
+                self._resolve_unknown()
+
+    def _send(
+        self, intent_id: str, payload: Mapping[str, Any], accepted_at: float
+    ) -> None:
+        queued = self.clock() - accepted_at
+        if queued > self.max_queue_seconds:
+            logger.warning("dropping order %s after %.3fs in queue", intent_id, queued)
+            self.order_store.reject(intent_id)
+            self._incr("orders.expired")
+            return
+        sent_at_wall = self.wall_clock()
+        try:
+            response = self.order_port.client.place_order(
+                payload, api_key=self.order_port.api_key
+            )
+        except Exception as exc:
+            if is_rejection(exc):
+                logger.warning("order %s rejected: %s", intent_id, exc)
+                self.order_store.reject(intent_id)
+                self._incr("orders.failed")
+                return
+            logger.exception("order %s outcome unknown", intent_id)
+            self.order_store.mark_unknown(intent_id)
+            self._unresolved[intent_id] = _Unresolved(
+                symbol=str(payload["Symbol"]),
+                side=str(payload["Side"]),
+                qty=float(payload["Qty"]),
+                sent_at=self.clock(),
+                sent_at_wall=sent_at_wall,
+            )
+            self._next_resolve = self.clock() + self.resolve_interval_seconds
+            self._incr("orders.unknown")
+            return
+        result = response.get("Result", 0)
+        if result not in (0, None):
+            logger.warning("order %s rejected with Result %s", intent_id, result)
+            self.order_store.reject(intent_id)
+            self._incr("orders.failed")
+            return
+        order_id = str(response.get("OrderId") or intent_id)
+        self.order_store.acknowledge(intent_id, order_id)
+        if self.metrics is not None:
+            self.metrics.timing("orders.ack_ms", (self.clock() - accepted_at) * 1000.0)
+
+    def _resolve_unknown(self) -> None:
+        self._next_resolve = self.clock() + self.resolve_interval_seconds
+        for intent_id, unresolved in list(self._unresolved.items()):
+            try:
+                broker_orders = self.order_port.client.list_symbol_orders(
+                    self.order_port.api_key, unresolved.symbol
+                )
+            except Exception:
+                logger.warning(
+                    "looking up order %s failed; retrying", intent_id, exc_info=True
+                )
+                continue
+            known = {order.order_id for order in self.order_store.list()}
+            match = next(
+                (
+                    entry
+                    for entry in broker_orders
+                    if str(entry.get("ID")) not in known and _matches(entry, unresolved)
+                ),
+                None,
+            )
+            if match is not None:
+                logger.info("order %s found at broker as %s", intent_id, match["ID"])
+                self.order_store.acknowledge(intent_id, str(match["ID"]))
+                del self._unresolved[intent_id]
+                self._incr("orders.unknown_resolved")
+            elif self.clock() - unresolved.sent_at >= self.unknown_timeout_seconds:
+                logger.warning("order %s not found at broker; dropping it", intent_id)
+                self.order_store.reject(intent_id)
+                del self._unresolved[intent_id]
+                self._incr("orders.unknown_rejected")
+
+    def _incr(self, name: str) -> None:
+        if self.metrics is not None:
+            self.metrics.incr(name)
+
+
+def _unresolved_order(order: RealTimeOrder, now: float) -> _Unresolved:
+    return _Unresolved(
+        symbol=str(order.symbol),
+        side="2" if order.side is OrderSide.BUY else "1",
+        qty=float(order.qty),
+        sent_at=now,
+        # Placed (queued) no later than sent, so still a safe lower bound.
+        sent_at_wall=order.placed_at,
+    )
+
+
+def _matches(entry: Mapping[str, Any], unresolved: _Unresolved) -> bool:
+    try:
+        same_order = (
+            str(entry.get("Symbol")) == unresolved.symbol
+            and str(entry.get("Side")) == unresolved.side
+            and float(entry.get("OrderQty") or 0.0) == unresolved.qty
+        )
+    except (TypeError, ValueError):
+        return False
+    if not same_order:
+        return False
+    recv_time = entry.get("RecvTime")
+    if not recv_time:
+        return True
+    try:
+        received = datetime.fromisoformat(str(recv_time)).timestamp()
+    except ValueError:
+        return True
+    return received >= unresolved.sent_at_wall - _RECV_TIME_SLACK_SECONDS
@@ -0,0 +1,60 @@
+"""Background polling of open order status."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+
+from application.ports.metrics import MetricsPort
+from application.service.order_handler import OrderHandler
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OrderStatusPoller:
+    """Runs ``OrderHandler.refresh`` every ``interval_seconds`` on its own thread.
+
+    Keeps the blocking, rate-limited ``/orders`` calls off the tick path; fills
+    reach the order store and position ledger from this thread. Failed polls
+    are logged and counted as ``orders.poll_failed`` and retried next round.
+    """
+
+    handler: OrderHandler
+    interval_seconds: float = 1.0
+    metrics: MetricsPort | None = None
+
+    def __post_init__(self) -> None:
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="order-status-poller", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def poll_once(self) -> int:
+        """Refresh every open order; returns the number of failed lookups."""
+
+        try:
+            failed = self.handler.refresh()
+        except Exception:
+            logger.exception("order status poll failed")
+            failed = 1
+        if failed and self.metrics is not None:
+            self.metrics.incr("orders.poll_failed", failed)
+        return failed
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.poll_once()
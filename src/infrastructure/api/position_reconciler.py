@@ -0,0 +1,92 @@
+"""Background reconciliation of the position ledger against the broker."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Mapping
+
+from application.ports.metrics import MetricsPort
+from domain.market.types import Symbol
+from infrastructure.api.broker_client import BrokerClient
+from infrastructure.memory.position_ledger import PositionLedger
+
+logger = logging.getLogger(__name__)
+
+# kabu station Side value for a long (bought) position.
+_SIDE_BUY = "2"
+
+
+def broker_net_shares(positions: Iterable[Mapping[str, Any]]) -> Dict[Symbol, float]:
+    """Signed open quantity per symbol from a ``/positions`` response."""
+
+    net: Dict[Symbol, float] = {}
+    for entry in positions:
+        symbol = Symbol(str(entry.get("Symbol")))
+        qty = float(entry.get("LeavesQty") or 0.0)
+        signed = qty if str(entry.get("Side")) == _SIDE_BUY else -qty
+        net[symbol] = net.get(symbol, 0.0) + signed
+    return net
+
+
+@dataclass
+class PositionReconciler:
+    """Compares the ledger with ``/positions`` every ``interval_seconds``.
+
+    Runs on its own thread and only reports: differences are logged, counted
+    as ``positions.drift`` and kept in ``last_drift`` (broker minus ledger, in
+    shares); the ledger itself is never blocked or rewritten.
+    """
+
+    ledger: PositionLedger
+    broker_client: BrokerClient
+    api_key: str
+    interval_seconds: float = 30.0
+    metrics: MetricsPort | None = None
+    last_drift: Dict[Symbol, float] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="position-reconciler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def reconcile_once(self) -> Dict[Symbol, float]:
+        broker = broker_net_shares(self.broker_client.list_positions(self.api_key))
+        ledger = self.ledger.snapshot()
+        drift = {
+            symbol: broker.get(symbol, 0.0) - ledger.get(symbol, 0.0)
+            for symbol in set(broker) | set(ledger)
+            if broker.get(symbol, 0.0) != ledger.get(symbol, 0.0)
+        }
+        for symbol in sorted(drift):
+            logger.warning(
+                "position drift for %s: broker=%s ledger=%s",
+                symbol,
+                broker.get(symbol, 0.0),
+                ledger.get(symbol, 0.0),
+            )
+        if drift and self.metrics is not None:
+            self.metrics.incr("positions.drift", len(drift))
+        self.last_drift = drift
+        return drift
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.reconcile_once()
+            except Exception:
+                logger.exception("position reconciliation failed")
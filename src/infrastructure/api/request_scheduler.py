@@ -0,0 +1,277 @@
+"""Token-bucket rate limiting and prioritisation for kabu station REST calls."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Tuple, TypeVar
+
+import requests
+
+from application.ports.metrics import MetricsPort
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RequestPriority(IntEnum):
+    """Lower values are served first when requests compete for a bucket."""
+
+    EXIT = 0
+    ENTRY = 1
+    POLL = 2
+
+
+class RequestRejected(RuntimeError):
+    """Raised when a request waited longer than its priority class allows."""
+
+
+@dataclass
+class TokenBucket:
+    """``rate_per_second`` tokens refill continuously up to ``burst``."""
+
+    rate_per_second: float
+    burst: float = 1.0
+    tokens: float | None = None
+    updated_at: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+
+    def refill(self, now: float) -> None:
+        if self.tokens is None or self.updated_at is None:
+            self.tokens = self.burst
+        else:
+            elapsed = max(0.0, now - self.updated_at)
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate_per_second)
+        self.updated_at = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until one token is available (0.0 if one is available now)."""
+
+        self.refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate_per_second
+
+    def take(self, now: float) -> None:
+        self.refill(now)
+        self.tokens -= 1.0
+
+    def drain(self, now: float) -> None:
+        """Empty the bucket, e.g. after the server reported a rate-limit error."""
+
+        self.refill(now)
+        self.tokens = min(self.tokens, 0.0)
+
+
+@dataclass
+class _Ticket:
+    priority: int
+    seq: int
+    buckets: Tuple[str, ...]
+    enqueued_at: float
+
+
+class RequestScheduler:
+    """Serialises REST calls through per-endpoint token buckets.
+
+    ``routes`` maps an endpoint name (e.g. ``"sendorder"``) to the buckets it
+    draws from; ``global_bucket`` (optional) is drawn from by every routed
+    endpoint. A waiting request is granted only when every bucket it needs has
+    a token and no earlier-or-higher-priority request is waiting on any of
+    them, so exits overtake queued entries and entries overtake polls.
+    Requests with the same ``coalesce_key`` that are already queued or in
+    flight share that request's result instead of issuing a second call.
+    The calling thread performs its own request once granted.
+    """
+
+    def __init__(
+        self,
+        buckets: Mapping[str, TokenBucket],
+        routes: Mapping[str, Tuple[str, ...]],
+        global_bucket: str | None = None,
+        max_wait_seconds: Mapping[RequestPriority, float] | None = None,
+        metrics: MetricsPort | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.buckets: Dict[str, TokenBucket] = dict(buckets)
+        self.routes = {endpoint: tuple(names) for endpoint, names in routes.items()}
+        if global_bucket is not None:
+            self.routes = {
+                endpoint: names + (global_bucket,)
+                for endpoint, names in self.routes.items()
+            }
+        for names in self.routes.values():
+            for name in names:
+                if name not in self.buckets:
+                    raise ValueError(f"Unknown rate-limit bucket: {name}")
+        self.max_wait_seconds = dict(max_wait_seconds or {})
+        self.metrics = metrics
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._waiting: List[_Ticket] = []
+        self._coalesced: Dict[Hashable, Future] = {}
+        self._seq = itertools.count()
+
+    def call(
+        self,
+        endpoint: str,
+        priority: RequestPriority,
+        fn: Callable[[], T],
+        coalesce_key: Hashable | None = None,
+    ) -> T:
+        """Run ``fn`` once ``endpoint`` may be called at ``priority``."""
+
+        with self._cond:
+            if coalesce_key is not None:
+                shared = self._coalesced.get(coalesce_key)
+                if shared is not None:
+                    self._incr("scheduler.coalesced")
+                    owner = False
+                else:
+                    shared = Future()
+                    self._coalesced[coalesce_key] = shared
+                    owner = True
+        if coalesce_key is not None and not owner:
+            return shared.result()
+        try:
+            result = self._run(endpoint, priority, fn)
+        except BaseException as exc:
+            if coalesce_key is not None:
+                self._finish_coalesced(coalesce_key, shared, error=exc)
+            raise
+        if coalesce_key is not None:
+            self._finish_coalesced(coalesce_key, shared, result=result)
+        return result
+
+    @property
+    def waiting(self) -> int:
+        with self._cond:
+            return len(self._waiting)
+
+    def _run(self, endpoint: str, priority: RequestPriority, fn: Callable[[], T]) -> T:
+        names = self.routes.get(endpoint, ())
+        if names:
+            self._acquire(endpoint, priority, names)
+        try:
+            return fn()
+        except requests.HTTPError as exc:
+            response = exc.response
+            if response is not None and response.status_code == 429:
+                self._incr(f"scheduler.throttled.{endpoint}")
+                logger.warning("%s was rate limited by the server", endpoint)
+                with self._cond:
+                    now = self.clock()
+                    for name in names:
+                        self.buckets[name].drain(now)
+            raise
+
+    def _acquire(
+        self, endpoint: str, priority: RequestPriority, names: Tuple[str, ...]
+    ) -> None:
+        with self._cond:
+            ticket = _Ticket(
+                priority=int(priority),
+                seq=next(self._seq),
+                buckets=names,
+                enqueued_at=self.clock(),
+            )
+            self._waiting.append(ticket)
+            deadline = self.max_wait_seconds.get(priority)
+            try:
+                while True:
+                    now = self.clock()
+                    wait = self._grant_wait(ticket, now)
+                    if wait == 0.0:
+                        break
+                    timeout = wait if wait > 0 else None
+                    if deadline is not None:
+                        waited = now - ticket.enqueued_at
+                        if waited >= deadline:
+                            self._incr(f"scheduler.rejected.{priority.name.lower()}")
+                            raise RequestRejected(
+                                f"{endpoint} waited {waited:.3f}s at {priority.name}"
+                            )
+                        remaining = deadline - waited
+                        timeout = (
+                            remaining if timeout is None else min(timeout, remaining)
+                        )
+                    self._cond.wait(timeout=timeout)
+                for name in names:
+                    self.buckets[name].take(now)
+            finally:
+                self._waiting.remove(ticket)
+                self._cond.notify_all()
+        delay_ms = (now - ticket.enqueued_at) * 1000.0
+        if self.metrics is not None:
+            self.metrics.timing(
+                f"scheduler.queue_delay_ms.{priority.name.lower()}", delay_ms
+            )
+
+    def _grant_wait(self, ticket: _Ticket, now: float) -> float:
+        """0.0 when ``ticket`` may go now, a timeout hint otherwise (-1: blocked)."""
+
+        for other in self._waiting:
+            if other is ticket:
+                continue
+            if (other.priority, other.seq) < (ticket.priority, ticket.seq) and set(
+                other.buckets
+            ).intersection(ticket.buckets):
+                return -1.0
+        return max(self.buckets[name].wait_time(now) for name in ticket.buckets)
+
+    def _finish_coalesced(
+        self,
+        key: Hashable,
+        shared: Future,
+        result: Any = None,
+        error: BaseException | None = None,
+    ) -> None:
+        with self._cond:
+            self._coalesced.pop(key, None)
+        if error is not None:
+            shared.set_exception(error)
+        else:
+            shared.set_result(result)
+
+    def _incr(self, name: str) -> None:
+        if self.metrics is not None:
+            self.metrics.incr(name)
+
+
+def kabu_request_scheduler(
+    order_rate: float = 5.0,
+    info_rate: float = 10.0,
+    poll_max_wait_seconds: float | None = None,
+    metrics: MetricsPort | None = None,
+) -> RequestScheduler:
+    """Scheduler with kabu station's order and information API limits."""
+
+    return RequestScheduler(
+        buckets={
+            "order": TokenBucket(order_rate, burst=order_rate),
+            "info": TokenBucket(info_rate, burst=info_rate),
+        },
+        routes={
+            "sendorder": ("order",),
+            "orders": ("info",),
+            "positions": ("info",),
+            "token": ("info",),
+        },
+        max_wait_seconds=(
+            {RequestPriority.POLL: poll_max_wait_seconds}
+            if poll_max_wait_seconds is not None
+            else None
+        ),
+        metrics=metrics,
+    )
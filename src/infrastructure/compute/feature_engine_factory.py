@@ -0,0 +1,42 @@
+"""Selects the feature engine implementation by name."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from application.ports.feature_engine import FeatureEnginePort
+
+FEATURE_ENGINE_PANDAS = "pandas"
+FEATURE_ENGINE_POLARS = "polars"
+FEATURE_ENGINE_CODEGEN = "codegen"
+FEATURE_ENGINE_COLUMNAR = "columnar"
+
+
+def build_feature_engine(
+    kind: str = FEATURE_ENGINE_PANDAS, codegen_dump_dir: Path | None = None
+) -> FeatureEnginePort:
+    if kind == FEATURE_ENGINE_PANDAS:
+        from infrastructure.compute.feature_engine_pandas import (
+            PandasOrderBookFeatureEngine,
+        )
+
+        return PandasOrderBookFeatureEngine()
+    if kind == FEATURE_ENGINE_POLARS:
+        from infrastructure.compute.feature_engine_polars import (
+            PolarsOrderBookFeatureEngine,
+        )
+
+        return PolarsOrderBookFeatureEngine()
+    if kind == FEATURE_ENGINE_CODEGEN:
+        from infrastructure.compute.feature_engine_codegen import (
+            CodegenOrderBookFeatureEngine,
+        )
+
+        return CodegenOrderBookFeatureEngine(dump_dir=codegen_dump_dir)
+    if kind == FEATURE_ENGINE_COLUMNAR:
+        from infrastructure.compute.feature_engine_columnar import (
+            ColumnarOrderBookFeatureEngine,
+        )
+
+        return ColumnarOrderBookFeatureEngine(dump_dir=codegen_dump_dir)
+    raise ValueError(f"Unsupported feature engine: {kind}")
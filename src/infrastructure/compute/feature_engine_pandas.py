@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from dataclasses import replace
-from typing import Iterable, Tuple
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
 
 from application.ports.feature_engine import (
     FeatureEnginePort,
@@ -26,13 +28,16 @@ from domain.features.expr import (
     Expr,
     Mid,
     MicroPrice,
+    RollingWindow,
     TimeDecayEma,
+    is_time_dependent,
 )
+from domain.features.rolling import RollingAccumulator
 from domain.features.spec import FeatureSpec
 from domain.market.orderbook_snapshot import (
     OrderBookSnapshot,
 )
-from domain.market.time import TimeDecay
+from domain.market.time import NS_PER_SECOND, TimeDecay
 from domain.market.types import (
     PriceKey,
     Quantity,
@@ -70,9 +75,32 @@ class PandasOrderBookFeatureEngine(FeatureEnginePort):
             )
             features[feature_def.name] = value
 
-        current_state.last_ts = now_snapshot.ts
+        current_state.last_ts_ns = now_snapshot.ts_ns
         return features, current_state
 
+    def advance_unchanged(
+        self,
+        spec: FeatureSpec,
+        features: FeatureVector,
+        now_snapshot: OrderBookSnapshot,
+        state: FeatureState,
+    ) -> Tuple[FeatureVector, FeatureState]:
+        refreshed: FeatureVector = dict(features)
+        for feature_def in spec.features:
+            if not is_time_dependent(feature_def.expr):
+                continue
+            # The book is unchanged, so the snapshot doubles as its own "prev".
+            refreshed[feature_def.name], state = self._eval_expr(
+                feature_def.name,
+                feature_def.expr,
+                now_snapshot,
+                now_snapshot,
+                state,
+                eps=spec.eps,
+            )
+        state.last_ts_ns = now_snapshot.ts_ns
+        return refreshed, state
+
     def compute_batch(
         self, spec: FeatureSpec, snapshots: Iterable[OrderBookSnapshot]
     ) -> FeatureTable:
@@ -81,6 +109,34 @@ class PandasOrderBookFeatureEngine(FeatureEnginePort):
             features, state = self.compute_one(spec, prev, now, state)
             yield features
 
+    def compute_matrix(
+        self,
+        spec: FeatureSpec,
+        snapshots: Sequence[OrderBookSnapshot],
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Write one row per snapshot into ``out`` (allocated float32 if omitted)."""
+
+        shape = (len(snapshots), len(spec.features))
+        if out is None:
+            out = np.empty(shape, dtype=np.float32)
+        elif out.shape != shape:
+            raise ValueError(f"Output matrix shape {out.shape} != expected {shape}")
+        state = FeatureState()
+        for row, (prev, now) in enumerate(self._pairwise_snapshots(snapshots)):
+            for col, feature_def in enumerate(spec.features):
+                value, state = self._eval_expr(
+                    feature_def.name,
+                    feature_def.expr,
+                    prev,
+                    now,
+                    state,
+                    eps=spec.eps,
+                )
+                out[row, col] = value
+            state.last_ts_ns = now.ts_ns
+        return out
+
     def _pairwise_snapshots(
         self, snapshots: Iterable[OrderBookSnapshot]
     ) -> Iterable[Tuple[OrderBookSnapshot | None, OrderBookSnapshot]]:
@@ -151,9 +207,10 @@ class PandasOrderBookFeatureEngine(FeatureEnginePort):
             source_value, state = self._eval_expr(
                 feature_name, expr.source, prev_snapshot, now_snapshot, state, eps
             )
-            last_ts = state.last_ts or now_snapshot.ts
+            now_ns = now_snapshot.ts_ns
+            last_ns = state.last_ts_ns if state.last_ts_ns is not None else now_ns
             decay = TimeDecay(expr.tau_seconds)
-            delta_t = (now_snapshot.ts - last_ts).total_seconds()
+            delta_t = (now_ns - last_ns) / NS_PER_SECOND
             alpha = decay.alpha(delta_t)
             prev_ema = state.ema_values.get(feature_name, source_value)
             ema = prev_ema + alpha * (source_value - prev_ema)
@@ -161,6 +218,16 @@ class PandasOrderBookFeatureEngine(FeatureEnginePort):
                 state, ema_values={**state.ema_values, feature_name: ema}
             )
             return ema, new_state
+        if isinstance(expr, RollingWindow):
+            source_value, state = self._eval_expr(
+                feature_name, expr.source, prev_snapshot, now_snapshot, state, eps
+            )
+            key = (feature_name, expr)
+            accumulator = state.windows.get(key)
+            if accumulator is None:
+                accumulator = RollingAccumulator.for_window(expr)
+                state.windows[key] = accumulator
+            return accumulator.push(source_value, now_snapshot.ts_ns), state
         raise ValueError(f"Unsupported expression type: {expr}")
 
     def _calc_delta_sum(
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Tuple
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
 
 from application.ports.feature_engine import (
     FeatureEnginePort,
@@ -36,7 +38,24 @@ class PolarsOrderBookFeatureEngine(FeatureEnginePort):
     ) -> Tuple[FeatureVector, FeatureState]:
         return self._fallback.compute_one(spec, prev_snapshot, now_snapshot, state)
 
+    def advance_unchanged(
+        self,
+        spec: FeatureSpec,
+        features: FeatureVector,
+        now_snapshot: OrderBookSnapshot,
+        state: FeatureState,
+    ) -> Tuple[FeatureVector, FeatureState]:
+        return self._fallback.advance_unchanged(spec, features, now_snapshot, state)
+
     def compute_batch(
         self, spec: FeatureSpec, snapshots: Iterable[OrderBookSnapshot]
     ) -> FeatureTable:
         return self._fallback.compute_batch(spec, snapshots)
+
+    def compute_matrix(
+        self,
+        spec: FeatureSpec,
+        snapshots: Sequence[OrderBookSnapshot],
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        return self._fallback.compute_matrix(spec, snapshots, out)
@@ -0,0 +1,137 @@
+"""Sequential batch kernels, JIT-compiled with numba when it is installed."""
+
+from __future__ import annotations
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+try:  # optional dependency
+    import numba
+except ImportError:  # pragma: no cover - depends on the environment
+    numba = None
+
+HAS_NUMBA = numba is not None
+
+
+def _jit(func):
+    if numba is None:
+        return func
+    # cache=True keeps compiled machine code next to this module (or under
+    # NUMBA_CACHE_DIR), so later processes skip recompilation.
+    return numba.njit(cache=True, nogil=True)(func)
+
+
+def _delta_sums_loop(
+    prev_px: np.ndarray,
+    prev_qty: np.ndarray,
+    now_px: np.ndarray,
+    now_qty: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    n_rows, n_levels = now_px.shape
+    depletion = np.zeros(n_rows)
+    added = np.zeros(n_rows)
+    for row in range(n_rows):
+        dep = 0.0
+        add = 0.0
+        for i in range(n_levels):
+            price = prev_px[row, i]
+            if math.isnan(price):
+                continue
+            now = 0.0
+            for j in range(n_levels):
+                if now_px[row, j] == price:
+                    now = now_qty[row, j]
+                    break
+            diff = prev_qty[row, i] - now
+            if diff > 0.0:
+                dep += diff
+            elif diff < 0.0:
+                add -= diff
+        for j in range(n_levels):
+            price = now_px[row, j]
+            if math.isnan(price):
+                continue
+            seen = False
+            for i in range(n_levels):
+                if prev_px[row, i] == price:
+                    seen = True
+                    break
+            if not seen and now_qty[row, j] > 0.0:
+                add += now_qty[row, j]
+            elif not seen and now_qty[row, j] < 0.0:
+                dep -= now_qty[row, j]
+        depletion[row] = dep
+        added[row] = add
+    return depletion, added
+
+
+def _delta_sums_numpy(
+    prev_px: np.ndarray,
+    prev_qty: np.ndarray,
+    now_px: np.ndarray,
+    now_qty: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # match[r, i, j]: level i of the previous book has the price of level j now.
+    match = prev_px[:, :, None] == now_px[:, None, :]
+    matched_now = np.where(match, now_qty[:, None, :], 0.0).sum(axis=2)
+    prev_diff = np.where(np.isnan(prev_px), 0.0, prev_qty - matched_now)
+    new_level = ~match.any(axis=1) & ~np.isnan(now_px)
+    now_diff = np.where(new_level, -now_qty, 0.0)
+    diffs = np.concatenate([prev_diff, now_diff], axis=1)
+    depletion = np.maximum(diffs, 0.0).sum(axis=1)
+    added = np.maximum(-diffs, 0.0).sum(axis=1)
+    return depletion, added
+
+
+def _time_decay_ema_loop(
+    values: np.ndarray, ts_ns: np.ndarray, tau_seconds: float
+) -> np.ndarray:
+    n_rows = values.shape[0]
+    out = np.empty(n_rows)
+    ema = 0.0
+    for row in range(n_rows):
+        if row == 0:
+            ema = values[row]
+        else:
+            delta_ns = ts_ns[row] - ts_ns[row - 1]
+            if delta_ns < 0:
+                raise ValueError("delta_t_seconds must be non-negative")
+            alpha = 1.0 - math.exp(-(delta_ns / 1e9) / tau_seconds)
+            ema = ema + alpha * (values[row] - ema)
+        out[row] = ema
+    return out
+
+
+_delta_sums_jit = _jit(_delta_sums_loop)
+_time_decay_ema_jit = _jit(_time_decay_ema_loop)
+
+
+def delta_sums(
+    prev_px: np.ndarray,
+    prev_qty: np.ndarray,
+    now_px: np.ndarray,
+    now_qty: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-row ``(depletion, add)`` between price-aligned consecutive books.
+
+    Inputs are ``(rows, levels)`` float64 arrays; unused levels have a NaN
+    price. Quantities at a price present on only one side count against 0.
+    """
+
+    if HAS_NUMBA:
+        return _delta_sums_jit(prev_px, prev_qty, now_px, now_qty)
+    return _delta_sums_numpy(prev_px, prev_qty, now_px, now_qty)
+
+
+def time_decay_ema(
+    values: np.ndarray, ts_ns: np.ndarray, tau_seconds: float
+) -> np.ndarray:
+    """Irregular-time EMA with ``alpha = 1 - exp(-dt / tau)``, seeded by row 0."""
+
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    ts_ns = np.ascontiguousarray(ts_ns, dtype=np.int64)
+    if HAS_NUMBA:
+        return _time_decay_ema_jit(values, ts_ns, float(tau_seconds))
+    return _time_decay_ema_loop(values, ts_ns, float(tau_seconds))
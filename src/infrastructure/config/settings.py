@@ -17,6 +17,15 @@ class Settings:
     feature_spec: FeatureSpec
     risk_params: RiskParams
     history_path: Path
+    history_write_mode: str = "full"
+    model_dir: Path = Path("models")
+    training_workers: int = 1
+    training_threads_per_job: int = 1
+    training_lookback_days: int = 1
+    training_external_memory_dir: Path | None = None
+    feature_cache_dir: Path | None = None
+    feature_engine: str = "pandas"
+    feature_codegen_dump_dir: Path | None = None
     ws_url: str | None = None
     api_base_url: str | None = None
     api_key: str | None = None
@@ -96,6 +105,47 @@ def load_settings(data: Mapping[str, Any] | None = None) -> Settings:
         config.get("history_path") or os.environ.get("HISTORY_PATH") or "data/history"
     )
     history_path = Path(history_path_value)
+    history_write_mode = str(
+        config.get("history_write_mode")
+        or os.environ.get("HISTORY_WRITE_MODE")
+        or "full"
+    )
+    model_dir = Path(config.get("model_dir") or os.environ.get("MODEL_DIR") or "models")
+    training_workers = int(
+        config.get("training_workers")
+        or os.environ.get("TRAINING_WORKERS")
+        or os.cpu_count()
+        or 1
+    )
+    training_threads_per_job = int(
+        config.get("training_threads_per_job")
+        or os.environ.get("TRAINING_THREADS_PER_JOB")
+        or 1
+    )
+    training_lookback_days = int(
+        config.get("training_lookback_days")
+        or os.environ.get("TRAINING_LOOKBACK_DAYS")
+        or 1
+    )
+    training_external_memory_value = config.get(
+        "training_external_memory_dir"
+    ) or os.environ.get("TRAINING_EXTERNAL_MEMORY_DIR")
+    training_external_memory_dir = (
+        Path(training_external_memory_value) if training_external_memory_value else None
+    )
+    feature_cache_value = config.get("feature_cache_dir") or os.environ.get(
+        "FEATURE_CACHE_DIR"
+    )
+    feature_cache_dir = Path(feature_cache_value) if feature_cache_value else None
+    feature_engine = str(
+        config.get("feature_engine") or os.environ.get("FEATURE_ENGINE") or "pandas"
+    )
+    feature_codegen_dump_value = config.get(
+        "feature_codegen_dump_dir"
+    ) or os.environ.get("FEATURE_CODEGEN_DUMP_DIR")
+    feature_codegen_dump_dir = (
+        Path(feature_codegen_dump_value) if feature_codegen_dump_value else None
+    )
     ws_url = config.get("ws_url") or os.environ.get("WS_URL") or "ws://localhost:18081"
     api_base_url = config.get("api_base_url") or os.environ.get("API_BASE_URL") or "http://localhost:18081/kabusapi"
     api_key = config.get("api_key") or os.environ.get("X_API_KEY")
@@ -103,6 +153,15 @@ def load_settings(data: Mapping[str, Any] | None = None) -> Settings:
         feature_spec=feature_spec,
         risk_params=risk_params,
         history_path=history_path,
+        history_write_mode=history_write_mode,
+        model_dir=model_dir,
+        training_workers=training_workers,
+        training_threads_per_job=training_threads_per_job,
+        training_lookback_days=training_lookback_days,
+        training_external_memory_dir=training_external_memory_dir,
+        feature_cache_dir=feature_cache_dir,
+        feature_engine=feature_engine,
+        feature_codegen_dump_dir=feature_codegen_dump_dir,
         ws_url=ws_url,
         api_base_url=api_base_url,
         api_key=api_key,
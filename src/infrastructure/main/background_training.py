@@ -0,0 +1,68 @@
+"""Run history training in a separate process while the trader keeps going."""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from dataclasses import dataclass
+from multiprocessing.process import BaseProcess
+
+from domain.features.spec import FeatureSpec
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackgroundTrainer:
+    """Retrain models off the trading critical path.
+
+    The training process promotes each symbol's model through ``swap_active`` as
+    soon as it is ready; the trader's artifact store picks the new pointer up on
+    its next ``load_active`` call.
+    """
+
+    feature_spec: FeatureSpec
+    skip_existing: bool = True
+    mp_context: str = "spawn"
+
+    def __post_init__(self) -> None:
+        self._process: BaseProcess | None = None
+
+    def start(self) -> None:
+        if self.is_running():
+            return
+        context = multiprocessing.get_context(self.mp_context)
+        self._process = context.Process(
+            target=_train_entry,
+            args=(self.feature_spec, self.skip_existing),
+            name="background-training",
+        )
+        self._process.start()
+        logger.info("background training started (pid=%s)", self._process.pid)
+
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait for training to finish; return True if it is no longer running."""
+
+        if self._process is None:
+            return True
+        self._process.join(timeout)
+        return not self._process.is_alive()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if not self.is_running():
+            return
+        self._process.terminate()
+        self._process.join(timeout)
+
+
+def _train_entry(feature_spec: FeatureSpec, skip_existing: bool) -> None:
+    from infrastructure.logging.setup import configure_logging
+    from infrastructure.main.training_bootstrap import (
+        train_models_from_history,
+    )
+
+    configure_logging()
+    train_models_from_history(feature_spec=feature_spec, skip_existing=skip_existing)
@@ -2,10 +2,8 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-
-from infrastructure.compute.feature_engine_pandas import (
-    PandasOrderBookFeatureEngine,
+from infrastructure.compute.feature_engine_factory import (
+    build_feature_engine,
 )
 from infrastructure.config.settings import (
     load_settings,
@@ -13,8 +11,8 @@ from infrastructure.config.settings import (
 from infrastructure.persistence.csv_history_store import (
     CsvHistoryStore,
 )
-from infrastructure.persistence.model_store_fs import (
-    ModelStoreFs,
+from infrastructure.persistence.model_artifact_store import (
+    SymbolModelArtifactStore,
 )
 from infrastructure.websocket.client import (
     WebSocketClient,
@@ -26,9 +24,15 @@ from infrastructure.websocket.market_data import (
 
 def build_container() -> dict:
     settings = load_settings()
-    history_store = CsvHistoryStore(path=settings.history_path)
-    feature_engine = PandasOrderBookFeatureEngine()
-    model_store = ModelStoreFs(base_dir=Path("models"))
+    history_store = CsvHistoryStore(
+        path=settings.history_path, write_mode=settings.history_write_mode
+    )
+    feature_engine = build_feature_engine(
+        settings.feature_engine, settings.feature_codegen_dump_dir
+    )
+    model_store = SymbolModelArtifactStore(
+        base_dir=settings.model_dir, spec=settings.feature_spec
+    )
     market_data = None
     if settings.ws_url:
         ws_client = WebSocketClient(url=settings.ws_url, api_key=settings.api_key)
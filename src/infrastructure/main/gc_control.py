@@ -0,0 +1,151 @@
+"""Garbage-collector control for the trading loop."""
+
+from __future__ import annotations
+
+import gc
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Tuple
+
+from application.ports.metrics import MetricsPort
+
+logger = logging.getLogger(__name__)
+
+GC_MODE_DEFAULT = "default"
+GC_MODE_TUNED = "tuned"
+GC_MODE_MANUAL = "manual"
+_GC_MODES = {GC_MODE_DEFAULT, GC_MODE_TUNED, GC_MODE_MANUAL}
+
+
+@dataclass
+class GcStats:
+    collections: Dict[int, int] = field(default_factory=dict)
+    total_pause_ms: Dict[int, float] = field(default_factory=dict)
+    max_pause_ms: Dict[int, float] = field(default_factory=dict)
+
+    def add(self, generation: int, pause_ms: float) -> None:
+        self.collections[generation] = self.collections.get(generation, 0) + 1
+        self.total_pause_ms[generation] = (
+            self.total_pause_ms.get(generation, 0.0) + pause_ms
+        )
+        self.max_pause_ms[generation] = max(
+            self.max_pause_ms.get(generation, 0.0), pause_ms
+        )
+
+
+@dataclass
+class GcController:
+    """Keeps cyclic GC pauses out of ``run_once``.
+
+    * default: CPython's automatic collection, only pause statistics are kept
+    * tuned: startup objects are frozen and thresholds raised to ``thresholds``
+    * manual: startup objects are frozen and automatic collection disabled
+
+    In tuned and manual mode ``safe_point`` (called between ticks) collects the
+    young generations once ``young_threshold`` allocations accumulated, and the
+    full heap when the last gap between ticks was at least ``idle_gap_seconds``
+    and ``full_interval_seconds`` passed, or unconditionally after
+    ``max_full_interval_seconds``. Every collection, automatic or explicit, is
+    timed through ``gc.callbacks`` into ``stats`` only (fixed-size, no metrics
+    call from inside the collector). At most every ``publish_interval_seconds``
+    ``safe_point`` (and ``stop``) publishes the collections since the last
+    publish to ``metrics`` as ``gc.collections.gen<N>`` and their largest
+    pause as ``gc.max_pause_ms.gen<N>``.
+    """
+
+    mode: str = GC_MODE_DEFAULT
+    thresholds: Tuple[int, int, int] = (50_000, 50, 100)
+    young_threshold: int = 20_000
+    idle_gap_seconds: float = 0.05
+    full_interval_seconds: float = 60.0
+    max_full_interval_seconds: float = 600.0
+    metrics: MetricsPort | None = None
+    publish_interval_seconds: float = 10.0
+    clock: Callable[[], float] = time.perf_counter
+    stats: GcStats = field(default_factory=GcStats)
+
+    def __post_init__(self) -> None:
+        if self.mode not in _GC_MODES:
+            raise ValueError(f"Unsupported GC mode: {self.mode}")
+        self._started_at: float | None = None
+        self._last_safe_point: float | None = None
+        self._last_full: float = 0.0
+        self._saved: Tuple[bool, Tuple[int, int, int]] | None = None
+        self._unpublished = GcStats()
+        self._last_publish: float = 0.0
+
+    def start(self) -> None:
+        """Apply the mode; call once startup (model loading etc.) is done."""
+
+        self._saved = (gc.isenabled(), gc.get_threshold())
+        gc.callbacks.append(self._on_gc)
+        if self.mode != GC_MODE_DEFAULT:
+            gc.collect()
+            # Startup objects live for the whole session; keep them out of
+            # every later collection.
+            gc.freeze()
+            if self.mode == GC_MODE_MANUAL:
+                gc.disable()
+            else:
+                gc.set_threshold(*self.thresholds)
+        self._last_full = self._last_publish = self.clock()
+        logger.info("gc mode %s (frozen objects: %d)", self.mode, gc.get_freeze_count())
+
+    def stop(self) -> None:
+        """Restore the interpreter's previous GC configuration."""
+
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        self._publish()
+        if self._saved is None:
+            return
+        enabled, thresholds = self._saved
+        gc.set_threshold(*thresholds)
+        if self.mode != GC_MODE_DEFAULT:
+            gc.unfreeze()
+        if enabled:
+            gc.enable()
+        self._saved = None
+
+    def safe_point(self) -> None:
+        """Collect if due; call between ticks, never inside ``run_once``."""
+
+        now = self.clock()
+        gap = 0.0 if self._last_safe_point is None else now - self._last_safe_point
+        if self.mode != GC_MODE_DEFAULT:
+            since_full = now - self._last_full
+            if since_full >= self.max_full_interval_seconds or (
+                since_full >= self.full_interval_seconds
+                and gap >= self.idle_gap_seconds
+            ):
+                gc.collect()
+                self._last_full = self.clock()
+            elif gc.get_count()[0] >= self.young_threshold:
+                gc.collect(1)
+        if now - self._last_publish >= self.publish_interval_seconds:
+            self._publish()
+        self._last_safe_point = self.clock()
+
+    def _publish(self) -> None:
+        self._last_publish = self.clock()
+        if self.metrics is None or not self._unpublished.collections:
+            return
+        stats, self._unpublished = self._unpublished, GcStats()
+        for generation, count in sorted(stats.collections.items()):
+            self.metrics.incr(f"gc.collections.gen{generation}", count)
+            self.metrics.timing(
+                f"gc.max_pause_ms.gen{generation}", stats.max_pause_ms[generation]
+            )
+
+    def _on_gc(self, phase: str, info: Dict[str, Any]) -> None:
+        if phase == "start":
+            self._started_at = self.clock()
+            return
+        if self._started_at is None:
+            return
+        pause_ms = (self.clock() - self._started_at) * 1000.0
+        self._started_at = None
+        generation = int(info.get("generation", 0))
+        self.stats.add(generation, pause_ms)
+        self._unpublished.add(generation, pause_ms)
@@ -0,0 +1,30 @@
+"""Entrypoint for compacting finished days of the history archive."""
+
+from __future__ import annotations
+
+import os
+from datetime import date, datetime, timezone
+from typing import List
+
+from infrastructure.config.settings import (
+    load_settings,
+)
+from infrastructure.persistence.csv_history_store import (
+    CsvHistoryStore,
+)
+from infrastructure.persistence.history_archive import CODEC_GZIP
+from infrastructure.persistence.history_compaction import (
+    compact_finished_days,
+)
+
+
+def main(today: date | None = None) -> List[date]:
+    settings = load_settings()
+    store = CsvHistoryStore(path=settings.history_path)
+    before = today or datetime.now(timezone.utc).date()
+    codec = os.environ.get("HISTORY_COMPACTION_CODEC", CODEC_GZIP)
+    return compact_finished_days(store, before, codec)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Entrypoint for walk-forward evaluation sweeps."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List
+
+from domain.features.spec import FeatureSpec
+from domain.market.time import day_bounds
+from infrastructure.config.settings import (
+    load_settings,
+)
+from infrastructure.main.walk_forward import (
+    WalkForwardGrid,
+    WalkForwardResult,
+    WalkForwardRunner,
+    write_walk_forward_report,
+)
+from infrastructure.persistence.csv_history_store import (
+    CsvHistoryStore,
+)
+
+
+def main(feature_spec: FeatureSpec | None = None) -> List[WalkForwardResult]:
+    settings = load_settings()
+    spec = feature_spec or settings.feature_spec
+    grid_json = os.environ.get("WALK_FORWARD_GRID_JSON")
+    grid = WalkForwardGrid.from_json(grid_json) if grid_json else WalkForwardGrid()
+    history_store = CsvHistoryStore(path=settings.history_path)
+    symbols_env = os.environ.get("WALK_FORWARD_SYMBOLS")
+    if symbols_env:
+        symbols = [s.strip() for s in symbols_env.split(",") if s.strip()]
+    else:
+        available = history_store.available_dates()
+        symbols = (
+            history_store.symbols_in_range(
+                day_bounds(available[0])[0], day_bounds(available[-1])[1]
+            )
+            if available
+            else []
+        )
+    runner = WalkForwardRunner(
+        history_path=settings.history_path,
+        feature_cache_dir=settings.feature_cache_dir or Path("data/feature_cache"),
+        spec=spec,
+        grid=grid,
+        train_window_days=int(os.environ.get("WALK_FORWARD_TRAIN_DAYS", 5)),
+        max_workers=settings.training_workers,
+        threads_per_job=settings.training_threads_per_job,
+    )
+    results = runner.run(symbols)
+    write_walk_forward_report(
+        Path(os.environ.get("WALK_FORWARD_REPORT", "reports/walk_forward.csv")),
+        results,
+    )
+    return results
+
+
+if __name__ == "__main__":
+    main()
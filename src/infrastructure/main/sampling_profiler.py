@@ -0,0 +1,155 @@
+"""On-demand stack-sampling profiler writing collapsed-stack files."""
+
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import FrameType
+from typing import Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MAX_DEPTH = 128
+
+
+def frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{code.co_qualname}"
+
+
+def collapse_stack(frame: FrameType | None) -> Tuple[str, ...]:
+    """Frame labels from the outermost call down to ``frame``."""
+
+    labels: List[str] = []
+    while frame is not None and len(labels) < _MAX_DEPTH:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+@dataclass
+class SamplingProfiler:
+    """Samples one thread's stack on a timer while switched on.
+
+    Profiling is on while it was toggled on (``toggle``, or ``signum`` once
+    ``install_signal`` ran) or while ``control_path`` exists. While on, the
+    ``profiler`` thread records the stack of ``thread_id`` every
+    ``interval_seconds``, prefixed with ``stage_of()`` (e.g. the pipeline
+    stage). Switching off writes ``profile.<time>.folded`` to ``output_dir``
+    in collapsed-stack format (``stage;outer;...;inner count``), which
+    flamegraph.pl and speedscope read. While off, the thread only checks the
+    control file every ``poll_seconds``.
+    """
+
+    output_dir: Path
+    interval_seconds: float = 0.005
+    control_path: Path | None = None
+    poll_seconds: float = 1.0
+    thread_id: int = field(default_factory=threading.get_ident)
+    stage_of: Callable[[], str] | None = None
+
+    def __post_init__(self) -> None:
+        self.output_dir = Path(self.output_dir)
+        if self.control_path is not None:
+            self.control_path = Path(self.control_path)
+        self.samples: Counter[Tuple[str, ...]] = Counter()
+        self._toggled = False
+        self._active = False
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> Path | None:
+        """Stop the thread; returns the file written if profiling was on."""
+
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._active:
+            self._active = False
+            return self.dump()
+        return None
+
+    def toggle(self) -> None:
+        self._toggled = not self._toggled
+        self._wake.set()
+
+    def install_signal(self, signum: int = getattr(signal, "SIGUSR2", 0)) -> None:
+        """Toggle profiling on ``signum``; call from the main thread."""
+
+        if not signum:
+            raise RuntimeError("No profiler toggle signal on this platform")
+        signal.signal(signum, lambda _signum, _frame: self.toggle())
+
+    def sample_once(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        stage = self.stage_of() if self.stage_of is not None else None
+        stack = collapse_stack(frame)
+        self.samples[(stage,) + stack if stage else stack] += 1
+
+    def dump(self) -> Path | None:
+        """Write and reset the aggregated samples."""
+
+        samples, self.samples = self.samples, Counter()
+        if not samples:
+            return None
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        path = self.output_dir / f"profile.{stamp}.{os.getpid()}.folded"
+        with path.open("w") as f:
+            for stack, count in sorted(samples.items()):
+                f.write(f"{';'.join(stack)} {count}\n")
+        logger.info(
+            "wrote %d samples (%d stacks) to %s",
+            sum(samples.values()),
+            len(samples),
+            path,
+        )
+        return path
+
+    def _requested(self) -> bool:
+        if self._toggled:
+            return True
+        return self.control_path is not None and self.control_path.exists()
+
+    def _run(self) -> None:
+        next_poll = 0.0
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now >= next_poll or self._wake.is_set():
+                self._wake.clear()
+                next_poll = now + self.poll_seconds
+                requested = self._requested()
+                if requested != self._active:
+                    self._active = requested
+                    logger.info("profiling %s", "on" if requested else "off")
+                    if not requested:
+                        self.dump()
+            if self._active:
+                self.sample_once()
+                self._stop.wait(self.interval_seconds)
+            else:
+                self._wake.wait(max(0.0, next_poll - time.monotonic()))
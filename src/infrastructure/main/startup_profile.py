@@ -0,0 +1,85 @@
+"""Startup phase timing and time-to-first-tick reporting."""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List
+
+from application.ports.metrics import MetricsPort
+
+logger = logging.getLogger(__name__)
+
+PHASE_IMPORT = "import"
+PHASE_INIT = "init"
+
+
+@dataclass(frozen=True)
+class StartupPhase:
+    name: str
+    kind: str
+    elapsed_ms: float
+
+
+@dataclass
+class StartupProfile:
+    """Times startup from construction to the first processed tick.
+
+    Deferred adapter imports are wrapped in ``imports(name)`` and setup steps
+    in ``phase(name)``. ``first_tick`` closes the profile once, logs one line
+    per phase plus the total, publishes ``startup.first_tick_ms`` and warns
+    when the total exceeded ``target_ms``.
+    """
+
+    target_ms: float | None = None
+    metrics: MetricsPort | None = None
+    clock: Callable[[], float] = time.perf_counter
+    phases: List[StartupPhase] = field(default_factory=list)
+    first_tick_ms: float | None = None
+
+    def __post_init__(self) -> None:
+        self._started_at = self.clock()
+
+    @contextmanager
+    def phase(self, name: str, kind: str = PHASE_INIT) -> Iterator[None]:
+        started = self.clock()
+        try:
+            yield
+        finally:
+            self.phases.append(
+                StartupPhase(name, kind, (self.clock() - started) * 1000.0)
+            )
+
+    def imports(self, name: str):
+        return self.phase(name, kind=PHASE_IMPORT)
+
+    def first_tick(self) -> None:
+        if self.first_tick_ms is not None:
+            return
+        self.first_tick_ms = (self.clock() - self._started_at) * 1000.0
+        for line in self.report():
+            logger.info("%s", line)
+        if self.metrics is not None:
+            self.metrics.timing("startup.first_tick_ms", self.first_tick_ms)
+        if self.target_ms is not None and self.first_tick_ms > self.target_ms:
+            logger.warning(
+                "first tick after %.1fms exceeds the %.1fms startup target",
+                self.first_tick_ms,
+                self.target_ms,
+            )
+
+    def report(self) -> List[str]:
+        lines = [
+            f"startup {phase.kind:<6} {phase.name:<24} {phase.elapsed_ms:9.1f}ms"
+            for phase in self.phases
+        ]
+        if self.first_tick_ms is not None:
+            target = (
+                "" if self.target_ms is None else f" (target {self.target_ms:.0f}ms)"
+            )
+            lines.append(
+                f"startup total  {'first tick':<24} {self.first_tick_ms:9.1f}ms{target}"
+            )
+        return lines
@@ -2,61 +2,69 @@
 
 from __future__ import annotations
 
-from datetime import date, datetime, time, timedelta, timezone
-from pathlib import Path
-from typing import Iterable
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import List
 
-from application.service.pipelines.training_pipeline import (
-    TrainingPipeline,
-)
-from domain.market.orderbook_snapshot import (
-    OrderBookSnapshot,
-)
-from infrastructure.compute.feature_engine_pandas import (
-    PandasOrderBookFeatureEngine,
-)
+from domain.features.spec import FeatureSpec
+from domain.market.time import day_bounds
 from infrastructure.config.settings import (
     load_settings,
 )
-from infrastructure.ml.xgb_trainer import XgbTrainer
+from infrastructure.main.training_orchestrator import (
+    SymbolTrainingReport,
+    TrainingOrchestrator,
+)
 from infrastructure.persistence.csv_history_store import (
     CsvHistoryStore,
 )
-from infrastructure.persistence.model_store_fs import (
-    ModelStoreFs,
+from infrastructure.persistence.model_artifact_store import (
+    ModelArtifactStore,
+    SymbolModelArtifactStore,
 )
 
 
-def train_models_from_history(asof: datetime | None = None) -> None:
+def train_models_from_history(
+    asof: datetime | None = None,
+    feature_spec: FeatureSpec | None = None,
+    skip_existing: bool = False,
+) -> List[SymbolTrainingReport]:
     settings = load_settings()
+    spec = feature_spec or settings.feature_spec
     history_store = CsvHistoryStore(path=settings.history_path)
     training_day = _select_training_day(
         history_store, asof or datetime.now(timezone.utc)
     )
     if training_day is None:
-        return
-
-    snapshots = list(_read_day(history_store, training_day))
-    if not snapshots:
-        return
-
-    feature_engine = PandasOrderBookFeatureEngine()
-    trainer = XgbTrainer()
+        return []
+    lookback = _lookback_days(
+        history_store, training_day, settings.training_lookback_days
+    )
 
-    snapshots_by_symbol: dict[str, list[OrderBookSnapshot]] = {}
-    for snap in snapshots:
-        symbol = str(snap.symbol)
-        snapshots_by_symbol.setdefault(symbol, []).append(snap)
+    symbols = history_store.symbols_in_range(*day_bounds(training_day))
+    if skip_existing:
+        model_stores = SymbolModelArtifactStore(base_dir=settings.model_dir, spec=spec)
+        symbols = [
+            symbol
+            for symbol in symbols
+            if not _has_model_for_day(
+                model_stores.store_for(symbol), spec, training_day
+            )
+        ]
+    if not symbols:
+        return []
 
-    for symbol, symbol_snaps in snapshots_by_symbol.items():
-        model_store = ModelStoreFs(base_dir=Path("models") / symbol)
-        pipeline = TrainingPipeline(
-            history_store=history_store,
-            feature_engine=feature_engine,
-            trainer=trainer,
-            model_store=model_store,
-        )
-        pipeline.run(settings.feature_spec, symbol_snaps)
+    orchestrator = TrainingOrchestrator(
+        history_path=settings.history_path,
+        model_dir=settings.model_dir,
+        spec=spec,
+        max_workers=settings.training_workers,
+        threads_per_job=settings.training_threads_per_job,
+        external_memory_dir=settings.training_external_memory_dir,
+        feature_cache_dir=settings.feature_cache_dir,
+        compaction_codec=os.environ.get("HISTORY_COMPACTION_CODEC") or None,
+    )
+    return orchestrator.run(training_day, symbols, lookback=lookback)
 
 
 def _select_training_day(history_store: CsvHistoryStore, asof: datetime) -> date | None:
@@ -75,7 +83,21 @@ def _select_training_day(history_store: CsvHistoryStore, asof: datetime) -> date
     return max(available)
 
 
-def _read_day(history_store: CsvHistoryStore, day: date) -> Iterable[OrderBookSnapshot]:
-    start = datetime.combine(day, time(0, 0, 0), tzinfo=timezone.utc)
-    end = start + timedelta(days=1) - timedelta(microseconds=1)
-    return history_store.read_range(start, end)
+def _lookback_days(
+    history_store: CsvHistoryStore, training_day: date, lookback_days: int
+) -> List[date]:
+    """Return up to ``lookback_days`` available days ending at ``training_day``."""
+
+    available = sorted(d for d in history_store.available_dates() if d <= training_day)
+    return available[-max(1, lookback_days) :]
+
+
+def _has_model_for_day(store: ModelArtifactStore, spec: FeatureSpec, day: date) -> bool:
+    """Return True when the active artifact already covers ``day`` for ``spec``."""
+
+    manifest = store.active_manifest()
+    if manifest is None or manifest.spec_hash != spec.fingerprint():
+        return False
+    if not manifest.training_end:
+        return False
+    return datetime.fromisoformat(manifest.training_end).date() >= day
@@ -0,0 +1,233 @@
+"""Parallel per-symbol training over a process pool."""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Sequence, Tuple
+
+from domain.features.spec import FeatureSpec
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SymbolTrainingJob:
+    symbol: str
+    day: date
+    history_path: Path
+    model_dir: Path
+    spec: FeatureSpec
+    trainer_params: Dict[str, Any]
+    threads: int = 1
+    label_horizon_seconds: float = 10.0
+    days: Tuple[date, ...] = ()
+    external_memory_dir: Path | None = None
+    feature_cache_dir: Path | None = None
+
+    @property
+    def training_days(self) -> Tuple[date, ...]:
+        return self.days or (self.day,)
+
+
+@dataclass(frozen=True)
+class SymbolTrainingReport:
+    symbol: str
+    ok: bool
+    rows: int
+    seconds: float
+    error: str | None = None
+
+
+@dataclass
+class TrainingOrchestrator:
+    """Fan symbol training jobs out over worker processes.
+
+    Each worker streams its own symbol from the history files, so no snapshot
+    lists are pickled across processes. A failing symbol only fails its own
+    report. Workers read hourly files through their ``.idx`` blocks and skip
+    other symbols' rows unparsed. When ``compaction_codec`` is set, finished
+    training days are compacted once before fanning out, so every worker
+    seeks straight to its symbol's frame; this replaces the raw hourly files,
+    so it is off by default.
+    """
+
+    history_path: Path
+    model_dir: Path
+    spec: FeatureSpec
+    max_workers: int = 1
+    threads_per_job: int = 1
+    trainer_params: Dict[str, Any] | None = None
+    label_horizon_seconds: float = 10.0
+    mp_context: str = "spawn"
+    external_memory_dir: Path | None = None
+    feature_cache_dir: Path | None = None
+    compaction_codec: str | None = None
+
+    def run(
+        self,
+        day: date,
+        symbols: Sequence[str],
+        lookback: Sequence[date] = (),
+    ) -> List[SymbolTrainingReport]:
+        """Train ``symbols`` for ``day``; ``lookback`` lists every day to train on."""
+
+        jobs = [self._job_for(symbol, day, lookback) for symbol in symbols]
+        if not jobs:
+            return []
+
+        started = perf_counter()
+        if len(jobs) > 1:
+            self._compact_finished_days(jobs[0].training_days)
+        if self.max_workers <= 1 or len(jobs) == 1:
+            reports = [run_symbol_job(job) for job in jobs]
+        else:
+            reports = self._run_pool(jobs)
+        for report in reports:
+            if report.ok:
+                logger.info(
+                    "trained %s rows=%d in %.2fs",
+                    report.symbol,
+                    report.rows,
+                    report.seconds,
+                )
+            else:
+                logger.error("training failed for %s: %s", report.symbol, report.error)
+        logger.info(
+            "trained %d/%d symbols for %s in %.2fs",
+            sum(1 for report in reports if report.ok),
+            len(reports),
+            day.isoformat(),
+            perf_counter() - started,
+        )
+        return reports
+
+    def _job_for(
+        self, symbol: str, day: date, lookback: Sequence[date]
+    ) -> SymbolTrainingJob:
+        return SymbolTrainingJob(
+            symbol=symbol,
+            day=day,
+            history_path=Path(self.history_path),
+            model_dir=Path(self.model_dir),
+            spec=self.spec,
+            trainer_params=dict(self.trainer_params or {}),
+            threads=max(1, self.threads_per_job),
+            label_horizon_seconds=self.label_horizon_seconds,
+            days=tuple(sorted(lookback)),
+            external_memory_dir=(
+                Path(self.external_memory_dir) / symbol
+                if self.external_memory_dir is not None
+                else None
+            ),
+            feature_cache_dir=(
+                Path(self.feature_cache_dir)
+                if self.feature_cache_dir is not None
+                else None
+            ),
+        )
+
+    def _compact_finished_days(self, days: Sequence[date]) -> None:
+        if self.compaction_codec is None:
+            return
+        from infrastructure.persistence.csv_history_store import (
+            CsvHistoryStore,
+        )
+        from infrastructure.persistence.history_compaction import compact_day
+
+        store = CsvHistoryStore(path=self.history_path)
+        today = datetime.now(timezone.utc).date()
+        for day in days:
+            if day >= today:
+                continue
+            try:
+                compact_day(store, day, self.compaction_codec)
+            except Exception:  # noqa: BLE001 - workers fall back to hourly files
+                logger.warning(
+                    "compacting %s before training failed", day, exc_info=True
+                )
+
+    def _run_pool(self, jobs: List[SymbolTrainingJob]) -> List[SymbolTrainingReport]:
+        workers = min(self.max_workers, len(jobs))
+        context = multiprocessing.get_context(self.mp_context)
+        reports: List[SymbolTrainingReport] = []
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures: List[tuple[SymbolTrainingJob, Future]] = [
+                (job, pool.submit(run_symbol_job, job)) for job in jobs
+            ]
+            for job, future in futures:
+                try:
+                    reports.append(future.result())
+                except Exception as exc:  # noqa: BLE001 - e.g. a crashed worker
+                    reports.append(
+                        SymbolTrainingReport(
+                            symbol=job.symbol,
+                            ok=False,
+                            rows=0,
+                            seconds=0.0,
+                            error=repr(exc),
+                        )
+                    )
+        return reports
+
+
+def run_symbol_job(job: SymbolTrainingJob) -> SymbolTrainingReport:
+    """Train and activate one symbol's model (runs inside a worker process)."""
+
+    from application.service.pipelines.training_pipeline import (
+        TrainingPipeline,
+    )
+    from infrastructure.compute.feature_engine_pandas import (
+        PandasOrderBookFeatureEngine,
+    )
+    from infrastructure.ml.xgb_trainer import XgbTrainer
+    from infrastructure.persistence.csv_history_store import (
+        CsvHistoryStore,
+    )
+    from infrastructure.persistence.feature_cache_fs import (
+        FeatureCacheFs,
+    )
+    from infrastructure.persistence.model_artifact_store import (
+        ModelArtifactStore,
+    )
+
+    started = perf_counter()
+    rows = 0
+    try:
+        history_store = CsvHistoryStore(path=job.history_path)
+        trainer = XgbTrainer(external_memory_dir=job.external_memory_dir)
+        trainer.params = {**trainer.params, **job.trainer_params, "n_jobs": job.threads}
+        pipeline = TrainingPipeline(
+            history_store=history_store,
+            feature_engine=PandasOrderBookFeatureEngine(),
+            trainer=trainer,
+            model_store=ModelArtifactStore(
+                base_dir=job.model_dir / job.symbol, spec=job.spec
+            ),
+            label_horizon_seconds=job.label_horizon_seconds,
+            feature_cache=(
+                FeatureCacheFs(base_dir=job.feature_cache_dir)
+                if job.feature_cache_dir is not None
+                else None
+            ),
+        )
+        rows = pipeline.run_days(job.spec, job.symbol, job.training_days)
+    except Exception as exc:  # noqa: BLE001 - isolate per-symbol failures
+        return SymbolTrainingReport(
+            symbol=job.symbol,
+            ok=False,
+            rows=rows,
+            seconds=perf_counter() - started,
+            error=repr(exc),
+        )
+    return SymbolTrainingReport(
+        symbol=job.symbol,
+        ok=True,
+        rows=rows,
+        seconds=perf_counter() - started,
+    )
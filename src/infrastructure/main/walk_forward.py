@@ -0,0 +1,364 @@
+"""Walk-forward evaluation and parameter sweeps over cached features."""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import logging
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from datetime import date
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from domain.features.spec import FeatureSpec
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WalkForwardGrid:
+    """Parameter grid: every trainer param combination x horizon x threshold.
+
+    Thresholds are evaluated on the same trained model, so they add no training
+    cost; trainer params and horizons each need their own model.
+    """
+
+    trainer_params: Dict[str, Sequence[Any]] = field(default_factory=dict)
+    label_horizons: Sequence[float] = (10.0,)
+    score_thresholds: Sequence[float] = (0.0,)
+
+    def trainer_param_sets(self) -> List[Dict[str, Any]]:
+        keys = sorted(self.trainer_params)
+        return [
+            dict(zip(keys, values))
+            for values in itertools.product(*(self.trainer_params[k] for k in keys))
+        ]
+
+    @classmethod
+    def from_json(cls, text: str) -> "WalkForwardGrid":
+        data = json.loads(text)
+        return cls(
+            trainer_params={
+                key: list(values)
+                for key, values in (data.get("trainer_params") or {}).items()
+            },
+            label_horizons=tuple(data.get("label_horizons") or (10.0,)),
+            score_thresholds=tuple(data.get("score_thresholds") or (0.0,)),
+        )
+
+
+@dataclass(frozen=True)
+class WalkForwardJob:
+    symbol: str
+    train_days: Tuple[date, ...]
+    test_day: date
+    history_path: Path
+    feature_cache_dir: Path
+    spec: FeatureSpec
+    trainer_params: Dict[str, Any]
+    label_horizon_seconds: float
+    score_thresholds: Tuple[float, ...]
+    threads: int = 1
+
+
+@dataclass(frozen=True)
+class WalkForwardResult:
+    symbol: str
+    test_day: str
+    train_start: str
+    train_end: str
+    trainer_params: str
+    label_horizon_seconds: float
+    score_threshold: float
+    train_rows: int = 0
+    test_rows: int = 0
+    test_logloss: float = float("nan")
+    test_accuracy: float = float("nan")
+    trades: int = 0
+    hit_rate: float = float("nan")
+    mean_return_bps: float = float("nan")
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def walk_forward_windows(
+    available: Sequence[date],
+    train_window_days: int,
+    test_days: Sequence[date] | None = None,
+) -> List[Tuple[Tuple[date, ...], date]]:
+    """Pair each test day D with the ``train_window_days`` available days before it."""
+
+    ordered = sorted(set(available))
+    wanted = set(test_days) if test_days is not None else None
+    windows: List[Tuple[Tuple[date, ...], date]] = []
+    for index, day in enumerate(ordered):
+        if index < train_window_days or (wanted is not None and day not in wanted):
+            continue
+        windows.append((tuple(ordered[index - train_window_days : index]), day))
+    return windows
+
+
+@dataclass
+class WalkForwardRunner:
+    """Train on days D-k..D-1, evaluate on D, for every grid point and symbol.
+
+    Features are computed once per symbol-day into the feature cache; workers
+    then memory-map the same read-only partitions, so the OS page cache is
+    shared instead of each process holding its own copy.
+    """
+
+    history_path: Path
+    feature_cache_dir: Path
+    spec: FeatureSpec
+    grid: WalkForwardGrid
+    train_window_days: int = 5
+    max_workers: int = 1
+    threads_per_job: int = 1
+    mp_context: str = "spawn"
+
+    def plan(
+        self, symbols: Sequence[str], test_days: Sequence[date] | None = None
+    ) -> List[WalkForwardJob]:
+        from infrastructure.persistence.csv_history_store import (
+            CsvHistoryStore,
+        )
+
+        available = CsvHistoryStore(path=self.history_path).available_dates()
+        windows = walk_forward_windows(available, self.train_window_days, test_days)
+        return [
+            WalkForwardJob(
+                symbol=symbol,
+                train_days=train_days,
+                test_day=test_day,
+                history_path=Path(self.history_path),
+                feature_cache_dir=Path(self.feature_cache_dir),
+                spec=self.spec,
+                trainer_params=params,
+                label_horizon_seconds=float(horizon),
+                score_thresholds=tuple(float(t) for t in self.grid.score_thresholds),
+                threads=max(1, self.threads_per_job),
+            )
+            for symbol in symbols
+            for train_days, test_day in windows
+            for params in self.grid.trainer_param_sets()
+            for horizon in self.grid.label_horizons
+        ]
+
+    def run(
+        self, symbols: Sequence[str], test_days: Sequence[date] | None = None
+    ) -> List[WalkForwardResult]:
+        jobs = self.plan(symbols, test_days)
+        if not jobs:
+            return []
+        started = perf_counter()
+        partitions = sorted(
+            {
+                (job.symbol, day)
+                for job in jobs
+                for day in (*job.train_days, job.test_day)
+            }
+        )
+        if self.max_workers <= 1:
+            for symbol, day in partitions:
+                warm_feature_partition(self._warm_args(symbol, day))
+            nested = [run_walk_forward_job(job) for job in jobs]
+        else:
+            context = multiprocessing.get_context(self.mp_context)
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=context
+            ) as pool:
+                _gather(
+                    pool,
+                    warm_feature_partition,
+                    [self._warm_args(symbol, day) for symbol, day in partitions],
+                )
+                nested = _gather(pool, run_walk_forward_job, jobs)
+        results = [
+            result
+            for job, job_results in zip(jobs, nested)
+            for result in (job_results or _failed_results(job, "worker crashed"))
+        ]
+        logger.info(
+            "walk-forward: %d jobs, %d partitions, %d rows in %.1fs",
+            len(jobs),
+            len(partitions),
+            len(results),
+            perf_counter() - started,
+        )
+        return results
+
+    def _warm_args(self, symbol: str, day: date) -> Tuple[Any, ...]:
+        return (self.history_path, self.feature_cache_dir, self.spec, symbol, day)
+
+
+def write_walk_forward_report(path: Path, results: Sequence[WalkForwardResult]) -> None:
+    """Write one CSV row per (symbol, test day, grid point, threshold)."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="") as f:
+        writer = csv.DictWriter(
+            f, fieldnames=[item.name for item in fields(WalkForwardResult)]
+        )
+        writer.writeheader()
+        for result in results:
+            writer.writerow(asdict(result))
+
+
+def warm_feature_partition(args: Tuple[Any, ...]) -> int:
+    """Compute (or validate) the cached features of one symbol-day."""
+
+    history_path, feature_cache_dir, spec, symbol, day = args
+    builder = _dataset_builder(history_path, feature_cache_dir)
+    return len(builder.feature_partition(spec, symbol, day))
+
+
+def run_walk_forward_job(job: WalkForwardJob) -> List[WalkForwardResult]:
+    """Train one grid point on the train window and score the test day."""
+
+    from application.service.labeling import LabelSpec
+    from infrastructure.ml.flat_tree_predictor import compile_predictor
+    from infrastructure.ml.xgb_trainer import XgbTrainer
+
+    started = perf_counter()
+    train_rows = 0
+    try:
+        builder = _dataset_builder(job.history_path, job.feature_cache_dir)
+        updown = LabelSpec(horizon_seconds=job.label_horizon_seconds)
+        forward = LabelSpec(horizon_seconds=job.label_horizon_seconds, kind="return")
+
+        def train_chunks():
+            nonlocal train_rows
+            train_rows = 0
+            for day in job.train_days:
+                chunk = builder.build_day_columns(
+                    job.spec, job.symbol, day, [updown]
+                ).for_label(updown.column)
+                train_rows += len(chunk)
+                yield chunk
+
+        trainer = XgbTrainer()
+        trainer.params = {**trainer.params, **job.trainer_params, "n_jobs": job.threads}
+        predictor = compile_predictor(trainer.train_chunks(job.spec, train_chunks))
+        test = builder.build_day_columns(
+            job.spec, job.symbol, job.test_day, [updown, forward]
+        ).for_label(updown.column)
+        scores = predictor.predict_batch(test.features)
+    except Exception as exc:  # noqa: BLE001 - one bad grid point must not stop a sweep
+        return _failed_results(job, repr(exc), perf_counter() - started, train_rows)
+
+    seconds = perf_counter() - started
+    target = test.labels if test.labels is not None else np.zeros(0)
+    logloss, accuracy = _classification_metrics(target, scores)
+    forward_returns = test.label_columns[forward.column]
+    results: List[WalkForwardResult] = []
+    for threshold in job.score_thresholds:
+        trades, hit_rate, mean_return = _threshold_metrics(
+            scores, forward_returns, threshold
+        )
+        results.append(
+            WalkForwardResult(
+                **_result_key(job, threshold),
+                train_rows=train_rows,
+                test_rows=len(test),
+                test_logloss=logloss,
+                test_accuracy=accuracy,
+                trades=trades,
+                hit_rate=hit_rate,
+                mean_return_bps=mean_return * 1e4,
+                seconds=seconds,
+            )
+        )
+    return results
+
+
+def _dataset_builder(history_path: Path, feature_cache_dir: Path) -> Any:
+    from application.service.dataset import DatasetBuilder
+    from infrastructure.compute.feature_engine_pandas import (
+        PandasOrderBookFeatureEngine,
+    )
+    from infrastructure.persistence.csv_history_store import (
+        CsvHistoryStore,
+    )
+    from infrastructure.persistence.feature_cache_fs import (
+        FeatureCacheFs,
+    )
+
+    return DatasetBuilder(
+        history_store=CsvHistoryStore(path=history_path),
+        feature_engine=PandasOrderBookFeatureEngine(),
+        feature_cache=FeatureCacheFs(base_dir=feature_cache_dir),
+    )
+
+
+def _gather(
+    pool: Executor, fn: Callable[[Any], Any], items: Sequence[Any]
+) -> List[Any]:
+    futures: List[Future] = [pool.submit(fn, item) for item in items]
+    results: List[Any] = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as exc:  # noqa: BLE001 - e.g. a crashed worker
+            logger.error("walk-forward task failed: %r", exc)
+            results.append(None)
+    return results
+
+
+def _result_key(job: WalkForwardJob, threshold: float) -> Dict[str, Any]:
+    return {
+        "symbol": job.symbol,
+        "test_day": job.test_day.isoformat(),
+        "train_start": job.train_days[0].isoformat() if job.train_days else "",
+        "train_end": job.train_days[-1].isoformat() if job.train_days else "",
+        "trainer_params": json.dumps(job.trainer_params, sort_keys=True),
+        "label_horizon_seconds": job.label_horizon_seconds,
+        "score_threshold": threshold,
+    }
+
+
+def _failed_results(
+    job: WalkForwardJob, error: str, seconds: float = 0.0, train_rows: int = 0
+) -> List[WalkForwardResult]:
+    return [
+        WalkForwardResult(
+            **_result_key(job, threshold),
+            train_rows=train_rows,
+            seconds=seconds,
+            error=error,
+        )
+        for threshold in job.score_thresholds
+    ]
+
+
+def _classification_metrics(
+    target: np.ndarray, proba: np.ndarray
+) -> Tuple[float, float]:
+    if target.shape[0] == 0:
+        return float("nan"), float("nan")
+    clipped = np.clip(proba, 1e-7, 1 - 1e-7)
+    logloss = -np.mean(target * np.log(clipped) + (1 - target) * np.log(1 - clipped))
+    accuracy = np.mean((proba > 0.5) == (target > 0.5))
+    return float(logloss), float(accuracy)
+
+
+def _threshold_metrics(
+    scores: np.ndarray, forward_returns: np.ndarray, threshold: float
+) -> Tuple[int, float, float]:
+    """Apply the ``DecisionPolicy`` rule (buy above, sell below -threshold)."""
+
+    signals = np.where(
+        scores > threshold, 1.0, np.where(scores < -threshold, -1.0, 0.0)
+    )
+    traded = signals != 0
+    trades = int(np.count_nonzero(traded))
+    if trades == 0:
+        return 0, float("nan"), float("nan")
+    signed = signals[traded] * forward_returns[traded]
+    return trades, float(np.mean(signed > 0)), float(np.mean(signed))
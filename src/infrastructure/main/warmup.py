@@ -0,0 +1,165 @@
+"""Warm-up of models, feature paths and I/O before the first live tick."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from application.ports.feature_engine import FeatureEnginePort
+from application.ports.model import ModelPredictorPort, ModelStorePort
+from domain.decision.policy import DecisionPolicy
+from domain.decision.risk import RiskParams
+from domain.decision.signal import DecisionContext
+from domain.features.spec import FeatureSpec
+from domain.market.level import Level
+from domain.market.orderbook_snapshot import OrderBookSnapshot
+from domain.market.time import Timestamp
+from domain.market.types import Quantity, Symbol, price_key_from
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER_SYMBOL = Symbol("WARMUP")
+
+
+def synthetic_snapshots(
+    symbol: Symbol,
+    count: int,
+    start: datetime | None = None,
+    depth: int = 10,
+) -> List[OrderBookSnapshot]:
+    """Plausible books that move, repeat and change depth, for exercising code paths."""
+
+    start = start or datetime.now(timezone.utc)
+    snapshots: List[OrderBookSnapshot] = []
+    for i in range(count):
+        # Every third book repeats its predecessor to reach the unchanged-book path.
+        step = i - 1 if i % 3 == 2 else i
+        mid = 1000.0 + (step % 5)
+        levels = depth - (step % 2)
+        snapshots.append(
+            OrderBookSnapshot(
+                ts=Timestamp(start + timedelta(milliseconds=100 * i)),
+                symbol=symbol,
+                bid_levels=[
+                    Level(
+                        price_key_from(mid - 0.5 - k),
+                        Quantity(100.0 + 10 * k + step),
+                    )
+                    for k in range(levels)
+                ],
+                ask_levels=[
+                    Level(
+                        price_key_from(mid + 0.5 + k),
+                        Quantity(120.0 + 10 * k - step),
+                    )
+                    for k in range(levels)
+                ],
+            )
+        )
+    return snapshots
+
+
+@dataclass
+class WarmUp:
+    """Primes everything the first live ticks would otherwise pay for.
+
+    ``run`` loads each symbol's predictor, feeds ``ticks`` synthetic books per
+    symbol through feature computation (full and unchanged-book paths),
+    prediction and the decision policy without placing orders, then runs
+    ``steps`` (history writers, pooled HTTP connections, ...). A failing step
+    is logged and skipped. ``ready`` is set once everything ran; the pipeline
+    makes no decisions before that.
+    """
+
+    feature_engine: FeatureEnginePort
+    model_store: ModelStorePort
+    feature_spec: FeatureSpec
+    decision_policy: DecisionPolicy
+    risk_params: RiskParams
+    symbols: Sequence[Symbol] = ()
+    steps: Sequence[Tuple[str, Callable[[], object]]] = ()
+    ticks: int = 30
+    clock: Callable[[], float] = time.perf_counter
+    ready: threading.Event = field(default_factory=threading.Event)
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    failures: List[str] = field(default_factory=list)
+
+    def run(self) -> Dict[str, float]:
+        started = self.clock()
+        for symbol in self.symbols or [_PLACEHOLDER_SYMBOL]:
+            self._step(f"model {symbol}", lambda symbol=symbol: self._symbol(symbol))
+        for name, step in self.steps:
+            self._step(name, step)
+        total_ms = (self.clock() - started) * 1000.0
+        self.ready.set()
+        logger.info(
+            "warm-up done in %.1fms (%s)%s",
+            total_ms,
+            ", ".join(f"{k} {v:.1f}ms" for k, v in self.timings_ms.items()),
+            f", failed: {', '.join(self.failures)}" if self.failures else "",
+        )
+        return self.timings_ms
+
+    def start(self) -> threading.Thread:
+        """Run in the background; ticks are ingested meanwhile but not traded."""
+
+        thread = threading.Thread(target=self.run, name="warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def _step(self, name: str, step: Callable[[], object]) -> None:
+        started = self.clock()
+        try:
+            step()
+        except Exception:
+            logger.warning("warm-up step %s failed", name, exc_info=True)
+            self.failures.append(name)
+        self.timings_ms[name] = (self.clock() - started) * 1000.0
+
+    def _symbol(self, symbol: Symbol) -> None:
+        predictor = self._load(symbol)
+        prev: OrderBookSnapshot | None = None
+        features = None
+        feature_state = None
+        for snapshot in synthetic_snapshots(symbol, self.ticks):
+            if prev is not None and snapshot.same_book_as(prev):
+                features, feature_state = self.feature_engine.advance_unchanged(
+                    spec=self.feature_spec,
+                    features=features,
+                    now_snapshot=snapshot,
+                    state=feature_state,
+                )
+            else:
+                features, feature_state = self.feature_engine.compute_one(
+                    spec=self.feature_spec,
+                    prev_snapshot=prev,
+                    now_snapshot=snapshot,
+                    state=feature_state,
+                )
+            prev = snapshot
+            if predictor is None:
+                continue
+            inference = predictor.predict(features)
+            context = DecisionContext(
+                position_size=0.0,
+                risk_budget=self.risk_params.max_position,
+                symbol=symbol,
+                price=float(snapshot.mid or 0.0),
+                pip_size=1.0,
+            )
+            self.decision_policy.decide(
+                inference=inference, context=context, risk=self.risk_params
+            )
+
+    def _load(self, symbol: Symbol) -> ModelPredictorPort | None:
+        load_active_for = getattr(self.model_store, "load_active_for", None)
+        if load_active_for is not None:
+            if symbol == _PLACEHOLDER_SYMBOL:
+                # No symbol has a model yet; still warm the feature path.
+                return None
+            return load_active_for(symbol)
+        return self.model_store.load_active()
@@ -0,0 +1,20 @@
+"""In-memory metrics for local runs/tests."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from application.ports.metrics import MetricsPort
+
+
+@dataclass
+class InMemoryMetrics(MetricsPort):
+    counters: Dict[str, int] = field(default_factory=dict)
+    timings: Dict[str, List[float]] = field(default_factory=dict)
+
+    def incr(self, name: str, value: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def timing(self, name: str, value_ms: float) -> None:
+        self.timings.setdefault(name, []).append(value_ms)
@@ -2,33 +2,74 @@
 
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass, field
 from typing import List
 
 from application.ports.broker import OrderStatePort
-from domain.order.realtime_order import RealTimeOrder
+from domain.order.realtime_order import OrderStatus, RealTimeOrder
 
 
 @dataclass
 class InMemoryOrderStore(OrderStatePort):
+    """Thread-safe, so an order gateway worker can apply acknowledgements."""
+
     orders: List[RealTimeOrder] = field(default_factory=list)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
 
     def add(self, order: RealTimeOrder) -> None:
-        self.orders.append(order)
+        with self._lock:
+            self.orders.append(order)
 
     def list(self) -> List[RealTimeOrder]:
-        return list(self.orders)
+        with self._lock:
+            return list(self.orders)
 
     def mark_filled(self, order_id: str) -> bool:
-        for order in self.orders:
-            if order.order_id == order_id:
-                order.is_filled = True
-                return True
+        with self._lock:
+            for order in self.orders:
+                if order.order_id == order_id:
+                    order.is_filled = True
+                    return True
         return False
 
     def remove(self, order_id: str) -> bool:
-        for idx, order in enumerate(self.orders):
-            if order.order_id == order_id:
-                self.orders.pop(idx)
-                return True
+        with self._lock:
+            for idx, order in enumerate(self.orders):
+                if order.order_id == order_id:
+                    self.orders.pop(idx)
+                    return True
+        return False
+
+    def acknowledge(self, intent_id: str, order_id: str) -> bool:
+        """Replace a pending order's local id with the broker ``order_id``."""
+
+        with self._lock:
+            for order in self.orders:
+                if order.is_pending and order.intent_id == intent_id:
+                    order.order_id = order_id
+                    order.status = OrderStatus.ACKED
+                    return True
+        return False
+
+    def mark_unknown(self, intent_id: str) -> bool:
+        """Keep a pending order whose send outcome is unknown until resolved."""
+
+        with self._lock:
+            for order in self.orders:
+                if order.is_pending and order.intent_id == intent_id:
+                    order.status = OrderStatus.UNKNOWN
+                    return True
+        return False
+
+    def reject(self, intent_id: str) -> bool:
+        """Drop a pending order that the broker never accepted."""
+
+        with self._lock:
+            for idx, order in enumerate(self.orders):
+                if order.is_pending and order.intent_id == intent_id:
+                    self.orders.pop(idx)
+                    return True
         return False
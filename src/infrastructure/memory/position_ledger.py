@@ -0,0 +1,68 @@
+"""Position ledger maintained incrementally from order fills."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+from application.ports.broker import PositionLedgerPort
+from domain.decision.signal import OrderSide
+from domain.market.types import Symbol
+
+
+@dataclass
+class PositionLedger(PositionLedgerPort):
+    """Signed net position per symbol, in the same units as ``TradeIntent.quantity``.
+
+    Fills arrive as an order's cumulative filled share quantity, so repeated
+    or partial fill reports only apply the increase since the last report.
+    Buys add and sells subtract regardless of whether they open or repay.
+    """
+
+    lot_size: int = 100
+    _shares: Dict[Symbol, float] = field(default_factory=dict, init=False)
+    _order_fills: Dict[str, float] = field(default_factory=dict, init=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def record_fill(
+        self, order_id: str, symbol: Symbol, side: OrderSide, cum_qty: float
+    ) -> None:
+        with self._lock:
+            delta = cum_qty - self._order_fills.get(order_id, 0.0)
+            if delta <= 0:
+                return
+            self._order_fills[order_id] = cum_qty
+            signed = delta if side is OrderSide.BUY else -delta
+            self._shares[symbol] = self._shares.get(symbol, 0.0) + signed
+
+    def current_position(self, symbol: Symbol | None = None) -> float:
+        if symbol is None:
+            return sum(self._shares.values()) / self.lot_size
+        return self._shares.get(symbol, 0.0) / self.lot_size
+
+    def snapshot(self) -> Dict[Symbol, float]:
+        """Net shares per symbol."""
+
+        with self._lock:
+            return dict(self._shares)
+
+    def export_state(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "shares": dict(self._shares),
+                "order_fills": dict(self._order_fills),
+            }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        with self._lock:
+            self._shares = {
+                Symbol(symbol): float(shares)
+                for symbol, shares in (state.get("shares") or {}).items()
+            }
+            self._order_fills = {
+                str(order_id): float(qty)
+                for order_id, qty in (state.get("order_fills") or {}).items()
+            }
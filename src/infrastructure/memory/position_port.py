@@ -5,11 +5,12 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from application.ports.broker import PositionPort
+from domain.market.types import Symbol
 
 
 @dataclass
 class InMemoryPositionPort(PositionPort):
     position: float = 0.0
 
-    def current_position(self) -> float:
+    def current_position(self, symbol: Symbol | None = None) -> float:
         return self.position
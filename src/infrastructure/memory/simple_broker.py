@@ -7,6 +7,7 @@ from application.ports.broker import (
     PositionPort,
 )
 from domain.decision.signal import TradeIntent
+from domain.market.types import Symbol
 
 
 class LoggingOrderPort(OrderPort):
@@ -19,5 +20,5 @@ class FixedPositionPort(PositionPort):
     def __init__(self, position: float = 0.0) -> None:
         self._position = position
 
-    def current_position(self) -> float:
+    def current_position(self, symbol: Symbol | None = None) -> float:
         return self._position
@@ -0,0 +1,173 @@
+"""Flat-array tree ensemble evaluator (no xgboost import required)."""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass
+from typing import Any, List, Mapping
+
+import numpy as np
+
+_LOGISTIC_OBJECTIVES = {"binary:logistic", "reg:logistic"}
+
+
+@dataclass(frozen=True)
+class FlatTreeEnsemble:
+    """Binary tree ensemble stored as flat node arrays.
+
+    Node ``i`` splits on ``feature[i]`` (``-1`` for leaves) and goes to
+    ``left[i]`` when ``x < threshold[i]``, otherwise to ``right[i]``. Missing
+    values follow ``default_left[i]``. Leaves carry their output in ``value``.
+    """
+
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    default_left: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    max_depth: int
+    base_margin: float
+    objective: str
+    num_features: int
+
+    @property
+    def num_trees(self) -> int:
+        return int(self.roots.shape[0])
+
+    @classmethod
+    def from_model_json(
+        cls, model: Mapping[str, Any] | str | bytes
+    ) -> "FlatTreeEnsemble":
+        """Build the ensemble from an XGBoost JSON model document."""
+
+        doc = json.loads(model) if isinstance(model, (str, bytes)) else model
+        learner = doc["learner"]
+        model_param = learner["learner_model_param"]
+        if (
+            int(model_param.get("num_class", "0")) > 1
+            or int(model_param.get("num_target", "1")) > 1
+        ):
+            raise ValueError("Only single-output tree ensembles are supported")
+        booster = learner["gradient_booster"]
+        if booster.get("name") != "gbtree":
+            raise ValueError(f"Unsupported booster type: {booster.get('name')}")
+
+        objective = str(learner["objective"]["name"])
+        base_score = _parse_base_score(model_param["base_score"])
+        if objective in _LOGISTIC_OBJECTIVES:
+            base_margin = math.log(base_score / (1.0 - base_score))
+        else:
+            base_margin = base_score
+
+        features: List[np.ndarray] = []
+        thresholds: List[np.ndarray] = []
+        lefts: List[np.ndarray] = []
+        rights: List[np.ndarray] = []
+        defaults: List[np.ndarray] = []
+        values: List[np.ndarray] = []
+        roots: List[int] = []
+        max_depth = 0
+        offset = 0
+        for tree in booster["model"]["trees"]:
+            if any(int(kind) != 0 for kind in tree.get("split_type", [])):
+                raise ValueError("Categorical splits are not supported")
+            left = np.asarray(tree["left_children"], dtype=np.int32)
+            right = np.asarray(tree["right_children"], dtype=np.int32)
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            is_leaf = left < 0
+            features.append(
+                np.where(is_leaf, -1, np.asarray(tree["split_indices"], dtype=np.int32))
+            )
+            thresholds.append(np.where(is_leaf, np.float32(0.0), conditions))
+            values.append(np.where(is_leaf, conditions, np.float32(0.0)))
+            # Leaves point to themselves so that a fixed number of steps is safe.
+            self_index = np.arange(offset, offset + left.shape[0], dtype=np.int32)
+            lefts.append(np.where(is_leaf, self_index, left + offset))
+            rights.append(np.where(is_leaf, self_index, right + offset))
+            defaults.append(np.asarray(tree["default_left"], dtype=bool))
+            roots.append(offset)
+            max_depth = max(max_depth, _tree_depth(left, right))
+            offset += left.shape[0]
+
+        def _concat(parts: List[np.ndarray], dtype: Any) -> np.ndarray:
+            if not parts:
+                return np.zeros(0, dtype=dtype)
+            return np.ascontiguousarray(np.concatenate(parts), dtype=dtype)
+
+        return cls(
+            feature=_concat(features, np.int32),
+            threshold=_concat(thresholds, np.float32),
+            left=_concat(lefts, np.int32),
+            right=_concat(rights, np.int32),
+            default_left=_concat(defaults, bool),
+            value=_concat(values, np.float32),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            base_margin=float(base_margin),
+            objective=objective,
+            num_features=int(model_param.get("num_feature", "0")),
+        )
+
+    def predict_margin(self, data: np.ndarray) -> np.ndarray:
+        """Return raw margins for a 2D feature matrix."""
+
+        matrix = np.asarray(data, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        n_rows = matrix.shape[0]
+        if self.num_trees == 0:
+            return np.full(n_rows, self.base_margin, dtype=np.float64)
+
+        if n_rows == 1:
+            return np.array([self._predict_row_margin(matrix[0])])
+
+        rows = np.arange(n_rows)[:, None]
+        nodes = np.broadcast_to(self.roots, (n_rows, self.num_trees)).copy()
+        for _ in range(self.max_depth):
+            split_feature = self.feature[nodes]
+            x = matrix[rows, np.maximum(split_feature, 0)]
+            go_left = np.where(
+                np.isnan(x), self.default_left[nodes], x < self.threshold[nodes]
+            )
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        leaves = self.value[nodes].astype(np.float64)
+        return leaves.sum(axis=1) + self.base_margin
+
+    def _predict_row_margin(self, row: np.ndarray) -> float:
+        nodes = self.roots
+        for _ in range(self.max_depth):
+            x = row[np.maximum(self.feature[nodes], 0)]
+            go_left = np.where(
+                np.isnan(x), self.default_left[nodes], x < self.threshold[nodes]
+            )
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return float(self.value[nodes].sum(dtype=np.float64)) + self.base_margin
+
+    def predict(self, data: np.ndarray) -> np.ndarray:
+        """Return transformed predictions (probabilities for logistic objectives)."""
+
+        margin = self.predict_margin(data)
+        if self.objective in _LOGISTIC_OBJECTIVES:
+            return 1.0 / (1.0 + np.exp(-margin))
+        return margin
+
+
+def _parse_base_score(raw: Any) -> float:
+    text = str(raw).strip().strip("[]")
+    return float(text.split(",")[0])
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth = 0
+    frontier = [(0, 0)]
+    while frontier:
+        node, level = frontier.pop()
+        if left[node] < 0:
+            depth = max(depth, level)
+            continue
+        frontier.append((int(left[node]), level + 1))
+        frontier.append((int(right[node]), level + 1))
+    return depth
@@ -0,0 +1,63 @@
+"""Predictor backed by a compiled flat-array tree ensemble."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import numpy as np
+
+from domain.decision.signal import InferenceResult
+from infrastructure.ml.flat_tree import FlatTreeEnsemble
+
+
+@dataclass
+class FlatTreePredictor:
+    feature_order: Sequence[str]
+    ensemble: FlatTreeEnsemble | None = None
+    default_score: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.feature_order = list(self.feature_order)
+
+    def predict(self, features: dict[str, float]) -> InferenceResult:
+        if self.ensemble is None:
+            return InferenceResult(features=features, score=self.default_score)
+
+        row = np.array(
+            [features.get(name, 0.0) for name in self.feature_order],
+            dtype=np.float32,
+        )
+        score = float(self.ensemble.predict(row)[0])
+        return InferenceResult(features=features, score=score)
+
+    def predict_batch(self, data: np.ndarray) -> np.ndarray:
+        """Score a 2D matrix whose columns follow ``feature_order``."""
+
+        if self.ensemble is None:
+            return np.full(len(data), self.default_score, dtype=np.float64)
+        return self.ensemble.predict(data)
+
+
+def compile_predictor(predictor: Any) -> FlatTreePredictor:
+    """Export a trained ``XgbPredictor`` into a ``FlatTreePredictor``.
+
+    The booster is dumped through its JSON model format, so this works on any
+    object exposing ``get_booster()`` or ``save_raw()`` without importing xgboost.
+    """
+
+    feature_order = list(predictor.feature_order)
+    model = getattr(predictor, "model", None)
+    if model is None:
+        return FlatTreePredictor(
+            feature_order=feature_order,
+            ensemble=None,
+            default_score=float(getattr(predictor, "default_score", 0.0)),
+        )
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    doc = json.loads(bytes(booster.save_raw("json")))
+    return FlatTreePredictor(
+        feature_order=feature_order,
+        ensemble=FlatTreeEnsemble.from_model_json(doc),
+    )
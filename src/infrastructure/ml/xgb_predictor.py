@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional
 
 import numpy as np
 
@@ -15,6 +15,7 @@ class XgbPredictor:
     feature_order: Iterable[str]
     model: Optional[object] = None
     default_score: float = 0.0
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
     def predict(self, features: dict[str, float]) -> InferenceResult:
         if self.model is None:
@@ -25,6 +26,8 @@ class XgbPredictor:
         if hasattr(self.model, "predict_proba"):
             proba = self.model.predict_proba(data)
             score = float(proba[0][1])
+        elif hasattr(self.model, "inplace_predict"):
+            score = float(self.model.inplace_predict(data)[0])
         else:
             score = float(self.model.predict(data)[0])
         return InferenceResult(features=features, score=score)
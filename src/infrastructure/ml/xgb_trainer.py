@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Iterable
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
 
 import numpy as np
 import xgboost as xgb
@@ -11,7 +12,12 @@ import xgboost as xgb
 from application.ports.feature_engine import (
     FeatureVector,
 )
+from application.service.dataset import TrainingDataset
 from domain.features.spec import FeatureSpec
+from infrastructure.ml.flat_tree_predictor import (
+    FlatTreePredictor,
+    compile_predictor,
+)
 from infrastructure.ml.schema import feature_ordering
 from infrastructure.ml.xgb_predictor import (
     XgbPredictor,
@@ -29,38 +35,173 @@ class XgbTrainer:
         }
     )
     default_score: float = 0.0
+    compile_trees: bool = False
+    external_memory_dir: Path | None = None
+    max_bin: int = 256
 
     def train(
-        self, spec: FeatureSpec, dataset: Iterable[FeatureVector]
+        self,
+        spec: FeatureSpec,
+        dataset: TrainingDataset | Iterable[FeatureVector],
+    ) -> XgbPredictor | FlatTreePredictor:
+        predictor = self._train(spec, dataset)
+        if self.compile_trees:
+            return compile_predictor(predictor)
+        return predictor
+
+    def train_chunks(
+        self,
+        spec: FeatureSpec,
+        chunks: Callable[[], Iterable[TrainingDataset]],
+    ) -> XgbPredictor | FlatTreePredictor:
+        """Train from a re-iterable stream of dataset chunks.
+
+        ``chunks`` is called once per pass over the data, and XGBoost needs at
+        least two passes. Only one chunk is held in memory at a time. The
+        quantized matrix is kept in RAM, or paged to ``external_memory_dir``
+        when that is set.
+        """
+
+        predictor = self._train_chunks(spec, chunks)
+        if self.compile_trees:
+            return compile_predictor(predictor)
+        return predictor
+
+    def _train_chunks(
+        self,
+        spec: FeatureSpec,
+        chunks: Callable[[], Iterable[TrainingDataset]],
+    ) -> XgbPredictor:
+        feature_names = feature_ordering(spec)
+        cache_prefix = None
+        if self.external_memory_dir is not None:
+            Path(self.external_memory_dir).mkdir(parents=True, exist_ok=True)
+            cache_prefix = str(Path(self.external_memory_dir) / "cache")
+        data_iter = _DatasetChunkIter(chunks, feature_names, cache_prefix)
+        try:
+            if cache_prefix is None:
+                dmatrix = xgb.QuantileDMatrix(data_iter, max_bin=self.max_bin)
+            else:
+                dmatrix = xgb.ExtMemQuantileDMatrix(data_iter, max_bin=self.max_bin)
+        except xgb.core.XGBoostError:
+            if data_iter.rows == 0:
+                raise ValueError("Dataset is empty") from None
+            raise
+        if data_iter.rows == 0:
+            raise ValueError("Dataset is empty")
+        if data_iter.positives in (0, data_iter.rows):
+            return XgbPredictor(
+                feature_order=feature_names,
+                model=None,
+                default_score=float(data_iter.positives > 0),
+            )
+
+        params, rounds = _native_params(self.params, self.max_bin)
+        booster = xgb.train(params, dmatrix, num_boost_round=rounds)
+        target = dmatrix.get_label().astype(np.int64)
+        proba = booster.predict(dmatrix)
+        return XgbPredictor(
+            feature_order=feature_names,
+            model=booster,
+            metadata={"metrics": _training_metrics(target, proba)},
+        )
+
+    def _train(
+        self,
+        spec: FeatureSpec,
+        dataset: TrainingDataset | Iterable[FeatureVector],
     ) -> XgbPredictor:
         feature_names = feature_ordering(spec)
-        rows = list(dataset)
-        if not rows:
+        if not isinstance(dataset, TrainingDataset):
+            dataset = TrainingDataset.from_rows(dataset, feature_names)
+        elif dataset.feature_names != feature_names:
+            raise ValueError("Dataset columns do not match the spec feature order")
+        if len(dataset) == 0:
             raise ValueError("Dataset is empty")
 
-        labels = [row.get("label") for row in rows]
-        has_labels = all(label is not None for label in labels)
-        if not has_labels:
+        if dataset.labels is None:
             return XgbPredictor(
                 feature_order=feature_names,
                 model=None,
                 default_score=self.default_score,
             )
 
-        data = np.array(
-            [[row.get(name, 0.0) for name in feature_names] for row in rows],
-            dtype=float,
-        )
-        target_values = [int(label) for label in labels]
-        unique_labels = sorted(set(target_values))
+        target = dataset.labels.astype(np.int64)
+        unique_labels = np.unique(target)
         if len(unique_labels) == 1:
             return XgbPredictor(
                 feature_order=feature_names,
                 model=None,
                 default_score=float(unique_labels[0]),
             )
-        target = np.array(target_values, dtype=int)
 
         model = xgb.XGBClassifier(**self.params)
-        model.fit(data, target)
-        return XgbPredictor(feature_order=feature_names, model=model)
+        model.fit(dataset.features, target)
+        proba = model.predict_proba(dataset.features)[:, 1]
+        return XgbPredictor(
+            feature_order=feature_names,
+            model=model,
+            metadata={"metrics": _training_metrics(target, proba)},
+        )
+
+
+class _DatasetChunkIter(xgb.DataIter):
+    def __init__(
+        self,
+        chunks: Callable[[], Iterable[TrainingDataset]],
+        feature_names: list[str],
+        cache_prefix: str | None,
+    ) -> None:
+        super().__init__(cache_prefix=cache_prefix)
+        self._chunks = chunks
+        self._feature_names = feature_names
+        self._current: Iterator[TrainingDataset] | None = None
+        self._first_pass = True
+        self.rows = 0
+        self.positives = 0
+
+    def next(self, input_data: Callable[..., None]) -> bool:
+        if self._current is None:
+            self._current = iter(self._chunks())
+        for chunk in self._current:
+            if len(chunk) == 0:
+                continue
+            if chunk.feature_names != self._feature_names:
+                raise ValueError("Dataset columns do not match the spec feature order")
+            if chunk.labels is None:
+                raise ValueError("Chunked training requires labeled datasets")
+            if self._first_pass:
+                self.rows += len(chunk)
+                self.positives += int(np.count_nonzero(chunk.labels))
+            input_data(data=chunk.features, label=chunk.labels)
+            return True
+        return False
+
+    def reset(self) -> None:
+        if self._current is not None:
+            self._first_pass = False
+        self._current = None
+
+
+def _native_params(params: dict, max_bin: int) -> tuple[dict[str, Any], int]:
+    """Translate scikit-learn style params into ``xgb.train`` arguments."""
+
+    native = dict(params)
+    rounds = int(native.pop("n_estimators", 100))
+    if "n_jobs" in native:
+        native["nthread"] = native.pop("n_jobs")
+    native.setdefault("max_bin", max_bin)
+    native.setdefault("objective", "binary:logistic")
+    return native, rounds
+
+
+def _training_metrics(target: np.ndarray, proba: np.ndarray) -> dict[str, float]:
+    clipped = np.clip(proba, 1e-7, 1 - 1e-7)
+    logloss = -np.mean(target * np.log(clipped) + (1 - target) * np.log(1 - clipped))
+    accuracy = np.mean((proba > 0.5).astype(int) == target)
+    return {
+        "n_rows": float(len(target)),
+        "positive_rate": float(np.mean(target)),
+        "train_logloss": float(logloss),
+        "train_accuracy": float(accuracy),
+    }
@@ -3,31 +3,107 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+import heapq
+import io
 import re
-from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence
-from datetime import date
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 from application.ports.history import HistoryStorePort
 from domain.market.level import Level
 from domain.market.orderbook_snapshot import (
     OrderBookSnapshot,
 )
-from domain.market.time import Timestamp
+from domain.market.time import (
+    NS_PER_SECOND,
+    day_bounds,
+    from_epoch_ns,
+    parse_epoch_ns,
+    to_epoch_ns,
+)
 from domain.market.types import (
     Quantity,
     Symbol,
     price_key_from,
 )
+from infrastructure.persistence.history_archive import (
+    CompactedDay,
+    HistoryManifest,
+    ManifestFile,
+    SymbolFrame,
+    codec_suffix,
+    read_frame,
+)
+from infrastructure.persistence.history_index import (
+    OpenBlock,
+    append_index_block,
+    read_index,
+)
+
+WRITE_MODE_FULL = "full"
+WRITE_MODE_DEDUP = "dedup"
+WRITE_MODE_DELTA = "delta"
+_WRITE_MODES = {WRITE_MODE_FULL, WRITE_MODE_DEDUP, WRITE_MODE_DELTA}
+
+KIND_KEYFRAME = "K"
+KIND_REPEAT = "="
+KIND_DELTA = "D"
+# Delta rows leave unchanged columns empty; a level that disappeared is "-".
+_CLEARED = "-"
+_NS_PER_HOUR = 3600 * NS_PER_SECOND
+
+
+@dataclass
+class _SymbolWriteState:
+    path: Path
+    levels: Dict[str, object]
+    since_keyframe: int = 0
 
 
 @dataclass
 class CsvHistoryStore(HistoryStorePort):
-    """Persist order book snapshots into fixed-column CSV rows."""
+    """Persist order book snapshots into fixed-column CSV rows.
+
+    ``ts`` is written as integer epoch nanoseconds; ISO-8601 rows from older
+    files are still read.
+
+    ``write_mode`` controls how consecutive books of a symbol are stored:
+
+    * ``full``: every snapshot as a complete row (legacy layout)
+    * ``dedup``: an unchanged book is written as a ``=`` row with only ts/symbol
+    * ``delta``: additionally, changed books only carry the columns that changed
+
+    Encoded files carry a ``kind`` column. Each symbol starts every hourly file
+    with a full keyframe and repeats one every ``keyframe_interval`` rows, so
+    files and keyframes decode independently. Readers accept every layout.
+
+    Every ``index_block_rows`` rows the store appends a block entry (byte range,
+    time bounds, symbols) to a ``.idx`` sidecar and restarts each symbol with a
+    keyframe, so range reads seek to the blocks they need. The block still
+    being written is not indexed yet; readers scan that tail.
+
+    The archive manifest lists hot hourly files and compacted daily files (see
+    ``history_compaction``); reads and date listings go through it instead of
+    the directory when it exists.
+    """
 
     path: Path
+    write_mode: str = WRITE_MODE_FULL
+    keyframe_interval: int = 100
+    index_block_rows: int = 1000
+    _write_state: Dict[str, _SymbolWriteState] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _file_headers: Dict[Path, List[str]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _open_block: OpenBlock | None = field(default=None, init=False, repr=False)
+    _hour_slots: Dict[int, Tuple[str, Path]] = field(
+        default_factory=dict, init=False, repr=False
+    )
 
     def __post_init__(self) -> None:
         self.path = Path(self.path)
@@ -35,73 +111,428 @@ class CsvHistoryStore(HistoryStorePort):
             raise ValueError(
                 "CsvHistoryStore path must be a directory or .csv file path"
             )
-        self.fieldnames = ["ts", "symbol"]
-        self.fieldnames += [f"bid_p{i}" for i in range(1, 11)] + [
+        if self.write_mode not in _WRITE_MODES:
+            raise ValueError(f"Unsupported history write mode: {self.write_mode}")
+        self.level_fieldnames = [f"bid_p{i}" for i in range(1, 11)] + [
             f"bid_q{i}" for i in range(1, 11)
         ]
-        self.fieldnames += [f"ask_p{i}" for i in range(1, 11)] + [
+        self.level_fieldnames += [f"ask_p{i}" for i in range(1, 11)] + [
             f"ask_q{i}" for i in range(1, 11)
         ]
+        self.fieldnames = ["ts", "symbol"] + self.level_fieldnames
+        self.encoded_fieldnames = ["ts", "symbol", "kind"] + self.level_fieldnames
+        manifest_name = (
+            f"{self.path.stem}_manifest.json"
+            if self.path.suffix == ".csv"
+            else "manifest.json"
+        )
+        self.manifest_file = ManifestFile(self._archive_dir() / manifest_name)
 
     def append(self, snapshot: OrderBookSnapshot) -> None:
         """Append a snapshot to an hourly CSV, writing header on first write."""
 
-        target_path = self._hourly_path(snapshot.ts)
-        target_path.parent.mkdir(parents=True, exist_ok=True)
+        hour_key, target_path = self._hour_slot(snapshot.ts_ns)
+        header = self._header_for(target_path)
         write_header = not target_path.exists()
+        block = self._block_for(target_path, new_file=write_header)
         row = self._snapshot_to_row(snapshot)
+        if "kind" in header:
+            row = self._encode_row(target_path, row, new_file=write_header)
 
         with target_path.open("a", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
+            writer = csv.DictWriter(f, fieldnames=header)
             if write_header:
                 writer.writeheader()
+            if block.rows == 0:
+                block.offset = f.tell()
             writer.writerow(row)
+            block.add(snapshot.ts_ns, str(snapshot.symbol), f.tell())
+        if write_header:
+            self._register_hour(hour_key)
+
+    def prepare(self, ts_ns: int) -> None:
+        """Resolve the hourly file and header for ``ts_ns`` before the first append."""
+
+        _, target_path = self._hour_slot(ts_ns)
+        self._header_for(target_path)
+
+    def _block_for(self, target_path: Path, new_file: bool) -> OpenBlock:
+        block = self._open_block
+        if block is not None and block.path != target_path:
+            self._close_block()
+            block = None
+        if block is None:
+            block = (
+                OpenBlock(target_path, offset=0, end_offset=0)
+                if new_file
+                else self._resume_block(target_path)
+            )
+        elif block.rows >= self.index_block_rows:
+            self._close_block()
+            block = OpenBlock(
+                target_path, offset=block.end_offset, end_offset=block.end_offset
+            )
+            # Blocks must decode on their own: restart every symbol with a keyframe.
+            self._write_state.clear()
+        self._open_block = block
+        return block
+
+    def _close_block(self) -> None:
+        block, self._open_block = self._open_block, None
+        closed = block.close() if block is not None else None
+        if closed is not None:
+            append_index_block(block.path, closed)
+
+    def _resume_block(self, target_path: Path) -> OpenBlock:
+        """Rebuild the open block from the rows after the last indexed one."""
+
+        blocks = read_index(target_path)
+        if blocks:
+            offset = blocks[-1].end_offset
+        else:
+            with target_path.open("rb") as f:
+                offset = len(f.readline())
+        block = OpenBlock(target_path, offset=offset, end_offset=offset)
+        size = target_path.stat().st_size
+        for row in self._read_span(target_path, offset, size):
+            block.add(parse_epoch_ns(row["ts"]), row["symbol"], size)
+        return block
+
+    def _header_for(self, target_path: Path) -> List[str]:
+        header = self._file_headers.get(target_path)
+        if header is not None:
+            return header
+        if target_path.exists():
+            with target_path.open("r", newline="") as f:
+                header = next(csv.reader(f), None) or self.fieldnames
+        else:
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            header = (
+                self.fieldnames
+                if self.write_mode == WRITE_MODE_FULL
+                else self.encoded_fieldnames
+            )
+        self._file_headers[target_path] = header
+        return header
+
+    def _encode_row(
+        self, target_path: Path, row: Dict[str, object], new_file: bool = False
+    ) -> Dict[str, object]:
+        symbol = str(row["symbol"])
+        levels = {name: row[name] for name in self.level_fieldnames}
+        state = self._write_state.get(symbol)
+        if (
+            state is None
+            or new_file
+            or state.path != target_path
+            or state.since_keyframe + 1 >= self.keyframe_interval
+        ):
+            self._write_state[symbol] = _SymbolWriteState(target_path, levels)
+            return {**row, "kind": KIND_KEYFRAME}
+
+        previous = state.levels
+        state.levels = levels
+        if levels == previous:
+            state.since_keyframe += 1
+            return {"ts": row["ts"], "symbol": symbol, "kind": KIND_REPEAT}
+        if self.write_mode == WRITE_MODE_DEDUP:
+            state.since_keyframe = 0
+            return {**row, "kind": KIND_KEYFRAME}
+        state.since_keyframe += 1
+        encoded: Dict[str, object] = {
+            "ts": row["ts"],
+            "symbol": symbol,
+            "kind": KIND_DELTA,
+        }
+        for name, value in levels.items():
+            if value != previous[name]:
+                encoded[name] = _CLEARED if value is None else value
+        return encoded
 
     def read_range(self, start: datetime, end: datetime) -> Iterable[OrderBookSnapshot]:
         """Load snapshots whose timestamps fall within [start, end]."""
 
-        files = self._files_for_range(start, end)
-        if not files:
-            return []
+        return list(self.iter_range(start, end))
+
+    def iter_range(
+        self, start: datetime, end: datetime, symbol: str | None = None
+    ) -> Iterator[OrderBookSnapshot]:
+        """Stream snapshots within [start, end], optionally for one symbol only."""
+
+        for row in self.iter_rows(start, end, symbol):
+            yield self._row_to_snapshot(row)
+
+    def iter_rows(
+        self, start: datetime, end: datetime, symbol: str | None = None
+    ) -> Iterator[Dict[str, str]]:
+        """Stream decoded full CSV rows from compacted days and hot hourly files."""
 
-        snapshots: List[OrderBookSnapshot] = []
-        for file_path in files:
+        start_ns, end_ns = to_epoch_ns(start), to_epoch_ns(end)
+        for source in self._sources_for_range(start, end):
+            if isinstance(source, CompactedDay):
+                rows = self._iter_compacted_rows(source, start, end, symbol)
+            else:
+                rows = self._iter_hourly_rows(source, start_ns, end_ns, symbol)
+            for row in rows:
+                if start_ns <= parse_epoch_ns(row["ts"]) <= end_ns:
+                    yield row
+
+    def _iter_hourly_rows(
+        self,
+        file_path: Path,
+        start_ns: int,
+        end_ns: int,
+        symbol: str | None,
+    ) -> Iterator[Dict[str, str]]:
+        blocks = read_index(file_path)
+        if not blocks:
             with file_path.open("r", newline="") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    ts = Timestamp(datetime.fromisoformat(row["ts"]))
-                    if ts < start or ts > end:
-                        continue
-                    snapshots.append(self._row_to_snapshot(row))
-        return snapshots
-
-    def _hourly_path(self, ts: datetime) -> Path:
-        ts_utc = ts.astimezone(timezone.utc) if ts.tzinfo else ts
-        suffix = ts_utc.strftime("%Y%m%d_%H")
+                header = next(csv.reader([f.readline()]), None)
+                if not header:
+                    return
+                # Decoder state is per file: every file starts with keyframes.
+                rows = _select_rows(f, header, symbol)
+                yield from self._decode_rows(rows, symbol)
+            return
+
+        spans = [
+            (block.offset, block.end_offset)
+            for block in blocks
+            if block.overlaps(start_ns, end_ns, symbol)
+        ]
+        size = file_path.stat().st_size
+        if size > blocks[-1].end_offset:
+            spans.append((blocks[-1].end_offset, size))
+        for offset, end_offset in spans:
+            # Every block starts each symbol with a keyframe.
+            rows = self._read_span(file_path, offset, end_offset, symbol)
+            yield from self._decode_rows(rows, symbol)
+
+    def _read_span(
+        self,
+        file_path: Path,
+        offset: int,
+        end_offset: int,
+        symbol: str | None = None,
+    ) -> Iterator[Dict[str, str]]:
+        header = self._header_for(file_path)
+        yield from _select_rows(
+            self._read_span_lines(file_path, offset, end_offset), header, symbol
+        )
+
+    def _read_span_lines(
+        self, file_path: Path, offset: int, end_offset: int
+    ) -> Iterator[str]:
+        with file_path.open("rb") as f:
+            f.seek(offset)
+            text = f.read(end_offset - offset).decode("utf-8")
+        yield from io.StringIO(text, newline="")
+
+    def _decode_rows(
+        self, rows: Iterable[Dict[str, str]], symbol: str | None
+    ) -> Iterator[Dict[str, str]]:
+        books: Dict[str, Dict[str, str]] = {}
+        for row in rows:
+            if symbol is not None and row["symbol"] != symbol:
+                continue
+            full_row = self._decode_row(row, books)
+            if full_row is not None:
+                yield full_row
+
+    def _iter_compacted_rows(
+        self,
+        entry: CompactedDay,
+        start: datetime,
+        end: datetime,
+        symbol: str | None,
+    ) -> Iterator[Dict[str, str]]:
+        path = self._archive_dir() / entry.file
+        frames = [
+            frame
+            for name, frame in sorted(entry.symbols.items())
+            if (symbol is None or name == symbol)
+            and datetime.fromisoformat(frame.start) <= end
+            and datetime.fromisoformat(frame.end) >= start
+        ]
+        streams = [_frame_rows(path, frame, entry.codec) for frame in frames]
+        if len(streams) == 1:
+            yield from streams[0]
+            return
+        # Frames are per symbol; merge them back into time order.
+        yield from heapq.merge(*streams, key=lambda row: parse_epoch_ns(row["ts"]))
+
+    def _decode_row(
+        self, row: Dict[str, str], books: Dict[str, Dict[str, str]]
+    ) -> Dict[str, str] | None:
+        kind = row.get("kind") or KIND_KEYFRAME
+        symbol = row["symbol"]
+        if kind == KIND_KEYFRAME:
+            books[symbol] = row
+            return row
+        previous = books.get(symbol)
+        if previous is None:
+            # No keyframe seen for this symbol (truncated file); skip until one.
+            return None
+        if kind == KIND_REPEAT:
+            decoded = {**previous, "ts": row["ts"]}
+        elif kind == KIND_DELTA:
+            decoded = dict(previous)
+            decoded["ts"] = row["ts"]
+            for name in self.level_fieldnames:
+                value = row.get(name)
+                if value:
+                    decoded[name] = "" if value == _CLEARED else value
+        else:
+            raise ValueError(f"Unknown history row kind: {kind}")
+        books[symbol] = decoded
+        return decoded
+
+    def symbols_in_range(self, start: datetime, end: datetime) -> List[str]:
+        """Return the distinct symbols recorded within [start, end].
+
+        Compacted days answer from the manifest and indexed blocks inside the
+        range from their ``.idx`` symbol sets; only blocks straddling a range
+        bound and unindexed data are read, and there a row's timestamp is only
+        parsed when its symbol is not known yet.
+        """
+
+        symbols: set[str] = set()
+        start_ns, end_ns = to_epoch_ns(start), to_epoch_ns(end)
+        for source in self._sources_for_range(start, end):
+            if isinstance(source, CompactedDay):
+                symbols.update(
+                    name
+                    for name, frame in source.symbols.items()
+                    if datetime.fromisoformat(frame.start) <= end
+                    and datetime.fromisoformat(frame.end) >= start
+                )
+                continue
+            header = self._header_for(source)
+            spans = []
+            blocks = read_index(source)
+            for block in blocks:
+                if not block.overlaps(start_ns, end_ns, None):
+                    continue
+                if start_ns <= block.start_ns and block.end_ns <= end_ns:
+                    symbols.update(block.symbols)
+                elif not symbols.issuperset(block.symbols):
+                    spans.append((block.offset, block.end_offset))
+            indexed_end = blocks[-1].end_offset if blocks else 0
+            size = source.stat().st_size
+            if size > indexed_end:
+                spans.append((indexed_end, size))
+            ts_idx = header.index("ts")
+            symbol_idx = header.index("symbol")
+            for offset, end_offset in spans:
+                lines = self._read_span_lines(source, offset, end_offset)
+                for row in csv.reader(lines):
+                    if (
+                        len(row) > max(ts_idx, symbol_idx)
+                        and row[symbol_idx] not in symbols
+                        and row != header
+                        and start_ns <= parse_epoch_ns(row[ts_idx]) <= end_ns
+                    ):
+                        symbols.add(row[symbol_idx])
+        return sorted(symbols)
+
+    def source_signature(self, start: datetime, end: datetime) -> str:
+        """Fingerprint (name, size, mtime) of the files backing [start, end]."""
+
+        digest = hashlib.sha1()
+        for source in self._sources_for_range(start, end):
+            file_path = (
+                self._archive_dir() / source.file
+                if isinstance(source, CompactedDay)
+                else source
+            )
+            stat = file_path.stat()
+            digest.update(
+                f"{file_path.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode()
+            )
+        return digest.hexdigest()
+
+    def _hour_slot(self, ts_ns: int) -> Tuple[str, Path]:
+        """Hour key and hourly file for an epoch-ns timestamp (cached per hour)."""
+
+        hour = ts_ns // _NS_PER_HOUR
+        slot = self._hour_slots.get(hour)
+        if slot is None:
+            key = from_epoch_ns(hour * _NS_PER_HOUR).strftime("%Y%m%d_%H")
+            slot = (key, self._path_for_key(key))
+            self._hour_slots[hour] = slot
+        return slot
+
+    def _path_for_key(self, suffix: str) -> Path:
         if self.path.suffix == ".csv":
             return self.path.with_name(f"{self.path.stem}_{suffix}{self.path.suffix}")
         return self.path / f"history_{suffix}.csv"
 
-    def _files_for_range(self, start: datetime, end: datetime) -> Sequence[Path]:
+    def daily_path(self, day: date, codec: str) -> Path:
+        """Path of the compacted file for ``day``."""
+
+        return Path(
+            f"{self._path_for_key(day.strftime('%Y%m%d'))}{codec_suffix(codec)}"
+        )
+
+    def _archive_dir(self) -> Path:
+        return self.path.parent if self.path.suffix == ".csv" else self.path
+
+    def _sources_for_range(
+        self, start: datetime, end: datetime
+    ) -> List[CompactedDay | Path]:
+        """Compacted days and hourly files overlapping the range, in time order."""
+
         if start > end:
             return []
+        manifest = self.manifest_file.load()
+        hours = set(manifest.hours) if manifest is not None else None
+        days = manifest.days if manifest is not None else {}
         start_utc = start.astimezone(timezone.utc) if start.tzinfo else start
         end_utc = end.astimezone(timezone.utc) if end.tzinfo else end
-        start_hour = start_utc.replace(minute=0, second=0, microsecond=0)
+        current = start_utc.replace(minute=0, second=0, microsecond=0)
         end_hour = end_utc.replace(minute=0, second=0, microsecond=0)
-        current = start_hour
-        files: List[Path] = []
+        sources: List[CompactedDay | Path] = []
+        seen_days: set[str] = set()
         while current <= end_hour:
-            files.append(self._hourly_path(current))
+            day_key = current.date().isoformat()
+            if day_key in days and day_key not in seen_days:
+                sources.append(days[day_key])
+            seen_days.add(day_key)
+            hour_key = current.strftime("%Y%m%d_%H")
+            path = self._path_for_key(hour_key)
+            if (hour_key in hours) if hours is not None else path.exists():
+                sources.append(path)
             current += timedelta(hours=1)
-        return [path for path in files if path.exists()]
+        return sources
+
+    def hourly_files(self, day: date) -> List[Path]:
+        """Hot hourly files recorded for ``day``."""
+
+        start, end = day_bounds(day)
+        return [
+            source
+            for source in self._sources_for_range(start, end)
+            if isinstance(source, Path)
+        ]
 
     def available_dates(self) -> List[date]:
-        """Return available dates based on hourly CSV filenames."""
+        """Return dates with history, from the archive manifest when present."""
+
+        manifest = self.manifest_file.load()
+        if manifest is None:
+            manifest = self.scan_manifest()
+        dates = {date.fromisoformat(key) for key in manifest.days}
+        dates.update(
+            datetime.strptime(key[:8], "%Y%m%d").date() for key in manifest.hours
+        )
+        return sorted(dates)
+
+    def scan_manifest(self) -> HistoryManifest:
+        """Build a manifest of hot hourly files by listing the archive directory."""
 
-        base_dir = self.path.parent if self.path.suffix == ".csv" else self.path
+        base_dir = self._archive_dir()
         if not base_dir.exists():
-            return []
+            return HistoryManifest()
 
         if self.path.suffix == ".csv":
             stem = re.escape(self.path.stem)
@@ -109,23 +540,31 @@ class CsvHistoryStore(HistoryStorePort):
             pattern = re.compile(rf"^{stem}_(\d{{8}})_(\d{{2}}){suffix}$")
         else:
             pattern = re.compile(r"^history_(\d{8})_(\d{2})\.csv$")
-        dates: set[date] = set()
+        hours: List[str] = []
         for entry in base_dir.iterdir():
             if not entry.is_file():
                 continue
             match = pattern.match(entry.name)
             if not match:
                 continue
-            day_str = match.group(1)
             try:
-                dates.add(datetime.strptime(day_str, "%Y%m%d").date())
+                datetime.strptime(match.group(1), "%Y%m%d")
             except ValueError:
                 continue
-        return sorted(dates)
+            hours.append(f"{match.group(1)}_{match.group(2)}")
+        return HistoryManifest(hours=sorted(hours))
+
+    def _register_hour(self, hour_key: str) -> None:
+        manifest = self.manifest_file.load()
+        if manifest is not None and hour_key in manifest.hours:
+            return
+        with self.manifest_file.update(self.scan_manifest) as current:
+            if hour_key not in current.hours:
+                current.hours.append(hour_key)
 
     def _snapshot_to_row(self, snapshot: OrderBookSnapshot) -> Dict[str, object]:
         row: Dict[str, object] = {
-            "ts": snapshot.ts.isoformat(),
+            "ts": snapshot.ts_ns,
             "symbol": snapshot.symbol,
         }
         for i in range(10):
@@ -141,7 +580,7 @@ class CsvHistoryStore(HistoryStorePort):
         bids: List[Level] = []
         asks: List[Level] = []
         symbol = Symbol(row["symbol"])
-        ts = Timestamp(datetime.fromisoformat(row["ts"]))
+        ts_ns = parse_epoch_ns(row["ts"])
 
         for i in range(1, 11):
             bid_price = row.get(f"bid_p{i}")
@@ -158,4 +597,37 @@ class CsvHistoryStore(HistoryStorePort):
                     Level(price=price_key_from(ask_price), qty=Quantity(float(ask_qty)))
                 )
 
-        return OrderBookSnapshot(ts=ts, symbol=symbol, bid_levels=bids, ask_levels=asks)
+        return OrderBookSnapshot(
+            ts=from_epoch_ns(ts_ns),
+            symbol=symbol,
+            bid_levels=bids,
+            ask_levels=asks,
+            ts_ns=ts_ns,
+        )
+
+
+def _select_rows(
+    lines: Iterable[str], header: List[str], symbol: str | None
+) -> Iterator[Dict[str, str]]:
+    """Parse CSV lines into dicts, dropping other symbols' lines unparsed.
+
+    Symbols are plain codes that are never quoted, so the symbol column is
+    found with a bounded ``split`` before the csv module sees the line.
+    """
+
+    symbol_idx = header.index("symbol")
+    if symbol is not None:
+        lines = (
+            line
+            for line in lines
+            if line.split(",", symbol_idx + 1)[symbol_idx : symbol_idx + 1] == [symbol]
+        )
+    for values in csv.reader(lines):
+        if len(values) <= symbol_idx or values == header:
+            continue
+        yield dict(zip(header, values))
+
+
+def _frame_rows(path: Path, frame: SymbolFrame, codec: str) -> Iterator[Dict[str, str]]:
+    text = read_frame(path, frame, codec).decode("utf-8")
+    yield from csv.DictReader(io.StringIO(text, newline=""))
@@ -0,0 +1,112 @@
+"""Memory-mapped on-disk feature cache partitioned by spec, symbol and day."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from application.ports.feature_cache import (
+    FeatureCachePort,
+    FeaturePartition,
+)
+from domain.features.spec import FeatureSpec
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+META_FILENAME = "meta.json"
+FEATURES_FILENAME = "features.npy"
+TIMESTAMPS_FILENAME = "ts_ns.npy"
+MIDS_FILENAME = "mid.npy"
+
+
+@dataclass
+class FeatureCacheFs(FeatureCachePort):
+    """Stores partitions under ``<spec hash>/<symbol>/<YYYY-MM-DD>/`` as ``.npy``.
+
+    A partition is only returned when its recorded source signature matches the
+    caller's, so appending to or rewriting a history file invalidates the day.
+    A spec change maps to a different directory altogether.
+    """
+
+    base_dir: Path
+    mmap: bool = True
+
+    def __post_init__(self) -> None:
+        self.base_dir = Path(self.base_dir)
+
+    def partition_dir(self, spec: FeatureSpec, symbol: str, day: date) -> Path:
+        return self.base_dir / spec.fingerprint()[:16] / symbol / day.isoformat()
+
+    def load(
+        self, spec: FeatureSpec, symbol: str, day: date, source_signature: str
+    ) -> FeaturePartition | None:
+        directory = self.partition_dir(spec, symbol, day)
+        try:
+            meta = json.loads((directory / META_FILENAME).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if (
+            meta.get("format") != CACHE_FORMAT_VERSION
+            or meta.get("spec_hash") != spec.fingerprint()
+            or meta.get("source_signature") != source_signature
+        ):
+            return None
+        mmap_mode = "r" if self.mmap else None
+        try:
+            return FeaturePartition(
+                feature_names=list(meta["feature_names"]),
+                features=np.load(directory / FEATURES_FILENAME, mmap_mode=mmap_mode),
+                timestamps_ns=np.load(
+                    directory / TIMESTAMPS_FILENAME, mmap_mode=mmap_mode
+                ),
+                mids=np.load(directory / MIDS_FILENAME, mmap_mode=mmap_mode),
+            )
+        except (FileNotFoundError, ValueError) as exc:
+            logger.warning("discarding unreadable feature cache %s: %s", directory, exc)
+            return None
+
+    def store(
+        self,
+        spec: FeatureSpec,
+        symbol: str,
+        day: date,
+        source_signature: str,
+        partition: FeaturePartition,
+    ) -> None:
+        directory = self.partition_dir(spec, symbol, day)
+        tmp_dir = directory.with_name(f".{directory.name}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        try:
+            np.save(
+                tmp_dir / FEATURES_FILENAME, np.ascontiguousarray(partition.features)
+            )
+            np.save(tmp_dir / TIMESTAMPS_FILENAME, partition.timestamps_ns)
+            np.save(tmp_dir / MIDS_FILENAME, partition.mids)
+            meta = {
+                "format": CACHE_FORMAT_VERSION,
+                "spec_hash": spec.fingerprint(),
+                "spec_version": spec.version,
+                "source_signature": source_signature,
+                "feature_names": list(partition.feature_names),
+                "rows": len(partition),
+            }
+            # The meta file is written last: a partition without it is never read.
+            (tmp_dir / META_FILENAME).write_text(json.dumps(meta, indent=2))
+            shutil.rmtree(directory, ignore_errors=True)
+            try:
+                tmp_dir.rename(directory)
+            except OSError:
+                # Another writer published the same partition first.
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
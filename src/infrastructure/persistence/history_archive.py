@@ -0,0 +1,183 @@
+"""Manifest and compressed per-symbol frames of the history archive."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, BinaryIO, Callable, Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+CODEC_GZIP = "gzip"
+CODEC_ZSTD = "zstd"
+
+try:  # optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock(f: IO) -> None:
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK gives up after ~10s of retries; keep waiting.
+                continue
+
+    def _unlock(f: IO) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock(f: IO) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock(f: IO) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@dataclass(frozen=True)
+class SymbolFrame:
+    """Byte range of one symbol's independently compressed CSV frame."""
+
+    offset: int
+    length: int
+    rows: int
+    start: str
+    end: str
+
+
+@dataclass
+class CompactedDay:
+    file: str
+    codec: str
+    rows: int
+    start: str
+    end: str
+    symbols: Dict[str, SymbolFrame] = field(default_factory=dict)
+
+
+@dataclass
+class HistoryManifest:
+    """Index of the archive: hot hourly files plus compacted days.
+
+    ``hours`` holds ``YYYYMMDD_HH`` keys of hourly CSV files that exist on disk;
+    ``days`` maps ISO dates to their compacted daily file.
+    """
+
+    hours: List[str] = field(default_factory=list)
+    days: Dict[str, CompactedDay] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        payload = {
+            "version": MANIFEST_VERSION,
+            "hours": sorted(set(self.hours)),
+            "days": {key: asdict(value) for key, value in sorted(self.days.items())},
+        }
+        return json.dumps(payload, indent=1)
+
+    @classmethod
+    def from_json(cls, text: str) -> "HistoryManifest":
+        data = json.loads(text)
+        if data.get("version") != MANIFEST_VERSION:
+            raise ValueError(
+                f"Unsupported history manifest version: {data.get('version')}"
+            )
+        days: Dict[str, CompactedDay] = {}
+        for key, value in (data.get("days") or {}).items():
+            symbols = {
+                symbol: SymbolFrame(**frame)
+                for symbol, frame in (value.pop("symbols", None) or {}).items()
+            }
+            days[key] = CompactedDay(**value, symbols=symbols)
+        return cls(hours=list(data.get("hours") or []), days=days)
+
+
+class ManifestFile:
+    """Loads the manifest (cached by mtime) and applies locked read-modify-write."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._cached_key: tuple[int, int] | None = None
+        self._cached: HistoryManifest | None = None
+
+    def load(self) -> HistoryManifest | None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._cached is None or self._cached_key != key:
+            self._cached = HistoryManifest.from_json(self.path.read_text())
+            self._cached_key = key
+        return self._cached
+
+    @contextmanager
+    def update(
+        self, initial: Callable[[], HistoryManifest]
+    ) -> Iterator[HistoryManifest]:
+        """Yield the current manifest (or ``initial()``) and save it on exit."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = self.path.with_name(f".{self.path.name}.lock")
+        with lock_path.open("a") as lock:
+            _lock(lock)
+            try:
+                manifest = self.load() if self.path.exists() else None
+                manifest = manifest if manifest is not None else initial()
+                yield manifest
+                tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+                tmp_path.write_text(manifest.to_json())
+                os.replace(tmp_path, self.path)
+                self._cached = None
+            finally:
+                _unlock(lock)
+
+
+def resolve_codec(codec: str) -> str:
+    """Return ``codec``, falling back to gzip when zstandard is not installed."""
+
+    if codec == CODEC_GZIP:
+        return codec
+    if codec != CODEC_ZSTD:
+        raise ValueError(f"Unsupported history codec: {codec}")
+    if zstandard is None:
+        logger.warning("zstandard is not installed; compacting with gzip instead")
+        return CODEC_GZIP
+    return codec
+
+
+def codec_suffix(codec: str) -> str:
+    return ".zst" if codec == CODEC_ZSTD else ".gz"
+
+
+def open_frame_writer(fileobj: BinaryIO, codec: str) -> BinaryIO:
+    """Return a writer whose ``close()`` finishes one complete compressed frame."""
+
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=10).stream_writer(fileobj, closefd=False)
+    return gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=6, mtime=0)
+
+
+def read_frame(path: Path, frame: SymbolFrame, codec: str) -> bytes:
+    with Path(path).open("rb") as f:
+        f.seek(frame.offset)
+        data = f.read(frame.length)
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
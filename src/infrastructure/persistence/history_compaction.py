@@ -0,0 +1,149 @@
+"""Compaction of finished days' hourly history files into compressed dailies."""
+
+from __future__ import annotations
+
+import csv
+import io
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import BinaryIO, Dict, List, TextIO
+
+from domain.market.time import day_bounds, from_epoch_ns, parse_epoch_ns
+from infrastructure.persistence.csv_history_store import CsvHistoryStore
+from infrastructure.persistence.history_archive import (
+    CODEC_GZIP,
+    CompactedDay,
+    SymbolFrame,
+    open_frame_writer,
+    resolve_codec,
+)
+from infrastructure.persistence.history_index import index_path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _FrameBuffer:
+    raw: BinaryIO
+    text: TextIO
+    writer: csv.DictWriter
+    rows: int = 0
+    start_ns: int | None = None
+    end_ns: int | None = None
+
+
+def compact_day(
+    store: CsvHistoryStore, day: date, codec: str = CODEC_GZIP
+) -> CompactedDay | None:
+    """Merge ``day``'s hourly files into one symbol-sorted compressed file.
+
+    Each symbol is written as an independent compressed frame whose byte range
+    is recorded in the manifest, so single-symbol reads seek straight to it.
+    An already compacted day is rewritten together with any late hourly files.
+    Only compact days the writer has finished with.
+    """
+
+    codec = resolve_codec(codec)
+    hourly = store.hourly_files(day)
+    if not hourly:
+        return None
+    start, end = day_bounds(day)
+    target = store.daily_path(day, codec)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=target.parent, prefix=".compact_") as tmp:
+        buffers: Dict[str, _FrameBuffer] = {}
+        try:
+            for row in store.iter_rows(start, end):
+                symbol = row["symbol"]
+                buffer = buffers.get(symbol)
+                if buffer is None:
+                    buffer = _open_buffer(
+                        Path(tmp) / f"{len(buffers)}.part", store, codec
+                    )
+                    buffers[symbol] = buffer
+                buffer.writer.writerow(row)
+                ts_ns = parse_epoch_ns(row["ts"])
+                buffer.rows += 1
+                if buffer.start_ns is None:
+                    buffer.start_ns = buffer.end_ns = ts_ns
+                else:
+                    buffer.start_ns = min(buffer.start_ns, ts_ns)
+                    buffer.end_ns = max(buffer.end_ns, ts_ns)
+        finally:
+            for buffer in buffers.values():
+                buffer.text.close()
+                buffer.raw.close()
+
+        frames: Dict[str, SymbolFrame] = {}
+        tmp_target = Path(tmp) / target.name
+        with tmp_target.open("wb") as out:
+            for symbol in sorted(buffers):
+                buffer = buffers[symbol]
+                offset = out.tell()
+                with open(buffer.raw.name, "rb") as part:
+                    shutil.copyfileobj(part, out)
+                frames[symbol] = SymbolFrame(
+                    offset=offset,
+                    length=out.tell() - offset,
+                    rows=buffer.rows,
+                    start=from_epoch_ns(buffer.start_ns).isoformat(),
+                    end=from_epoch_ns(buffer.end_ns).isoformat(),
+                )
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_target, target)
+
+    entry = CompactedDay(
+        file=target.name,
+        codec=codec,
+        rows=sum(frame.rows for frame in frames.values()),
+        start=min((frame.start for frame in frames.values()), default=""),
+        end=max((frame.end for frame in frames.values()), default=""),
+        symbols=frames,
+    )
+    hour_prefix = day.strftime("%Y%m%d")
+    with store.manifest_file.update(store.scan_manifest) as manifest:
+        previous = manifest.days.get(day.isoformat())
+        manifest.days[day.isoformat()] = entry
+        manifest.hours = [h for h in manifest.hours if not h.startswith(hour_prefix)]
+    if previous is not None and previous.file != entry.file:
+        (target.parent / previous.file).unlink(missing_ok=True)
+    for path in hourly:
+        path.unlink(missing_ok=True)
+        index_path(path).unlink(missing_ok=True)
+    logger.info(
+        "compacted %s: %d hourly files, %d rows, %d symbols -> %s",
+        day,
+        len(hourly),
+        entry.rows,
+        len(frames),
+        target,
+    )
+    return entry
+
+
+def compact_finished_days(
+    store: CsvHistoryStore, before: date, codec: str = CODEC_GZIP
+) -> List[date]:
+    """Compact every day before ``before`` that still has hourly files."""
+
+    compacted: List[date] = []
+    for day in store.available_dates():
+        if day >= before:
+            continue
+        if compact_day(store, day, codec) is not None:
+            compacted.append(day)
+    return compacted
+
+
+def _open_buffer(path: Path, store: CsvHistoryStore, codec: str) -> _FrameBuffer:
+    raw = path.open("w+b")
+    text = io.TextIOWrapper(open_frame_writer(raw, codec), encoding="utf-8", newline="")
+    writer = csv.DictWriter(text, fieldnames=store.fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    return _FrameBuffer(raw=raw, text=text, writer=writer)
@@ -0,0 +1,116 @@
+"""Sidecar block index of hourly history CSV files."""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Tuple
+
+from domain.market.time import parse_epoch_ns
+
+INDEX_SUFFIX = ".idx"
+INDEX_FIELDS = ["offset", "length", "rows", "start", "end", "symbols"]
+
+
+@dataclass(frozen=True)
+class IndexBlock:
+    """Byte range of a run of rows, with its epoch-ns time bounds and symbols.
+
+    Every symbol's first row in a block is a keyframe, so a block decodes
+    without reading anything before it.
+    """
+
+    offset: int
+    length: int
+    rows: int
+    start_ns: int
+    end_ns: int
+    symbols: Tuple[str, ...]
+
+    @property
+    def end_offset(self) -> int:
+        return self.offset + self.length
+
+    def overlaps(self, start_ns: int, end_ns: int, symbol: str | None) -> bool:
+        if symbol is not None and symbol not in self.symbols:
+            return False
+        return self.start_ns <= end_ns and self.end_ns >= start_ns
+
+
+@dataclass
+class OpenBlock:
+    """The block currently being appended to ``path``."""
+
+    path: Path
+    offset: int
+    end_offset: int
+    rows: int = 0
+    start_ns: int = 0
+    end_ns: int = 0
+    symbols: set[str] = field(default_factory=set)
+
+    def add(self, ts_ns: int, symbol: str, end_offset: int) -> None:
+        if self.rows == 0:
+            self.start_ns = self.end_ns = ts_ns
+        else:
+            self.start_ns = min(self.start_ns, ts_ns)
+            self.end_ns = max(self.end_ns, ts_ns)
+        self.rows += 1
+        self.symbols.add(symbol)
+        self.end_offset = end_offset
+
+    def close(self) -> IndexBlock | None:
+        if self.rows == 0:
+            return None
+        return IndexBlock(
+            offset=self.offset,
+            length=self.end_offset - self.offset,
+            rows=self.rows,
+            start_ns=self.start_ns,
+            end_ns=self.end_ns,
+            symbols=tuple(sorted(self.symbols)),
+        )
+
+
+def index_path(data_path: Path) -> Path:
+    return data_path.with_name(data_path.name + INDEX_SUFFIX)
+
+
+def read_index(data_path: Path) -> List[IndexBlock]:
+    """Return the indexed blocks of ``data_path`` (empty when unindexed)."""
+
+    path = index_path(data_path)
+    if not path.exists():
+        return []
+    with path.open("r", newline="") as f:
+        return [
+            IndexBlock(
+                offset=int(row["offset"]),
+                length=int(row["length"]),
+                rows=int(row["rows"]),
+                start_ns=parse_epoch_ns(row["start"]),
+                end_ns=parse_epoch_ns(row["end"]),
+                symbols=tuple(row["symbols"].split()),
+            )
+            for row in csv.DictReader(f)
+        ]
+
+
+def append_index_block(data_path: Path, block: IndexBlock) -> None:
+    path = index_path(data_path)
+    write_header = not path.exists()
+    with path.open("a", newline="") as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(INDEX_FIELDS)
+        writer.writerow(
+            [
+                block.offset,
+                block.length,
+                block.rows,
+                block.start_ns,
+                block.end_ns,
+                " ".join(block.symbols),
+            ]
+        )
@@ -0,0 +1,312 @@
+"""Versioned model artifact store (native booster + JSON manifest)."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from application.ports.model import (
+    ModelPredictorPort,
+    ModelStorePort,
+)
+from domain.features.spec import FeatureSpec
+from domain.market.types import Symbol
+from infrastructure.ml.flat_tree import FlatTreeEnsemble
+from infrastructure.ml.flat_tree_predictor import FlatTreePredictor
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+MODEL_FILENAME = "model.json"
+ACTIVE_POINTER = "ACTIVE"
+ARTIFACTS_DIRNAME = "artifacts"
+
+FORMAT_XGBOOST_JSON = "xgboost-json"
+FORMAT_CONSTANT = "constant"
+
+
+class ModelSpecMismatchError(ValueError):
+    """Raised when an artifact was trained for a different FeatureSpec."""
+
+
+@dataclass(frozen=True)
+class ModelManifest:
+    artifact_id: str
+    format: str
+    feature_order: List[str]
+    spec_version: str
+    spec_hash: str
+    created_at: str
+    training_start: Optional[str] = None
+    training_end: Optional[str] = None
+    metrics: Dict[str, float] = field(default_factory=dict)
+    default_score: float = 0.0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2, sort_keys=True)
+
+    @classmethod
+    def from_json(cls, text: str) -> "ModelManifest":
+        data = json.loads(text)
+        known = set(cls.__dataclass_fields__)
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+@dataclass
+class ModelArtifactStore(ModelStorePort):
+    """Stores each model in ``artifacts/<id>/`` and activates it via a pointer file.
+
+    ``load_active`` caches the compiled predictor and only reloads it when the
+    pointer file changes, so it is cheap enough to call on every tick.
+    """
+
+    base_dir: Path
+    spec: FeatureSpec | None = None
+    keep_last: int = 5
+
+    def __post_init__(self) -> None:
+        self.base_dir = Path(self.base_dir)
+        self._cached_key: tuple[int, int, int] | None = None
+        self._cached_predictor: ModelPredictorPort | None = None
+        self._mismatch: tuple[tuple[int, int, int], str] | None = None
+        self._candidate: tuple[ModelPredictorPort, str] | None = None
+
+    def _pointer_path(self) -> Path:
+        return self.base_dir / ACTIVE_POINTER
+
+    def _artifact_dir(self, artifact_id: str) -> Path:
+        return self.base_dir / ARTIFACTS_DIRNAME / artifact_id
+
+    def active_manifest(self) -> ModelManifest | None:
+        """Return the manifest of the active artifact, or None if none is active."""
+
+        pointer = self._pointer_path()
+        if not pointer.exists():
+            return None
+        artifact_id = pointer.read_text().strip()
+        manifest_path = self._artifact_dir(artifact_id) / MANIFEST_FILENAME
+        return ModelManifest.from_json(manifest_path.read_text())
+
+    def validate_active(self) -> ModelManifest | None:
+        """Check the active artifact against the expected spec without loading it."""
+
+        manifest = self.active_manifest()
+        if manifest is not None:
+            self._check_spec(manifest)
+        return manifest
+
+    def load_active(self) -> ModelPredictorPort:
+        pointer = self._pointer_path()
+        try:
+            stat = pointer.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Active model not found at {pointer}") from None
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if self._cached_predictor is not None and self._cached_key == key:
+            return self._cached_predictor
+        if self._mismatch is not None and self._mismatch[0] == key:
+            raise ModelSpecMismatchError(self._mismatch[1])
+
+        manifest = self.active_manifest()
+        if manifest is None:
+            raise FileNotFoundError(f"Active model not found at {pointer}")
+        try:
+            self._check_spec(manifest)
+        except ModelSpecMismatchError as exc:
+            # Remember until the pointer changes so callers polling every tick
+            # do not re-read the manifest.
+            self._mismatch = (key, str(exc))
+            raise
+        predictor = self._load_predictor(manifest)
+        self._cached_key = key
+        self._cached_predictor = predictor
+        return predictor
+
+    def save_candidate(self, predictor: ModelPredictorPort) -> None:
+        artifact_id = self._write_artifact(predictor)
+        self._candidate = (predictor, artifact_id)
+
+    def swap_active(self, predictor: ModelPredictorPort) -> None:
+        if self._candidate is not None and self._candidate[0] is predictor:
+            artifact_id = self._candidate[1]
+        else:
+            artifact_id = self._write_artifact(predictor)
+        self._candidate = None
+        self._write_pointer(artifact_id)
+        self._prune(keep=artifact_id)
+
+    def list_artifacts(self) -> List[str]:
+        root = self.base_dir / ARTIFACTS_DIRNAME
+        if not root.exists():
+            return []
+        return sorted(
+            entry.name
+            for entry in root.iterdir()
+            if entry.is_dir() and (entry / MANIFEST_FILENAME).exists()
+        )
+
+    def _check_spec(self, manifest: ModelManifest) -> None:
+        if self.spec is None:
+            return
+        expected = self.spec.fingerprint()
+        if manifest.spec_hash != expected:
+            raise ModelSpecMismatchError(
+                f"Model {manifest.artifact_id} in {self.base_dir} was trained for "
+                f"spec {manifest.spec_version}@{manifest.spec_hash[:12]}, "
+                f"expected {self.spec.version}@{expected[:12]}"
+            )
+
+    def _load_predictor(self, manifest: ModelManifest) -> FlatTreePredictor:
+        if manifest.format == FORMAT_CONSTANT:
+            return FlatTreePredictor(
+                feature_order=manifest.feature_order,
+                ensemble=None,
+                default_score=manifest.default_score,
+            )
+        if manifest.format != FORMAT_XGBOOST_JSON:
+            raise ValueError(f"Unsupported model artifact format: {manifest.format}")
+        model_path = self._artifact_dir(manifest.artifact_id) / MODEL_FILENAME
+        ensemble = FlatTreeEnsemble.from_model_json(model_path.read_bytes())
+        return FlatTreePredictor(
+            feature_order=manifest.feature_order, ensemble=ensemble
+        )
+
+    def _write_artifact(self, predictor: ModelPredictorPort) -> str:
+        if self.spec is None:
+            raise ValueError("ModelArtifactStore requires a spec to save artifacts")
+        model = getattr(predictor, "model", None)
+        if model is None and getattr(predictor, "ensemble", None) is not None:
+            raise TypeError(
+                "Compiled predictors cannot be persisted; save the trained XgbPredictor"
+            )
+
+        created = datetime.now(timezone.utc)
+        spec_hash = self.spec.fingerprint()
+        artifact_id = self._new_artifact_id(created, spec_hash)
+        metadata: Dict[str, Any] = dict(getattr(predictor, "metadata", None) or {})
+        manifest = ModelManifest(
+            artifact_id=artifact_id,
+            format=FORMAT_CONSTANT if model is None else FORMAT_XGBOOST_JSON,
+            feature_order=list(getattr(predictor, "feature_order", [])),
+            spec_version=self.spec.version,
+            spec_hash=spec_hash,
+            created_at=created.isoformat(),
+            training_start=metadata.get("training_start"),
+            training_end=metadata.get("training_end"),
+            metrics=dict(metadata.get("metrics") or {}),
+            default_score=float(getattr(predictor, "default_score", 0.0)),
+        )
+
+        final_dir = self._artifact_dir(artifact_id)
+        tmp_dir = final_dir.with_name(f".{artifact_id}.tmp")
+        tmp_dir.mkdir(parents=True, exist_ok=False)
+        try:
+            if model is not None:
+                booster = (
+                    model.get_booster() if hasattr(model, "get_booster") else model
+                )
+                (tmp_dir / MODEL_FILENAME).write_bytes(bytes(booster.save_raw("json")))
+            (tmp_dir / MANIFEST_FILENAME).write_text(manifest.to_json())
+            tmp_dir.rename(final_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return artifact_id
+
+    def _new_artifact_id(self, created: datetime, spec_hash: str) -> str:
+        base = f"{created.strftime('%Y%m%dT%H%M%S%f')}-{spec_hash[:8]}"
+        artifact_id = base
+        suffix = 1
+        while self._artifact_dir(artifact_id).exists():
+            artifact_id = f"{base}-{suffix}"
+            suffix += 1
+        return artifact_id
+
+    def _write_pointer(self, artifact_id: str) -> None:
+        pointer = self._pointer_path()
+        pointer.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = pointer.with_name(f".{ACTIVE_POINTER}.tmp")
+        with tmp_path.open("w") as handle:
+            handle.write(artifact_id)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, pointer)
+
+    def _prune(self, keep: str) -> None:
+        if self.keep_last <= 0:
+            return
+        artifacts = self.list_artifacts()
+        stale = [name for name in artifacts[: -self.keep_last] if name != keep]
+        for name in stale:
+            shutil.rmtree(self._artifact_dir(name), ignore_errors=True)
+
+
+@dataclass
+class SymbolModelArtifactStore:
+    """Per-symbol ``ModelArtifactStore`` under ``base_dir/<symbol>/``.
+
+    With ``mismatch_as_missing`` an artifact trained for another FeatureSpec is
+    treated as no model: ``load_active_for`` raises ``FileNotFoundError`` and
+    ``validate_all`` leaves the symbol out, so it can be retrained meanwhile.
+    """
+
+    base_dir: Path
+    spec: FeatureSpec | None = None
+    keep_last: int = 5
+    mismatch_as_missing: bool = False
+
+    def __post_init__(self) -> None:
+        self.base_dir = Path(self.base_dir)
+        self._stores: Dict[str, ModelArtifactStore] = {}
+
+    def store_for(self, symbol: Symbol | str) -> ModelArtifactStore:
+        key = str(symbol)
+        store = self._stores.get(key)
+        if store is None:
+            store = ModelArtifactStore(
+                base_dir=self.base_dir / key,
+                spec=self.spec,
+                keep_last=self.keep_last,
+            )
+            self._stores[key] = store
+        return store
+
+    def load_active_for(self, symbol: Symbol) -> ModelPredictorPort:
+        try:
+            return self.store_for(symbol).load_active()
+        except ModelSpecMismatchError as exc:
+            if not self.mismatch_as_missing:
+                raise
+            raise FileNotFoundError(str(exc)) from exc
+
+    def save_candidate_for(self, symbol: Symbol, predictor: ModelPredictorPort) -> None:
+        self.store_for(symbol).save_candidate(predictor)
+
+    def swap_active_for(self, symbol: Symbol, predictor: ModelPredictorPort) -> None:
+        self.store_for(symbol).swap_active(predictor)
+
+    def validate_all(self) -> Dict[str, ModelManifest]:
+        """Validate every symbol's active artifact against the expected spec."""
+
+        manifests: Dict[str, ModelManifest] = {}
+        if not self.base_dir.exists():
+            return manifests
+        for entry in sorted(self.base_dir.iterdir()):
+            if not (entry / ACTIVE_POINTER).exists():
+                continue
+            try:
+                manifest = self.store_for(entry.name).validate_active()
+            except ModelSpecMismatchError as exc:
+                if not self.mismatch_as_missing:
+                    raise
+                logger.warning("treating %s as untrained: %s", entry.name, exc)
+                continue
+            if manifest is not None:
+                manifests[entry.name] = manifest
+        return manifests
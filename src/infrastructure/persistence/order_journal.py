@@ -0,0 +1,424 @@
+"""Append-only binary journal of order and fill events with snapshots."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator, List, Tuple
+
+from application.ports.broker import OrderStatePort, PositionLedgerPort
+from domain.decision.signal import OrderSide
+from domain.market.types import Symbol
+from domain.order.realtime_order import OrderStatus, RealTimeOrder
+from infrastructure.memory.order_store import InMemoryOrderStore
+from infrastructure.memory.position_ledger import PositionLedger
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+REC_ADD = 1
+REC_ACK = 2
+REC_REJECT = 3
+REC_FILLED = 4
+REC_REMOVE = 5
+REC_FILL = 6
+REC_UNKNOWN = 7
+REC_ADD_PLACED = 8  # REC_ADD plus the order's wall-clock placement time
+
+# Field layout per record type: s = utf-8 string, q = int64, d = float64, ? = bool.
+_LAYOUTS = {
+    REC_ADD: "sqsqsd?ss",
+    REC_ACK: "ss",
+    REC_REJECT: "s",
+    REC_FILLED: "s",
+    REC_REMOVE: "s",
+    REC_FILL: "sssd",
+    REC_UNKNOWN: "s",
+    REC_ADD_PLACED: "sqsqsd?ssd",
+}
+_FRAME = struct.Struct("<II")  # payload length, crc32
+_STR_LEN = struct.Struct("<H")
+_SCALARS = {code: struct.Struct(f"<{code}") for code in "qd?"}
+_FILE_RE = re.compile(r"^(journal|snapshot)\.(\d+)\.(bin|json)$")
+
+
+def encode_record(kind: int, *fields: Any) -> bytes:
+    layout = _LAYOUTS[kind]
+    if len(fields) != len(layout):
+        raise ValueError(f"Record {kind} expects {len(layout)} fields")
+    parts = [bytes((kind,))]
+    for code, value in zip(layout, fields):
+        if code == "s":
+            data = ("" if value is None else str(value)).encode("utf-8")
+            parts.append(_STR_LEN.pack(len(data)))
+            parts.append(data)
+        else:
+            parts.append(_SCALARS[code].pack(value))
+    payload = b"".join(parts)
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_record(payload: bytes) -> Tuple[int, List[Any]]:
+    kind = payload[0]
+    offset = 1
+    fields: List[Any] = []
+    for code in _LAYOUTS[kind]:
+        if code == "s":
+            (length,) = _STR_LEN.unpack_from(payload, offset)
+            offset += _STR_LEN.size
+            fields.append(payload[offset : offset + length].decode("utf-8"))
+            offset += length
+        else:
+            scalar = _SCALARS[code]
+            fields.append(scalar.unpack_from(payload, offset)[0])
+            offset += scalar.size
+    return kind, fields
+
+
+def read_records(f: BinaryIO) -> Iterator[Tuple[int, List[Any], int]]:
+    """Yield ``(kind, fields, end_offset)`` up to the first torn or corrupt frame."""
+
+    offset = 0
+    while True:
+        header = f.read(_FRAME.size)
+        if len(header) < _FRAME.size:
+            return
+        length, crc = _FRAME.unpack(header)
+        payload = f.read(length)
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return
+        offset += _FRAME.size + length
+        kind, fields = decode_record(payload)
+        yield kind, fields, offset
+
+
+@dataclass
+class OrderJournal:
+    """Group-committed journal that rebuilds the order store and position ledger.
+
+    ``record`` applies a mutation and queues its encoded record under one lock,
+    so callers never wait on disk. A flusher thread woken by the first queued
+    record waits ``commit_interval_seconds`` for more, then writes and fsyncs
+    the whole group at once. After ``snapshot_every``
+    records the flusher writes ``snapshot.<gen>.json`` and starts
+    ``journal.<gen>.bin``, so recovery replays at most one snapshot interval.
+    """
+
+    directory: Path
+    commit_interval_seconds: float = 0.002
+    snapshot_every: int = 10_000
+
+    def __post_init__(self) -> None:
+        self.directory = Path(self.directory)
+        self._lock = threading.Lock()
+        self._flushed = threading.Condition()
+        self._pending: List[bytes] = []
+        self._appended = 0
+        self._durable = 0
+        self._since_snapshot = 0
+        self._generation = 0
+        self._file: BinaryIO | None = None
+        self._store: InMemoryOrderStore | None = None
+        self._ledger: PositionLedger | None = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def recover(self, store: InMemoryOrderStore, ledger: PositionLedger) -> int:
+        """Load the latest snapshot and replay its journal; return records replayed.
+
+        Orders that were still unconfirmed (PENDING or UNKNOWN) at the crash
+        come back unconfirmed and keep their symbol in flight until the order
+        gateway looks them up at the broker.
+        """
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._store = store
+        self._ledger = ledger
+        generations = self._generations("snapshot")
+        self._generation = max(generations) if generations else 0
+        if generations:
+            _restore_snapshot(
+                json.loads(self._snapshot_path(self._generation).read_text()),
+                store,
+                ledger,
+            )
+        journal_path = self._journal_path(self._generation)
+        replayed = 0
+        valid_end = 0
+        if journal_path.exists():
+            with journal_path.open("rb") as f:
+                for kind, fields, valid_end in read_records(f):
+                    _apply(kind, fields, store, ledger)
+                    replayed += 1
+            if valid_end < journal_path.stat().st_size:
+                logger.warning(
+                    "truncating torn journal tail of %s at byte %d",
+                    journal_path,
+                    valid_end,
+                )
+                os.truncate(journal_path, valid_end)
+        self._since_snapshot = replayed
+        self._file = journal_path.open("ab")
+        unconfirmed = [order.intent_id for order in store.list() if order.is_pending]
+        if unconfirmed:
+            logger.warning(
+                "recovered %d unconfirmed order(s): %s",
+                len(unconfirmed),
+                ", ".join(str(intent_id) for intent_id in unconfirmed),
+            )
+        logger.info(
+            "recovered %d orders from %s (%d journal records)",
+            len(store.list()),
+            self.directory,
+            replayed,
+        )
+        return replayed
+
+    def start(self) -> None:
+        if self._file is None:
+            raise RuntimeError("recover() must run before start()")
+        self._thread = threading.Thread(
+            target=self._run, name="order-journal", daemon=True
+        )
+        self._thread.start()
+
+    def record(self, apply: Callable[[], Any], kind: int, *fields: Any) -> Any:
+        """Run ``apply`` and queue its record atomically with respect to snapshots."""
+
+        data = encode_record(kind, *fields)
+        with self._lock:
+            result = apply()
+            self._pending.append(data)
+            self._appended += 1
+            self._since_snapshot += 1
+        self._wake.set()
+        return result
+
+    def sync(self, timeout: float | None = None) -> bool:
+        """Wait until everything recorded so far is on disk."""
+
+        target = self._appended
+        self._wake.set()
+        with self._flushed:
+            return self._flushed.wait_for(lambda: self._durable >= target, timeout)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            if self._stop.wait(self.commit_interval_seconds):
+                return
+            self._wake.clear()
+            self._flush()
+
+    def _flush(self) -> None:
+        snapshot = None
+        with self._lock:
+            batch, self._pending = self._pending, []
+            appended = self._appended
+            if self._since_snapshot >= self.snapshot_every:
+                snapshot = _capture_snapshot(self._store, self._ledger)
+                self._since_snapshot = 0
+        if batch:
+            self._file.write(b"".join(batch))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        if snapshot is not None:
+            self._rotate(snapshot)
+        with self._flushed:
+            self._durable = appended
+            self._flushed.notify_all()
+
+    def _rotate(self, snapshot: dict) -> None:
+        previous = self._generation
+        self._generation += 1
+        path = self._snapshot_path(self._generation)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with tmp_path.open("w") as f:
+            json.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self._file.close()
+        self._file = self._journal_path(self._generation).open("ab")
+        for old in (self._journal_path(previous), self._snapshot_path(previous)):
+            old.unlink(missing_ok=True)
+
+    def _generations(self, prefix: str) -> List[int]:
+        found = []
+        for path in self.directory.iterdir():
+            match = _FILE_RE.match(path.name)
+            if match and match.group(1) == prefix:
+                found.append(int(match.group(2)))
+        return found
+
+    def _journal_path(self, generation: int) -> Path:
+        return self.directory / f"journal.{generation}.bin"
+
+    def _snapshot_path(self, generation: int) -> Path:
+        return self.directory / f"snapshot.{generation}.json"
+
+
+def _apply(
+    kind: int,
+    fields: List[Any],
+    store: InMemoryOrderStore,
+    ledger: PositionLedger,
+) -> None:
+    if kind in (REC_ADD, REC_ADD_PLACED):
+        store.add(_order_from_fields(fields))
+    elif kind == REC_ACK:
+        store.acknowledge(fields[0], fields[1])
+    elif kind == REC_REJECT:
+        store.reject(fields[0])
+    elif kind == REC_UNKNOWN:
+        store.mark_unknown(fields[0])
+    elif kind == REC_FILLED:
+        store.mark_filled(fields[0])
+    elif kind == REC_REMOVE:
+        store.remove(fields[0])
+    elif kind == REC_FILL:
+        ledger.record_fill(
+            fields[0], Symbol(fields[1]), OrderSide(fields[2]), fields[3]
+        )
+    else:
+        raise ValueError(f"Unknown journal record type: {kind}")
+
+
+def _order_fields(order: RealTimeOrder) -> Tuple[Any, ...]:
+    return (
+        order.symbol,
+        order.qty,
+        order.side.value,
+        order.cash_margin,
+        order.order_id,
+        order.price,
+        order.is_filled,
+        order.status.value,
+        order.intent_id or "",
+        order.placed_at or 0.0,
+    )
+
+
+def _order_from_fields(fields: List[Any]) -> RealTimeOrder:
+    # REC_ADD records and older snapshots carry no placement time.
+    base, placed_at = fields[:9], fields[9] if len(fields) > 9 else 0.0
+    symbol, qty, side, cash_margin, order_id, price, filled, status, intent_id = base
+    return RealTimeOrder(
+        symbol=Symbol(symbol),
+        qty=int(qty),
+        side=OrderSide(side),
+        cash_margin=int(cash_margin),
+        order_id=order_id,
+        price=float(price),
+        is_filled=bool(filled),
+        status=OrderStatus(status),
+        intent_id=intent_id or None,
+        placed_at=float(placed_at) or None,
+    )
+
+
+def _capture_snapshot(store: InMemoryOrderStore, ledger: PositionLedger) -> dict:
+    return {
+        "version": SNAPSHOT_VERSION,
+        "orders": [list(_order_fields(order)) for order in store.list()],
+        "ledger": ledger.export_state(),
+    }
+
+
+def _restore_snapshot(
+    data: dict, store: InMemoryOrderStore, ledger: PositionLedger
+) -> None:
+    if data.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported order journal snapshot: {data.get('version')}")
+    for fields in data.get("orders") or []:
+        store.add(_order_from_fields(fields))
+    ledger.load_state(data.get("ledger") or {})
+
+
+@dataclass
+class JournaledOrderStore(OrderStatePort):
+    """Order store whose mutations are recorded in an ``OrderJournal``."""
+
+    store: InMemoryOrderStore
+    journal: OrderJournal
+
+    def add(self, order: RealTimeOrder) -> None:
+        self.journal.record(
+            lambda: self.store.add(order), REC_ADD_PLACED, *_order_fields(order)
+        )
+
+    def list(self) -> List[RealTimeOrder]:
+        return self.store.list()
+
+    def mark_filled(self, order_id: str) -> bool:
+        return self.journal.record(
+            lambda: self.store.mark_filled(order_id), REC_FILLED, order_id
+        )
+
+    def remove(self, order_id: str) -> bool:
+        return self.journal.record(
+            lambda: self.store.remove(order_id), REC_REMOVE, order_id
+        )
+
+    def acknowledge(self, intent_id: str, order_id: str) -> bool:
+        return self.journal.record(
+            lambda: self.store.acknowledge(intent_id, order_id),
+            REC_ACK,
+            intent_id,
+            order_id,
+        )
+
+    def mark_unknown(self, intent_id: str) -> bool:
+        return self.journal.record(
+            lambda: self.store.mark_unknown(intent_id), REC_UNKNOWN, intent_id
+        )
+
+    def reject(self, intent_id: str) -> bool:
+        return self.journal.record(
+            lambda: self.store.reject(intent_id), REC_REJECT, intent_id
+        )
+
+
+@dataclass
+class JournaledPositionLedger(PositionLedgerPort):
+    """Position ledger whose fills are recorded in an ``OrderJournal``."""
+
+    ledger: PositionLedger
+    journal: OrderJournal
+
+    def record_fill(
+        self, order_id: str, symbol: Symbol, side: OrderSide, cum_qty: float
+    ) -> None:
+        self.journal.record(
+            lambda: self.ledger.record_fill(order_id, symbol, side, cum_qty),
+            REC_FILL,
+            order_id,
+            symbol,
+            side.value,
+            float(cum_qty),
+        )
+
+    def current_position(self, symbol: Symbol | None = None) -> float:
+        return self.ledger.current_position(symbol)
+
+    def snapshot(self):
+        return self.ledger.snapshot()
@@ -9,7 +9,7 @@ from typing import Sequence, Tuple
 
 @dataclass(frozen=True)
 class OrderBookDto:
-    ts: datetime
+    ts: datetime | int | str
     symbol: str
     bids: Sequence[Tuple[str | float, float]]
     asks: Sequence[Tuple[str | float, float]]
@@ -8,7 +8,7 @@ from domain.market.level import Level
 from domain.market.orderbook_snapshot import (
     OrderBookSnapshot,
 )
-from domain.market.time import Timestamp
+from domain.market.time import Timestamp, from_epoch_ns, to_epoch_ns
 from domain.market.types import (
     Quantity,
     Symbol,
@@ -20,9 +20,15 @@ from infrastructure.websocket.dto import OrderBookDto
 def to_domain(dto: OrderBookDto) -> OrderBookSnapshot:
     """Normalize a WebSocket DTO into a domain snapshot."""
 
+    # One parse per message; everything downstream works on ``ts_ns``.
     ts = dto.ts
-    if isinstance(ts, str):
+    if isinstance(ts, str) and not ts.isdigit():
         ts = datetime.fromisoformat(ts)
+    if isinstance(ts, datetime):
+        ts_ns = to_epoch_ns(ts)
+    else:
+        ts_ns = int(ts)
+        ts = from_epoch_ns(ts_ns)
 
     bids = sorted(dto.bids, key=lambda item: price_key_from(item[0]), reverse=True)[:10]
     asks = sorted(dto.asks, key=lambda item: price_key_from(item[0]))[:10]
@@ -34,4 +40,5 @@ def to_domain(dto: OrderBookDto) -> OrderBookSnapshot:
         symbol=Symbol(dto.symbol),
         bid_levels=bid_levels,
         ask_levels=ask_levels,
+        ts_ns=ts_ns,
     )
@@ -48,9 +48,9 @@ class WebSocketMarketDataSource(MarketDataSourcePort):
         return to_domain(dto)
 
 
-def _parse_ts(value: Any) -> datetime:
-    if isinstance(value, datetime):
+def _parse_ts(value: Any) -> datetime | int | str:
+    """Validate the raw timestamp; the mapper converts it to epoch ns once."""
+
+    if isinstance(value, (datetime, int, str)) and not isinstance(value, bool):
         return value
-    if isinstance(value, str):
-        return datetime.fromisoformat(value)
     raise ValueError(f"Unsupported timestamp: {value!r}")
@@ -1,8 +1,10 @@
 from datetime import datetime, timezone
 
+import numpy as np
 import pytest
 
 from my_scalping_kabu_station_example.application.service.dataset import DatasetBuilder
+from my_scalping_kabu_station_example.application.service.labeling import LabelSpec
 from my_scalping_kabu_station_example.domain.features.expr import MicroPrice
 from my_scalping_kabu_station_example.domain.features.spec import (
     FeatureDef,
@@ -57,3 +59,31 @@ def test_dataset_builder_collects_features(tmp_path) -> None:
     assert len(features) == 2
     expected = (100.5 * 1.0 + 100.0 * 2.0) / (1.0 + 2.0 + 1e-9)
     assert features[0]["microprice"] == pytest.approx(expected)
+
+
+def test_build_dataset_returns_dense_matrix_with_labels(tmp_path) -> None:
+    spec = FeatureSpec.from_features(
+        version="v1",
+        eps=1e-9,
+        params={},
+        features=[FeatureDef("microprice", MicroPrice(eps=1e-9))],
+    )
+    builder = DatasetBuilder(
+        history_store=CsvHistoryStore(path=tmp_path / "history.csv"),
+        feature_engine=PandasOrderBookFeatureEngine(),
+    )
+    ts0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    snapshots = [
+        _make_snapshot(ts0.replace(second=2), "99.8", "100.3"),
+        _make_snapshot(ts0, "100.0", "100.5"),
+        _make_snapshot(ts0.replace(second=1), "100.2", "100.7"),
+    ]
+
+    dataset = builder.build_dataset(spec, snapshots, LabelSpec(horizon_seconds=1.0))
+
+    assert dataset.feature_names == ["microprice"]
+    assert dataset.features.dtype == np.float32
+    assert dataset.features.flags.c_contiguous
+    assert dataset.features.shape == (2, 1)
+    assert dataset.labels.tolist() == [1.0, 0.0]
+    assert dataset.timestamps_ns[0] == 1_704_067_200_000_000_000
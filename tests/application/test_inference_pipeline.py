@@ -1,5 +1,6 @@
 import json
-from datetime import datetime, timezone
+import threading
+from datetime import datetime, timedelta, timezone
 
 from my_scalping_kabu_station_example.application.service.pipelines.inference_pipeline import (
     InferencePipeline,
@@ -9,14 +10,31 @@ from my_scalping_kabu_station_example.application.service.state.stream_state imp
 )
 from my_scalping_kabu_station_example.domain.decision.policy import DecisionPolicy
 from my_scalping_kabu_station_example.domain.decision.risk import RiskParams
-from my_scalping_kabu_station_example.domain.features.expr import MicroPrice
+from my_scalping_kabu_station_example.domain.decision.signal import (
+    InferenceResult,
+    OrderSide,
+    TradeIntent,
+)
+from my_scalping_kabu_station_example.domain.features.expr import (
+    MicroPrice,
+    TimeDecayEma,
+)
 from my_scalping_kabu_station_example.domain.features.spec import (
     FeatureDef,
     FeatureSpec,
 )
+from my_scalping_kabu_station_example.infrastructure.api.broker_client import (
+    KabuOrderPort,
+)
+from my_scalping_kabu_station_example.infrastructure.api.order_gateway import (
+    AsyncOrderGateway,
+)
 from my_scalping_kabu_station_example.infrastructure.compute.feature_engine_pandas import (
     PandasOrderBookFeatureEngine,
 )
+from my_scalping_kabu_station_example.infrastructure.memory.metrics import (
+    InMemoryMetrics,
+)
 from my_scalping_kabu_station_example.infrastructure.memory.order_port import (
     InMemoryOrderPort,
 )
@@ -35,6 +53,9 @@ from my_scalping_kabu_station_example.infrastructure.ml.xgb_predictor import (
 from my_scalping_kabu_station_example.infrastructure.persistence.csv_history_store import (
     CsvHistoryStore,
 )
+from my_scalping_kabu_station_example.infrastructure.persistence.model_store_memory import (
+    InMemoryModelStore,
+)
 from my_scalping_kabu_station_example.infrastructure.persistence.model_store_fs import (
     ModelStoreFs,
     SymbolModelStore,
@@ -56,6 +77,65 @@ def _ws_message(ts: datetime, symbol: str, bid: float, ask: float) -> str:
     )
 
 
+class _CountingPredictor:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def predict(self, features: dict[str, float]) -> InferenceResult:
+        self.calls += 1
+        return InferenceResult(features=features, score=0.0)
+
+
+def test_unchanged_book_short_circuits_features_and_prediction(tmp_path) -> None:
+    ts = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    books = [(100.0, 100.5)] * 4 + [(100.1, 100.5)] + [(100.1, 100.5)] * 3
+    messages = [
+        _ws_message(ts + timedelta(seconds=i), "TEST", bid, ask)
+        for i, (bid, ask) in enumerate(books)
+    ]
+    market_data = WebSocketMarketDataSource(
+        client=MockWebSocketClient(messages=messages)
+    )
+    market_data.subscribe()
+    model_store = InMemoryModelStore()
+    predictor = _CountingPredictor()
+    model_store.swap_active(predictor)
+    metrics = InMemoryMetrics()
+    micro = MicroPrice(eps=1e-9)
+    pipeline = InferencePipeline(
+        market_data=market_data,
+        history_store=CsvHistoryStore(path=tmp_path / "history.csv"),
+        buffer=InMemoryMarketBuffer(),
+        feature_engine=PandasOrderBookFeatureEngine(),
+        model_store=model_store,
+        order_port=InMemoryOrderPort(),
+        position_port=InMemoryPositionPort(position=0.0),
+        feature_spec=FeatureSpec.from_features(
+            version="v1",
+            eps=1e-9,
+            params={},
+            features=[
+                FeatureDef(name="microprice", expr=micro),
+                FeatureDef(name="micro_ema", expr=TimeDecayEma(micro, 5.0)),
+            ],
+        ),
+        decision_policy=DecisionPolicy(score_threshold=0.5, lot_size=1.0),
+        risk_params=RiskParams(max_position=1.0, stop_loss=1.0, take_profit=1.0),
+        metrics=metrics,
+    )
+    state = StreamState()
+
+    for _ in books:
+        pipeline.run_once(state)
+
+    # Ticks 3-4 and 7-8 follow two equal books; the EMA keeps decaying after the
+    # change, so only the converged first run can reuse the prediction.
+    assert metrics.counters["inference.book_unchanged"] == 4
+    assert metrics.counters["inference.prediction_reused"] == 2
+    assert predictor.calls == len(books) - 2
+    assert state.memo.features["micro_ema"] < state.memo.features["microprice"]
+
+
 def test_inference_pipeline_runs_full_flow(tmp_path) -> None:
     ts = datetime(2024, 1, 1, tzinfo=timezone.utc)
     messages = [_ws_message(ts, "TEST", 100.0, 100.5)]
@@ -248,3 +328,102 @@ def test_inference_pipeline_uses_symbol_specific_model(tmp_path) -> None:
 
     assert len(order_port.intents) == 1
     assert order_port.intents[0].symbol == "AAA"
+
+
+class _AlwaysTradePolicy:
+    def __init__(self) -> None:
+        self.intents = 0
+
+    def _intent(self, context) -> TradeIntent:
+        self.intents += 1
+        return TradeIntent(
+            intent_id=f"i{self.intents}",
+            side=OrderSide.BUY,
+            quantity=1.0,
+            symbol=context.symbol,
+            price=context.price,
+            cash_margin=2,
+        )
+
+    def decide(self, inference, context, risk):
+        return self._intent(context)
+
+    def exit_intent(self, context, risk):
+        return self._intent(context)
+
+
+class _UnansweredBrokerClient:
+    def __init__(self) -> None:
+        self.release = threading.Event()
+
+    def place_order(self, data, api_key=None):
+        self.release.wait(2.0)
+        return {"OrderId": "broker-1"}
+
+
+def test_in_flight_limit_skips_orders_without_stopping_the_loop(tmp_path) -> None:
+    ts = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    ticks = 3
+    messages = [
+        _ws_message(ts + timedelta(seconds=i), "TEST", 100.0 + 0.1 * i, 100.5)
+        for i in range(ticks)
+    ]
+    market_data = WebSocketMarketDataSource(
+        client=MockWebSocketClient(messages=messages)
+    )
+    market_data.subscribe()
+    model_store = InMemoryModelStore()
+    model_store.swap_active(_CountingPredictor())
+    policy = _AlwaysTradePolicy()
+    metrics = InMemoryMetrics()
+    order_store = InMemoryOrderStore()
+    client = _UnansweredBrokerClient()
+    gateway = AsyncOrderGateway(
+        order_port=KabuOrderPort(
+            client=client,
+            api_key="k",
+            base_payload={
+                "Exchange": 1,
+                "SecurityType": 1,
+                "MarginTradeType": 3,
+                "DelivType": 0,
+                "AccountType": 2,
+                "ExpireDay": 0,
+                "FrontOrderType": 10,
+            },
+        ),
+        order_store=order_store,
+        metrics=metrics,
+    )
+    pipeline = InferencePipeline(
+        market_data=market_data,
+        history_store=CsvHistoryStore(path=tmp_path / "history.csv"),
+        buffer=InMemoryMarketBuffer(),
+        feature_engine=PandasOrderBookFeatureEngine(),
+        model_store=model_store,
+        order_port=gateway,
+        position_port=InMemoryPositionPort(position=0.0),
+        feature_spec=FeatureSpec.from_features(
+            version="v1",
+            eps=1e-9,
+            params={},
+            features=[FeatureDef(name="microprice", expr=MicroPrice(eps=1e-9))],
+        ),
+        decision_policy=policy,
+        risk_params=RiskParams(max_position=1.0, stop_loss=1.0, take_profit=1.0),
+        order_state=order_store,
+        metrics=metrics,
+    )
+    state = StreamState()
+
+    for _ in range(ticks):
+        pipeline.run_once(state)
+    client.release.set()
+    gateway.flush()
+    gateway.close()
+
+    [order] = order_store.list()
+    assert order.intent_id == "i1"
+    # Every intent after the entry hit the limit of one in-flight order.
+    assert policy.intents == ticks
+    assert metrics.counters["orders.in_flight_limited"] == ticks - 1
@@ -0,0 +1,34 @@
+import math
+
+import numpy as np
+import pytest
+
+from my_scalping_kabu_station_example.application.service.labeling import (
+    LabelSpec,
+    compute_labels,
+)
+
+
+def test_compute_labels_multiple_horizons_and_kinds() -> None:
+    ts_ns = np.array([0, 1, 2, 5, 6], dtype=np.int64) * 1_000_000_000
+    mids = np.array([100.0, 101.0, 100.0, 99.8, 99.5])
+    updown = LabelSpec(horizon_seconds=1.0)
+    ternary = LabelSpec(horizon_seconds=3.0, kind="ternary", dead_band=0.005)
+    forward = LabelSpec(horizon_seconds=3.0, kind="return")
+
+    columns = compute_labels(ts_ns, mids, [updown, ternary, forward])
+
+    assert columns[updown.column][:4].tolist() == [1.0, 0.0, 0.0, 0.0]
+    assert math.isnan(columns[updown.column][4])
+    assert columns[ternary.column][:3].tolist() == [0.0, -1.0, 0.0]
+    assert columns[forward.column][0] == pytest.approx(99.8 / 100.0 - 1.0)
+    assert np.isnan(columns[forward.column][3:]).all()
+
+
+def test_missing_mid_yields_nan_label() -> None:
+    ts_ns = np.array([0, 10, 20], dtype=np.int64) * 1_000_000_000
+    mids = np.array([100.0, np.nan, 101.0])
+
+    labels = compute_labels(ts_ns, mids, [LabelSpec(horizon_seconds=5.0)])
+
+    assert np.isnan(list(labels.values())[0][:2]).all()
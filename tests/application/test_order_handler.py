@@ -7,6 +7,9 @@ from my_scalping_kabu_station_example.domain.order.realtime_order import RealTim
 from my_scalping_kabu_station_example.infrastructure.memory.order_store import (
     InMemoryOrderStore,
 )
+from my_scalping_kabu_station_example.infrastructure.memory.position_ledger import (
+    PositionLedger,
+)
 
 
 class DummyBrokerClient:
@@ -63,3 +66,33 @@ def test_order_handler_removes_repayment_orders() -> None:
     handler.refresh()
 
     assert store.list() == []
+
+
+def test_order_handler_feeds_partial_and_full_fills_to_ledger() -> None:
+    store = InMemoryOrderStore()
+    store.add(
+        RealTimeOrder(
+            symbol=Symbol("TEST"),
+            qty=200,
+            side=OrderSide.BUY,
+            cash_margin=2,
+            order_id="o3",
+            price=100.0,
+        )
+    )
+    broker = DummyBrokerClient({"o3": [{"ID": "o3", "OrderQty": 200, "CumQty": 100}]})
+    ledger = PositionLedger()
+    handler = OrderHandler(
+        order_store=store, broker_client=broker, api_key="k", position_ledger=ledger
+    )
+
+    handler.refresh()
+    handler.refresh()
+    assert ledger.current_position(Symbol("TEST")) == 1.0
+
+    broker.responses["o3"] = [{"ID": "o3", "OrderQty": 200, "CumQty": 200}]
+    handler.refresh()
+    handler.refresh()
+
+    assert ledger.current_position(Symbol("TEST")) == 2.0
+    assert broker.calls == ["o3"] * 3
@@ -0,0 +1,56 @@
+import math
+import random
+
+import pytest
+
+from my_scalping_kabu_station_example.domain.features.expr import Const, RollingSum
+from my_scalping_kabu_station_example.domain.features.rolling import (
+    RollingAccumulator,
+)
+
+
+def _naive(op: str, window: list[float]) -> float:
+    if op == "sum":
+        return sum(window)
+    if not window:
+        return math.nan
+    mean = sum(window) / len(window)
+    if op == "mean":
+        return mean
+    if op == "std":
+        return math.sqrt(sum((v - mean) ** 2 for v in window) / len(window))
+    return min(window) if op == "min" else max(window)
+
+
+@pytest.mark.parametrize("op", ["sum", "mean", "std", "min", "max"])
+def test_accumulator_matches_naive_tick_and_time_windows(op: str) -> None:
+    rng = random.Random(7)
+    samples = []
+    ts_ns = 0
+    for _ in range(300):
+        ts_ns += rng.randint(1, 3) * 100_000_000
+        value = math.nan if rng.random() < 0.05 else rng.uniform(-5, 5)
+        samples.append((ts_ns, value))
+    by_ticks = RollingAccumulator(op, ticks=7, window_ns=None)
+    by_time = RollingAccumulator(op, ticks=None, window_ns=1_000_000_000)
+
+    for i, (ts_ns, value) in enumerate(samples):
+        last_ticks = [v for _, v in samples[max(0, i - 6) : i + 1] if not math.isnan(v)]
+        last_second = [
+            v
+            for t, v in samples[: i + 1]
+            if t > ts_ns - 1_000_000_000 and not math.isnan(v)
+        ]
+        assert by_ticks.push(value, ts_ns) == pytest.approx(
+            _naive(op, last_ticks), abs=1e-9, nan_ok=True
+        )
+        assert by_time.push(value, ts_ns) == pytest.approx(
+            _naive(op, last_second), abs=1e-9, nan_ok=True
+        )
+
+
+def test_rolling_window_requires_exactly_one_window() -> None:
+    with pytest.raises(ValueError):
+        RollingSum(Const(1.0))
+    with pytest.raises(ValueError):
+        RollingSum(Const(1.0), ticks=3, seconds=1.0)
@@ -55,3 +55,117 @@ def test_csv_history_store_filters_by_time(tmp_path) -> None:
 
     assert len(loaded) == 1
     assert loaded[0].best_bid_price == snap0.best_bid_price
+
+
+def test_delta_mode_round_trips_and_shrinks_rows(tmp_path) -> None:
+    full = CsvHistoryStore(path=tmp_path / "full")
+    delta = CsvHistoryStore(path=tmp_path / "delta", write_mode="delta")
+    ts0 = datetime(2024, 1, 1, 9, 0, 0, tzinfo=timezone.utc)
+    snapshots = [
+        _make_snapshot(ts0, bid_price="100.0", ask_price="100.5"),
+        _make_snapshot(ts0 + timedelta(seconds=1), "100.0", "100.5"),
+        _make_snapshot(ts0 + timedelta(seconds=2), "100.1", "100.5"),
+        OrderBookSnapshot(
+            ts=Timestamp(ts0 + timedelta(seconds=3)),
+            symbol=Symbol("TEST"),
+            bid_levels=[],
+            ask_levels=[Level(price_key_from("100.5"), Quantity(2.0))],
+        ),
+    ]
+    for snapshot in snapshots:
+        full.append(snapshot)
+        delta.append(snapshot)
+
+    end = ts0 + timedelta(seconds=3)
+    decoded = list(delta.read_range(ts0 + timedelta(seconds=1), end))
+
+    assert [snap.ts for snap in decoded] == [snap.ts for snap in snapshots[1:]]
+    assert [snap.bid_levels for snap in decoded] == [
+        snap.bid_levels for snap in snapshots[1:]
+    ]
+    assert decoded[-1].bid_levels == []
+    assert decoded[-1].ask_levels == snapshots[-1].ask_levels
+    rows = (tmp_path / "delta" / "history_20240101_09.csv").read_text().splitlines()
+    assert [row.split(",")[2] for row in rows[1:]] == ["K", "=", "D", "D"]
+    full_size = (tmp_path / "full" / "history_20240101_09.csv").stat().st_size
+    assert len("\n".join(rows)) < full_size
+
+
+def test_index_blocks_restart_keyframes_and_bound_range_reads(tmp_path) -> None:
+    store = CsvHistoryStore(path=tmp_path, write_mode="delta", index_block_rows=4)
+    ts0 = datetime(2024, 1, 1, 9, 0, 0, tzinfo=timezone.utc)
+    for i in range(10):
+        store.append(
+            _make_snapshot(ts0 + timedelta(seconds=i), f"100.{i % 2}", "100.5")
+        )
+
+    data_path = tmp_path / "history_20240101_09.csv"
+    kinds = [row.split(",")[2] for row in data_path.read_text().splitlines()[1:]]
+    assert kinds[0] == kinds[4] == kinds[8] == "K"
+    index_rows = (tmp_path / "history_20240101_09.csv.idx").read_text().splitlines()
+    assert len(index_rows) == 3  # header + two closed blocks; the tail is open
+
+    reopened = CsvHistoryStore(path=tmp_path)
+    window = list(
+        reopened.read_range(ts0 + timedelta(seconds=5), ts0 + timedelta(seconds=9))
+    )
+    assert [snap.ts for snap in window] == [
+        ts0 + timedelta(seconds=i) for i in range(5, 10)
+    ]
+    assert [str(snap.best_bid_price) for snap in window] == [
+        "100.1",
+        "100.0",
+        "100.1",
+        "100.0",
+        "100.1",
+    ]
+
+
+def test_rows_store_epoch_ns_and_legacy_iso_rows_still_read(tmp_path) -> None:
+    store = CsvHistoryStore(path=tmp_path)
+    ts0 = datetime(2024, 1, 1, 9, 0, 0, tzinfo=timezone.utc)
+    store.append(_make_snapshot(ts0, bid_price="100.0", ask_price="100.5"))
+    data_path = tmp_path / "history_20240101_09.csv"
+    lines = data_path.read_text().splitlines()
+    assert lines[1].split(",")[0] == "1704099600000000000"
+
+    legacy = lines[1].replace(
+        "1704099600000000000", (ts0 + timedelta(seconds=1)).isoformat()
+    )
+    data_path.write_text("\n".join([lines[0], lines[1], legacy]) + "\n")
+    loaded = list(
+        CsvHistoryStore(path=tmp_path).read_range(ts0, ts0 + timedelta(seconds=1))
+    )
+
+    assert [snap.ts_ns for snap in loaded] == [
+        1704099600000000000,
+        1704099601000000000,
+    ]
+
+
+def test_symbols_and_symbol_reads_use_index_blocks(tmp_path) -> None:
+    store = CsvHistoryStore(path=tmp_path, write_mode="delta", index_block_rows=4)
+    ts0 = datetime(2024, 1, 1, 9, 0, 0, tzinfo=timezone.utc)
+    symbols = ["AAA"] * 6 + ["BBB", "AAA", "AAA", "CCC"]
+    for i, symbol in enumerate(symbols):
+        snapshot = _make_snapshot(ts0 + timedelta(seconds=i), f"100.{i}", "101.0")
+        store.append(
+            OrderBookSnapshot(
+                ts=snapshot.ts,
+                symbol=Symbol(symbol),
+                bid_levels=snapshot.bid_levels,
+                ask_levels=snapshot.ask_levels,
+            )
+        )
+
+    reopened = CsvHistoryStore(path=tmp_path)
+    hour = (ts0, ts0 + timedelta(hours=1) - timedelta(microseconds=1))
+    assert reopened.symbols_in_range(*hour) == ["AAA", "BBB", "CCC"]
+    assert reopened.symbols_in_range(ts0, ts0 + timedelta(seconds=5)) == ["AAA"]
+    assert reopened.symbols_in_range(
+        ts0 + timedelta(seconds=6), ts0 + timedelta(seconds=8)
+    ) == ["AAA", "BBB"]
+    aaa = list(reopened.iter_range(*hour, symbol="AAA"))
+    assert [str(snap.best_bid_price) for snap in aaa] == [
+        f"100.{i}" for i, symbol in enumerate(symbols) if symbol == "AAA"
+    ]
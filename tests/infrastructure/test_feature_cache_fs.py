@@ -0,0 +1,84 @@
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+from my_scalping_kabu_station_example.application.service.dataset import DatasetBuilder
+from my_scalping_kabu_station_example.application.service.labeling import LabelSpec
+from my_scalping_kabu_station_example.domain.features.expr import MicroPrice, Mid
+from my_scalping_kabu_station_example.domain.features.spec import (
+    FeatureDef,
+    FeatureSpec,
+)
+from my_scalping_kabu_station_example.domain.market.level import Level
+from my_scalping_kabu_station_example.domain.market.orderbook_snapshot import (
+    OrderBookSnapshot,
+)
+from my_scalping_kabu_station_example.domain.market.time import Timestamp
+from my_scalping_kabu_station_example.domain.market.types import (
+    Quantity,
+    Symbol,
+    price_key_from,
+)
+from my_scalping_kabu_station_example.infrastructure.compute.feature_engine_pandas import (
+    PandasOrderBookFeatureEngine,
+)
+from my_scalping_kabu_station_example.infrastructure.persistence.csv_history_store import (
+    CsvHistoryStore,
+)
+from my_scalping_kabu_station_example.infrastructure.persistence.feature_cache_fs import (
+    FeatureCacheFs,
+)
+
+
+class _CountingEngine(PandasOrderBookFeatureEngine):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def compute_matrix(self, spec, snapshots, out=None):
+        self.calls += 1
+        return super().compute_matrix(spec, snapshots, out)
+
+
+def _make_snapshot(ts: datetime, bid: float) -> OrderBookSnapshot:
+    return OrderBookSnapshot(
+        ts=Timestamp(ts),
+        symbol=Symbol("AAA"),
+        bid_levels=[Level(price_key_from(bid), Quantity(1.0))],
+        ask_levels=[Level(price_key_from(bid + 0.5), Quantity(2.0))],
+    )
+
+
+def _spec(version: str, expr) -> FeatureSpec:
+    return FeatureSpec.from_features(
+        version=version, eps=1e-9, params={}, features=[FeatureDef("f", expr)]
+    )
+
+
+def test_builder_reuses_cached_days_until_spec_or_history_changes(tmp_path) -> None:
+    store = CsvHistoryStore(path=tmp_path / "history")
+    ts0 = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    for i in range(10):
+        store.append(_make_snapshot(ts0 + timedelta(seconds=i), 100.0 + (i % 3)))
+    engine = _CountingEngine()
+    cache = FeatureCacheFs(base_dir=tmp_path / "cache")
+    builder = DatasetBuilder(store, engine, feature_cache=cache)
+    spec = _spec("v1", MicroPrice(eps=1e-9))
+    day = date(2024, 1, 1)
+
+    first = builder.build_day_columns(spec, "AAA", day, [LabelSpec(1.0)])
+    second = builder.build_day_columns(
+        spec, "AAA", day, [LabelSpec(2.0, kind="return")]
+    )
+
+    assert engine.calls == 1
+    assert isinstance(second.features, np.memmap)
+    np.testing.assert_array_equal(first.features, second.features)
+    assert np.isnan(second.label_columns["label_return_2s"][-2:]).all()
+
+    builder.build_day_columns(_spec("v1", Mid()), "AAA", day, [LabelSpec(1.0)])
+    assert engine.calls == 2
+
+    store.append(_make_snapshot(ts0 + timedelta(seconds=30), 105.0))
+    refreshed = builder.build_day_columns(spec, "AAA", day, [LabelSpec(1.0)])
+    assert engine.calls == 3
+    assert len(refreshed) == 11
@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from my_scalping_kabu_station_example.domain.features import names
+from my_scalping_kabu_station_example.domain.features.expr import (
+    Add,
+    AddSum,
+    Const,
+    DepletionSum,
+    DepthQtySum,
+    Div,
+    MicroPrice,
+    Mid,
+    RollingStd,
+    RollingSum,
+    Sub,
+    TimeDecayEma,
+)
+from my_scalping_kabu_station_example.domain.features.spec import (
+    FeatureDef,
+    FeatureSpec,
+)
+from my_scalping_kabu_station_example.domain.market.level import Level
+from my_scalping_kabu_station_example.domain.market.orderbook_snapshot import (
+    OrderBookSnapshot,
+)
+from my_scalping_kabu_station_example.domain.market.time import Timestamp
+from my_scalping_kabu_station_example.domain.market.types import (
+    Quantity,
+    Side,
+    Symbol,
+    price_key_from,
+)
+from my_scalping_kabu_station_example.infrastructure.compute.feature_engine_codegen import (
+    CodegenOrderBookFeatureEngine,
+)
+from my_scalping_kabu_station_example.infrastructure.compute.feature_engine_pandas import (
+    PandasOrderBookFeatureEngine,
+)
+
+
+def _build_spec() -> FeatureSpec:
+    eps = 1e-9
+    def_b = DepthQtySum(Side.BID, depth=3)
+    def_a = DepthQtySum(Side.ASK, depth=3)
+    di = Div(
+        Sub(DepletionSum(Side.ASK), DepletionSum(Side.BID)),
+        Add(Add(DepletionSum(Side.ASK), DepletionSum(Side.BID)), Const(eps)),
+    )
+    return FeatureSpec.from_features(
+        version="codegen",
+        eps=eps,
+        features=[
+            FeatureDef(
+                names.OBI_5,
+                expr=Div(Sub(def_b, def_a), Add(Add(def_b, def_a), Const(eps))),
+            ),
+            FeatureDef(names.MICROPRICE, expr=MicroPrice(eps=eps)),
+            FeatureDef(names.DEPLETION_IMBALANCE, expr=di),
+            FeatureDef(
+                names.ADD_IMBALANCE, expr=Sub(AddSum(Side.BID), AddSum(Side.ASK))
+            ),
+            FeatureDef(
+                names.DEPLETION_IMBALANCE_EMA,
+                expr=TimeDecayEma(source=di, tau_seconds=0.5),
+            ),
+            FeatureDef("di_sum_4", RollingSum(di, ticks=4)),
+            FeatureDef("mid_std_1s", RollingStd(Mid(), seconds=1.0)),
+        ],
+    )
+
+
+def _snapshots(count: int):
+    ts0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    snapshots = []
+    for i in range(count):
+        bid = 100 + (i * 7 % 5) / 10
+        snapshots.append(
+            OrderBookSnapshot(
+                ts=Timestamp(ts0 + timedelta(milliseconds=170 * i)),
+                symbol=Symbol("TEST"),
+                bid_levels=[
+                    Level(
+                        price_key_from(f"{bid - k / 10:.1f}"),
+                        Quantity(1.0 + (i + k) % 4),
+                    )
+                    for k in range(3)
+                ],
+                ask_levels=[
+                    Level(
+                        price_key_from(f"{bid + 0.5 + k / 10:.1f}"),
+                        Quantity(1.0 + (i * k) % 3),
+                    )
+                    for k in range(3)
+                ],
+            )
+        )
+    return snapshots
+
+
+def test_codegen_engine_matches_pandas_engine() -> None:
+    spec = _build_spec()
+    snapshots = _snapshots(40)
+    codegen = CodegenOrderBookFeatureEngine()
+    pandas_engine = PandasOrderBookFeatureEngine()
+
+    assert list(codegen.compute_batch(spec, snapshots)) == list(
+        pandas_engine.compute_batch(spec, snapshots)
+    )
+    assert np.array_equal(
+        codegen.compute_matrix(spec, snapshots),
+        pandas_engine.compute_matrix(spec, snapshots),
+        equal_nan=True,
+    )
+
+
+def test_codegen_engine_caches_and_dumps_generated_source(tmp_path) -> None:
+    spec = _build_spec()
+    engine = CodegenOrderBookFeatureEngine(dump_dir=tmp_path)
+
+    compiled = engine.compiled(spec)
+
+    assert engine.compiled(_build_spec()) is compiled
+    dumped = list(tmp_path.iterdir())
+    assert len(dumped) == 1
+    assert dumped[0].read_text() == engine.source(spec)
+    assert "def compute_features" in compiled.source
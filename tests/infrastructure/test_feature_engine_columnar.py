@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from my_scalping_kabu_station_example.domain.features.expr import (
+    Add,
+    AddSum,
+    Const,
+    DepletionSum,
+    DepthQtySum,
+    Div,
+    MicroPrice,
+    Mid,
+    RollingMin,
+    Sub,
+    TimeDecayEma,
+)
+from my_scalping_kabu_station_example.domain.features.spec import (
+    FeatureDef,
+    FeatureSpec,
+)
+from my_scalping_kabu_station_example.domain.market.level import Level
+from my_scalping_kabu_station_example.domain.market.orderbook_snapshot import (
+    OrderBookSnapshot,
+)
+from my_scalping_kabu_station_example.domain.market.time import Timestamp
+from my_scalping_kabu_station_example.domain.market.types import (
+    Quantity,
+    Side,
+    Symbol,
+    price_key_from,
+)
+from my_scalping_kabu_station_example.infrastructure.compute import kernels
+from my_scalping_kabu_station_example.infrastructure.compute.feature_engine_columnar import (
+    ColumnarOrderBookFeatureEngine,
+)
+from my_scalping_kabu_station_example.infrastructure.compute.feature_engine_pandas import (
+    PandasOrderBookFeatureEngine,
+)
+
+
+def _snapshots(count: int):
+    ts0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    snapshots = []
+    for i in range(count):
+        bid = 100 + (i * 3 % 7) / 10
+        snapshots.append(
+            OrderBookSnapshot(
+                ts=Timestamp(ts0 + timedelta(milliseconds=90 * i + (i % 3) * 20)),
+                symbol=Symbol("TEST"),
+                bid_levels=[
+                    Level(
+                        price_key_from(f"{bid - k / 10:.1f}"),
+                        Quantity(1.0 + (i + k) % 5),
+                    )
+                    for k in range(10)
+                ],
+                ask_levels=[
+                    Level(
+                        price_key_from(f"{bid + 0.5 + k / 10:.1f}"),
+                        Quantity(1.0 + (i * k) % 4),
+                    )
+                    for k in range(i % 10 + 1)
+                ],
+            )
+        )
+    return snapshots
+
+
+def test_columnar_matrix_matches_pandas_engine() -> None:
+    eps = 1e-9
+    di = Div(
+        Sub(DepletionSum(Side.ASK), DepletionSum(Side.BID)),
+        Add(Add(DepletionSum(Side.ASK), DepletionSum(Side.BID)), Const(eps)),
+    )
+    spec = FeatureSpec.from_features(
+        version="columnar",
+        eps=eps,
+        features=[
+            FeatureDef(
+                "obi_5",
+                Div(
+                    Sub(DepthQtySum(Side.BID, 5), DepthQtySum(Side.ASK, 5)),
+                    Add(DepthQtySum(Side.BID, 5), DepthQtySum(Side.ASK, 5)),
+                ),
+            ),
+            FeatureDef("micro_shift", Sub(MicroPrice(eps=eps), Mid())),
+            FeatureDef("di", di),
+            FeatureDef("ai", Sub(AddSum(Side.BID), AddSum(Side.ASK))),
+            FeatureDef("di_ema", TimeDecayEma(source=di, tau_seconds=0.3)),
+            FeatureDef("mid_min_1s", RollingMin(Mid(), seconds=1.0)),
+        ],
+    )
+    snapshots = _snapshots(60)
+
+    expected = PandasOrderBookFeatureEngine().compute_matrix(spec, snapshots)
+    actual = ColumnarOrderBookFeatureEngine().compute_matrix(spec, snapshots)
+
+    np.testing.assert_allclose(actual, expected, rtol=1e-6)
+
+
+def test_delta_sum_kernel_agrees_with_numpy_fallback() -> None:
+    rng = np.random.default_rng(7)
+    prices = np.array([rng.permutation(20)[:10].astype(np.float64) for _ in range(200)])
+    prices[rng.random(prices.shape) < 0.2] = np.nan
+    qty = rng.integers(0, 6, prices.shape).astype(np.float64)
+    prev_px, prev_qty = np.roll(prices, 1, axis=0), np.roll(qty, 1, axis=0)
+
+    loop = kernels._delta_sums_loop(prev_px, prev_qty, prices, qty)
+    vectorized = kernels._delta_sums_numpy(prev_px, prev_qty, prices, qty)
+
+    np.testing.assert_allclose(loop, vectorized)
@@ -19,6 +19,9 @@ from my_scalping_kabu_station_example.domain.features.expr import (
     Div,
     MicroPrice,
     Mid,
+    RollingMax,
+    RollingStd,
+    RollingSum,
     Sub,
     TimeDecayEma,
 )
@@ -162,3 +165,35 @@ def test_compute_one_exposes_best_levels_and_mid() -> None:
     expected_micro = (100.5 * 2.0 + 100.0 * 1.0) / (2.0 + 1.0 + 1e-9)
     assert features[names.MICROPRICE_SHIFT] == pytest.approx(expected_micro - 100.25)
     assert state.last_ts == snapshot.ts
+
+
+def test_rolling_features_agree_between_streaming_and_batch() -> None:
+    engine = PandasOrderBookFeatureEngine()
+    ts0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    snapshots = [
+        _make_snapshot(
+            ts0 + timedelta(milliseconds=300 * i),
+            bids=[(f"{100 + (i % 5) / 10:.1f}", 1.0 + i % 3)],
+            asks=[("101.0", 2.0)],
+        )
+        for i in range(20)
+    ]
+    depletion = Sub(DepletionSum(Side.ASK), DepletionSum(Side.BID))
+    spec = FeatureSpec.from_features(
+        version="rolling",
+        eps=1e-9,
+        features=[
+            FeatureDef("ofi_sum_5", RollingSum(depletion, ticks=5)),
+            FeatureDef("mid_std_1s", RollingStd(Mid(), seconds=1.0)),
+            FeatureDef("bid_max_1s", RollingMax(BestBidPrice(), seconds=1.0)),
+        ],
+    )
+
+    streamed = list(engine.compute_batch(spec, snapshots))
+    matrix = engine.compute_matrix(spec, snapshots)
+
+    for row, features in enumerate(streamed):
+        assert list(matrix[row]) == pytest.approx(
+            [features[f.name] for f in spec.features], rel=1e-6
+        )
+    assert streamed[-1]["bid_max_1s"] == pytest.approx(100.4)
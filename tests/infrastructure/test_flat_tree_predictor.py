@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from my_scalping_kabu_station_example.domain.features.expr import Const
+from my_scalping_kabu_station_example.domain.features.spec import (
+    FeatureDef,
+    FeatureSpec,
+)
+from my_scalping_kabu_station_example.infrastructure.ml.flat_tree_predictor import (
+    FlatTreePredictor,
+    compile_predictor,
+)
+from my_scalping_kabu_station_example.infrastructure.ml.xgb_trainer import XgbTrainer
+
+
+def _spec() -> FeatureSpec:
+    return FeatureSpec.from_features(
+        version="v1",
+        eps=1e-9,
+        params={},
+        features=[
+            FeatureDef("a", Const(1.0)),
+            FeatureDef("b", Const(2.0)),
+            FeatureDef("c", Const(3.0)),
+        ],
+    )
+
+
+def test_compiled_predictor_matches_predict_proba() -> None:
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(400, 3))
+    labels = (data[:, 0] - 0.5 * data[:, 2] + 0.3 * rng.normal(size=400)) > 0
+    dataset = [
+        {"a": row[0], "b": row[1], "c": row[2], "label": float(label)}
+        for row, label in zip(data, labels)
+    ]
+    predictor = XgbTrainer().train(_spec(), dataset)
+
+    compiled = compile_predictor(predictor)
+
+    probe = rng.normal(size=(200, 3))
+    probe[::7, 1] = np.nan
+    expected = predictor.model.predict_proba(probe)[:, 1]
+    assert compiled.predict_batch(probe) == pytest.approx(expected, abs=1e-6)
+    row = {"a": 0.2, "b": -0.1, "c": 0.4}
+    assert compiled.predict(row).score == pytest.approx(
+        predictor.predict(row).score, abs=1e-6
+    )
+
+
+def test_trainer_returns_flat_predictor_when_compiling() -> None:
+    dataset = [
+        {"a": 0.1, "b": 0.2, "c": 0.0, "label": 0},
+        {"a": 0.2, "b": 0.4, "c": 0.0, "label": 1},
+        {"a": 0.3, "b": 0.1, "c": 0.0, "label": 1},
+    ]
+
+    predictor = XgbTrainer(
+        params={"n_estimators": 5, "max_depth": 2}, compile_trees=True
+    ).train(_spec(), dataset)
+
+    assert isinstance(predictor, FlatTreePredictor)
+    assert predictor.ensemble is not None
+    assert 0.0 <= predictor.predict({"a": 0.15}).score <= 1.0
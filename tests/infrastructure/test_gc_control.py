@@ -0,0 +1,65 @@
+import gc
+
+from my_scalping_kabu_station_example.infrastructure.main.gc_control import (
+    GC_MODE_MANUAL,
+    GcController,
+)
+from my_scalping_kabu_station_example.infrastructure.memory.metrics import (
+    InMemoryMetrics,
+)
+
+
+class _Cycle:
+    def __init__(self) -> None:
+        self.self_ref = self
+
+
+def test_manual_mode_collects_only_at_safe_points_and_restores() -> None:
+    was_enabled = gc.isenabled()
+    thresholds = gc.get_threshold()
+    metrics = InMemoryMetrics()
+    controller = GcController(
+        mode=GC_MODE_MANUAL,
+        young_threshold=1_000,
+        full_interval_seconds=3600.0,
+        metrics=metrics,
+        publish_interval_seconds=0.0,
+    )
+
+    controller.start()
+    try:
+        assert gc.isenabled() is False
+        assert gc.get_freeze_count() > 0
+        cycles = [_Cycle() for _ in range(5_000)]
+        del cycles
+        assert controller.stats.collections.get(1, 0) == 0
+
+        controller.safe_point()
+
+        assert controller.stats.collections[1] == 1
+        assert metrics.counters["gc.collections.gen1"] == 1
+        assert len(metrics.timings["gc.max_pause_ms.gen1"]) == 1
+    finally:
+        controller.stop()
+
+    assert gc.isenabled() is was_enabled
+    assert gc.get_threshold() == thresholds
+    assert gc.get_freeze_count() == 0
+
+
+def test_collections_are_published_in_batches_not_per_collection() -> None:
+    metrics = InMemoryMetrics()
+    controller = GcController(metrics=metrics, publish_interval_seconds=3600.0)
+
+    controller.start()
+    try:
+        for _ in range(5):
+            gc.collect(0)
+        controller.safe_point()
+        assert metrics.timings == {}
+        assert controller.stats.collections[0] >= 5
+    finally:
+        controller.stop()
+
+    assert metrics.counters["gc.collections.gen0"] >= 5
+    assert len(metrics.timings["gc.max_pause_ms.gen0"]) == 1
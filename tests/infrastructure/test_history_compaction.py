@@ -0,0 +1,60 @@
+from datetime import date, datetime, timedelta, timezone
+
+from my_scalping_kabu_station_example.domain.market.level import Level
+from my_scalping_kabu_station_example.domain.market.orderbook_snapshot import (
+    OrderBookSnapshot,
+)
+from my_scalping_kabu_station_example.domain.market.time import Timestamp
+from my_scalping_kabu_station_example.domain.market.types import (
+    Quantity,
+    Symbol,
+    price_key_from,
+)
+from my_scalping_kabu_station_example.infrastructure.persistence.csv_history_store import (
+    CsvHistoryStore,
+)
+from my_scalping_kabu_station_example.infrastructure.persistence.history_compaction import (
+    compact_finished_days,
+)
+
+
+def _snapshot(ts: datetime, symbol: str, bid: float) -> OrderBookSnapshot:
+    return OrderBookSnapshot(
+        ts=Timestamp(ts),
+        symbol=Symbol(symbol),
+        bid_levels=[Level(price_key_from(bid), Quantity(1.0))],
+        ask_levels=[Level(price_key_from(bid + 0.5), Quantity(2.0))],
+    )
+
+
+def test_compacted_day_reads_alongside_hot_hourly_files(tmp_path) -> None:
+    store = CsvHistoryStore(path=tmp_path, write_mode="delta", keyframe_interval=3)
+    start = datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)
+    written = []
+    for i in range(12):
+        for symbol in ("BBB", "AAA"):
+            snapshot = _snapshot(start + timedelta(minutes=15 * i), symbol, 100 + i % 4)
+            store.append(snapshot)
+            written.append(snapshot)
+    hot = _snapshot(datetime(2024, 1, 2, 1, 0, tzinfo=timezone.utc), "AAA", 99.0)
+    store.append(hot)
+    everything = (start, hot.ts)
+    before = [(s.ts, s.symbol, s.best_bid_price) for s in store.iter_range(*everything)]
+
+    assert compact_finished_days(store, before=date(2024, 1, 2)) == [date(2024, 1, 1)]
+
+    names = sorted(p.name for p in tmp_path.iterdir() if not p.name.startswith("."))
+    assert names == [
+        "history_20240101.csv.gz",
+        "history_20240102_01.csv",
+        "manifest.json",
+    ]
+    fresh = CsvHistoryStore(path=tmp_path)
+    assert fresh.available_dates() == [date(2024, 1, 1), date(2024, 1, 2)]
+    after = [(s.ts, s.symbol, s.best_bid_price) for s in fresh.iter_range(*everything)]
+    assert sorted(after) == sorted(before)
+    only_aaa = list(fresh.iter_range(*everything, symbol="AAA"))
+    assert [s.ts for s in only_aaa] == sorted(
+        [s.ts for s in written if s.symbol == "AAA"] + [hot.ts]
+    )
+    assert fresh.symbols_in_range(start, start + timedelta(hours=1)) == ["AAA", "BBB"]
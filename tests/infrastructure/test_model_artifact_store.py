@@ -0,0 +1,102 @@
+import pytest
+
+from my_scalping_kabu_station_example.domain.features.expr import Const
+from my_scalping_kabu_station_example.domain.features.spec import (
+    FeatureDef,
+    FeatureSpec,
+)
+from my_scalping_kabu_station_example.infrastructure.ml.xgb_predictor import (
+    XgbPredictor,
+)
+from my_scalping_kabu_station_example.infrastructure.ml.xgb_trainer import XgbTrainer
+from my_scalping_kabu_station_example.infrastructure.persistence.model_artifact_store import (
+    ModelArtifactStore,
+    ModelSpecMismatchError,
+    SymbolModelArtifactStore,
+)
+
+
+def _spec(version: str = "v1") -> FeatureSpec:
+    return FeatureSpec.from_features(
+        version=version,
+        eps=1e-9,
+        params={},
+        features=[FeatureDef("a", Const(1.0)), FeatureDef("b", Const(2.0))],
+    )
+
+
+def _dataset():
+    return [
+        {"a": 0.1, "b": 0.2, "label": 0},
+        {"a": 0.2, "b": 0.4, "label": 1},
+        {"a": 0.3, "b": 0.1, "label": 1},
+        {"a": 0.05, "b": 0.3, "label": 0},
+    ]
+
+
+def test_artifact_store_round_trips_booster_with_manifest(tmp_path) -> None:
+    spec = _spec()
+    predictor = XgbTrainer(params={"n_estimators": 5, "max_depth": 2}).train(
+        spec, _dataset()
+    )
+    predictor.metadata["training_start"] = "2024-01-01T00:00:00+00:00"
+    store = ModelArtifactStore(base_dir=tmp_path, spec=spec)
+
+    store.save_candidate(predictor)
+    store.swap_active(predictor)
+
+    loaded = store.load_active()
+    manifest = store.active_manifest()
+    assert len(store.list_artifacts()) == 1
+    assert manifest.spec_hash == spec.fingerprint()
+    assert manifest.feature_order == ["a", "b"]
+    assert manifest.training_start == "2024-01-01T00:00:00+00:00"
+    assert "train_logloss" in manifest.metrics
+    row = {"a": 0.15, "b": 0.25}
+    assert loaded.predict(row).score == pytest.approx(
+        predictor.predict(row).score, abs=1e-6
+    )
+    assert store.load_active() is loaded
+
+
+def test_artifact_store_keeps_last_n_and_follows_pointer(tmp_path) -> None:
+    store = ModelArtifactStore(base_dir=tmp_path, spec=_spec(), keep_last=2)
+
+    for score in (0.1, 0.2, 0.3):
+        store.swap_active(XgbPredictor(feature_order=["a", "b"], default_score=score))
+        assert store.load_active().predict({}).score == score
+
+    assert len(store.list_artifacts()) == 2
+
+
+def test_artifact_store_refuses_spec_mismatch(tmp_path) -> None:
+    ModelArtifactStore(base_dir=tmp_path, spec=_spec("v1")).swap_active(
+        XgbPredictor(feature_order=["a", "b"], default_score=0.5)
+    )
+    store = ModelArtifactStore(base_dir=tmp_path, spec=_spec("v2"))
+
+    with pytest.raises(ModelSpecMismatchError):
+        store.validate_active()
+    with pytest.raises(ModelSpecMismatchError):
+        store.load_active()
+
+
+def test_symbol_store_can_treat_spec_mismatch_as_missing(tmp_path) -> None:
+    SymbolModelArtifactStore(base_dir=tmp_path, spec=_spec("v1")).swap_active_for(
+        "OLD", XgbPredictor(feature_order=["a", "b"], default_score=0.5)
+    )
+    SymbolModelArtifactStore(base_dir=tmp_path, spec=_spec("v2")).swap_active_for(
+        "NEW", XgbPredictor(feature_order=["a", "b"], default_score=0.5)
+    )
+    strict = SymbolModelArtifactStore(base_dir=tmp_path, spec=_spec("v2"))
+    lenient = SymbolModelArtifactStore(
+        base_dir=tmp_path, spec=_spec("v2"), mismatch_as_missing=True
+    )
+
+    with pytest.raises(ModelSpecMismatchError):
+        strict.validate_all()
+    assert list(lenient.validate_all()) == ["NEW"]
+    for _ in range(2):
+        with pytest.raises(FileNotFoundError):
+            lenient.load_active_for("OLD")
+    assert lenient.load_active_for("NEW").predict({}).score == 0.5
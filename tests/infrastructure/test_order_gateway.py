@@ -0,0 +1,159 @@
+import threading
+import time
+
+
+from my_scalping_kabu_station_example.domain.decision.signal import (
+    OrderSide,
+    TradeIntent,
+)
+from my_scalping_kabu_station_example.domain.market.types import Symbol
+from my_scalping_kabu_station_example.domain.order.realtime_order import OrderStatus
+from my_scalping_kabu_station_example.infrastructure.api.broker_client import (
+    KabuOrderPort,
+)
+from my_scalping_kabu_station_example.infrastructure.api.order_gateway import (
+    AsyncOrderGateway,
+)
+from my_scalping_kabu_station_example.infrastructure.memory.order_store import (
+    InMemoryOrderStore,
+)
+
+BASE_PAYLOAD = {
+    "Exchange": 9,
+    "SecurityType": 1,
+    "CashMargin": 2,
+    "MarginTradeType": 3,
+    "DelivType": 0,
+    "AccountType": 2,
+    "Price": 0,
+    "ExpireDay": 0,
+    "FrontOrderType": 10,
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.response = type("Response", (), {"status_code": status_code})()
+
+
+class BlockingBrokerClient:
+    def __init__(self, fail: Exception | None = None) -> None:
+        self.release = threading.Event()
+        self.fail = fail
+        self.payloads = []
+        self.broker_orders = []
+
+    def place_order(self, data, api_key=None):
+        self.release.wait(2.0)
+        self.payloads.append(data)
+        if self.fail is not None:
+            raise self.fail
+        return {"OrderId": "broker-1"}
+
+    def list_symbol_orders(self, api_key, symbol):
+        return [o for o in self.broker_orders if o["Symbol"] == symbol]
+
+
+def _intent(intent_id: str) -> TradeIntent:
+    return TradeIntent(
+        intent_id=intent_id,
+        side=OrderSide.BUY,
+        quantity=1.0,
+        symbol=Symbol("7203"),
+        price=100.0,
+        cash_margin=2,
+    )
+
+
+def _gateway(client: BlockingBrokerClient, store: InMemoryOrderStore, **kwargs):
+    return AsyncOrderGateway(
+        order_port=KabuOrderPort(client=client, api_key="k", base_payload=BASE_PAYLOAD),
+        order_store=store,
+        **kwargs,
+    )
+
+
+def _wait_until(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_place_order_returns_before_ack_and_applies_it_later() -> None:
+    client = BlockingBrokerClient()
+    store = InMemoryOrderStore()
+    gateway = _gateway(client, store)
+
+    order_id = gateway.place_order(_intent("i1"))
+
+    assert order_id == "i1"
+    assert store.list()[0].status is OrderStatus.PENDING
+    assert gateway.place_order(_intent("i2")) is None
+
+    client.release.set()
+    gateway.flush()
+    gateway.close()
+
+    [order] = store.list()
+    assert order.status is OrderStatus.ACKED
+    assert order.order_id == "broker-1"
+    assert len(client.payloads) == 1
+
+
+def test_rejected_order_is_removed_from_store() -> None:
+    client = BlockingBrokerClient(fail=HttpError(400))
+    client.release.set()
+    store = InMemoryOrderStore()
+    gateway = _gateway(client, store)
+
+    gateway.place_order(_intent("i1"))
+    gateway.flush()
+    gateway.close()
+
+    assert store.list() == []
+
+
+def test_timed_out_order_stays_unknown_until_found_at_broker() -> None:
+    client = BlockingBrokerClient(fail=TimeoutError("read timed out"))
+    client.release.set()
+    store = InMemoryOrderStore()
+    gateway = _gateway(client, store, resolve_interval_seconds=0.01)
+
+    gateway.place_order(_intent("i1"))
+    gateway.flush()
+
+    [order] = store.list()
+    assert order.status is OrderStatus.UNKNOWN
+    assert gateway.place_order(_intent("i2")) is None
+
+    payload = client.payloads[0]
+    client.broker_orders.append(
+        {"ID": "broker-9", "Symbol": "7203", "Side": "1", "OrderQty": payload["Qty"]}
+    )
+    client.broker_orders.append(
+        {
+            "ID": "broker-7",
+            "Symbol": "7203",
+            "Side": payload["Side"],
+            "OrderQty": payload["Qty"],
+        }
+    )
+    _wait_until(lambda: store.list()[0].status is OrderStatus.ACKED)
+    gateway.close()
+
+    assert store.list()[0].order_id == "broker-7"
+
+
+def test_unknown_order_missing_at_broker_is_dropped_after_timeout() -> None:
+    client = BlockingBrokerClient(fail=HttpError(503))
+    client.release.set()
+    store = InMemoryOrderStore()
+    gateway = _gateway(
+        client, store, resolve_interval_seconds=0.01, unknown_timeout_seconds=0.05
+    )
+
+    gateway.place_order(_intent("i1"))
+    _wait_until(lambda: store.list() == [])
+    gateway.close()
@@ -0,0 +1,148 @@
+import time
+from datetime import datetime, timezone
+
+from my_scalping_kabu_station_example.domain.decision.signal import OrderSide
+from my_scalping_kabu_station_example.domain.market.types import Symbol
+from my_scalping_kabu_station_example.domain.order.realtime_order import (
+    OrderStatus,
+    RealTimeOrder,
+)
+from my_scalping_kabu_station_example.infrastructure.api.broker_client import (
+    KabuOrderPort,
+)
+from my_scalping_kabu_station_example.infrastructure.api.order_gateway import (
+    AsyncOrderGateway,
+)
+from my_scalping_kabu_station_example.infrastructure.memory.order_store import (
+    InMemoryOrderStore,
+)
+from my_scalping_kabu_station_example.infrastructure.memory.position_ledger import (
+    PositionLedger,
+)
+from my_scalping_kabu_station_example.infrastructure.persistence.order_journal import (
+    JournaledOrderStore,
+    JournaledPositionLedger,
+    OrderJournal,
+)
+
+
+def _pending(intent_id: str, placed_at: float | None = None) -> RealTimeOrder:
+    return RealTimeOrder(
+        symbol=Symbol("7203"),
+        qty=100,
+        side=OrderSide.BUY,
+        cash_margin=2,
+        order_id=intent_id,
+        price=2500.0,
+        status=OrderStatus.PENDING,
+        intent_id=intent_id,
+        placed_at=placed_at,
+    )
+
+
+def _open(directory, snapshot_every: int = 10_000):
+    journal = OrderJournal(directory, snapshot_every=snapshot_every)
+    store = InMemoryOrderStore()
+    ledger = PositionLedger()
+    journal.recover(store, ledger)
+    journal.start()
+    return (
+        journal,
+        JournaledOrderStore(store, journal),
+        JournaledPositionLedger(ledger, journal),
+    )
+
+
+def test_replay_rebuilds_orders_and_positions_across_snapshots(tmp_path) -> None:
+    journal, store, ledger = _open(tmp_path, snapshot_every=3)
+    for i in range(5):
+        store.add(_pending(f"i{i}"))
+        store.acknowledge(f"i{i}", f"b{i}")
+        ledger.record_fill(f"b{i}", Symbol("7203"), OrderSide.BUY, 100)
+        journal.sync()
+    store.mark_filled("b3")
+    store.remove("b0")
+    store.add(_pending("i5"))
+    journal.close()
+
+    assert any(path.name.startswith("snapshot.") for path in tmp_path.iterdir())
+    recovered, recovered_store, recovered_ledger = _open(tmp_path)
+    recovered.close()
+
+    assert [o.order_id for o in recovered_store.list()] == [
+        "b1",
+        "b2",
+        "b3",
+        "b4",
+        "i5",
+    ]
+    assert recovered_store.list()[2].is_filled is True
+    assert recovered_store.list()[-1].status is OrderStatus.PENDING
+    assert recovered_ledger.current_position(Symbol("7203")) == 5.0
+
+
+def test_torn_tail_is_dropped_on_recovery(tmp_path) -> None:
+    journal, store, _ = _open(tmp_path)
+    store.add(_pending("i0"))
+    store.add(_pending("i1"))
+    journal.close()
+    [journal_file] = list(tmp_path.glob("journal.*.bin"))
+    journal_file.write_bytes(journal_file.read_bytes()[:-3])
+
+    recovered, recovered_store, _ = _open(tmp_path)
+    recovered_store.add(_pending("i2"))
+    recovered.close()
+    _, reopened_store, _ = _open(tmp_path)
+
+    assert [o.order_id for o in reopened_store.list()] == ["i0", "i2"]
+
+
+class SymbolOrdersClient:
+    def __init__(self, broker_orders) -> None:
+        self.broker_orders = broker_orders
+
+    def list_symbol_orders(self, _api_key, symbol):
+        return [o for o in self.broker_orders if o["Symbol"] == symbol]
+
+
+def _recv_time(epoch_seconds: float) -> str:
+    return datetime.fromtimestamp(epoch_seconds, timezone.utc).isoformat()
+
+
+def test_orders_pending_at_crash_are_resolved_at_broker(tmp_path) -> None:
+    placed_at = time.time()
+    journal, store, _ = _open(tmp_path)
+    store.add(_pending("i0", placed_at))
+    store.add(_pending("i1", placed_at))
+    store.mark_unknown("i1")
+    store.add(_pending("legacy"))  # no placement time recorded
+    journal.close()  # crash before any /sendorder returned
+
+    recovered, recovered_store, _ = _open(tmp_path)
+    assert all(o.is_pending for o in recovered_store.list())
+    assert recovered_store.list()[0].placed_at == placed_at
+    same_order = {"Symbol": "7203", "Side": "2", "OrderQty": 100}
+    client = SymbolOrdersClient(
+        [
+            # An earlier, already filled and removed order must not match.
+            {**same_order, "ID": "old", "RecvTime": _recv_time(placed_at - 600)},
+            {**same_order, "ID": "b0", "RecvTime": _recv_time(placed_at + 0.2)},
+        ]
+    )
+    gateway = AsyncOrderGateway(
+        order_port=KabuOrderPort(client=client, api_key="k", base_payload={}),
+        order_store=recovered_store,
+        resolve_interval_seconds=0.01,
+        unknown_timeout_seconds=0.05,
+    )
+    deadline = time.monotonic() + 2.0
+    while any(o.is_pending for o in recovered_store.list()):
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+    gateway.close()
+    recovered.close()
+    _, reopened_store, _ = _open(tmp_path)
+
+    [order] = reopened_store.list()
+    assert order.order_id == "b0"
+    assert order.status is OrderStatus.ACKED
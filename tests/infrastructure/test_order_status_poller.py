@@ -0,0 +1,52 @@
+from my_scalping_kabu_station_example.application.service.order_handler import (
+    OrderHandler,
+)
+from my_scalping_kabu_station_example.domain.decision.signal import OrderSide
+from my_scalping_kabu_station_example.domain.market.types import Symbol
+from my_scalping_kabu_station_example.domain.order.realtime_order import RealTimeOrder
+from my_scalping_kabu_station_example.infrastructure.api.order_status_poller import (
+    OrderStatusPoller,
+)
+from my_scalping_kabu_station_example.infrastructure.memory.metrics import (
+    InMemoryMetrics,
+)
+from my_scalping_kabu_station_example.infrastructure.memory.order_store import (
+    InMemoryOrderStore,
+)
+
+
+class FlakyOrdersClient:
+    def list_orders(self, _api_key, order_id):
+        if order_id == "bad":
+            raise ConnectionError("connection reset")
+        return [{"ID": order_id, "OrderQty": 100, "CumQty": 100}]
+
+
+def _order(order_id: str) -> RealTimeOrder:
+    return RealTimeOrder(
+        symbol=Symbol("7203"),
+        qty=100,
+        side=OrderSide.BUY,
+        cash_margin=2,
+        order_id=order_id,
+        price=100.0,
+    )
+
+
+def test_failed_poll_is_counted_and_other_orders_still_refresh() -> None:
+    store = InMemoryOrderStore()
+    store.add(_order("bad"))
+    store.add(_order("good"))
+    metrics = InMemoryMetrics()
+    poller = OrderStatusPoller(
+        handler=OrderHandler(
+            order_store=store, broker_client=FlakyOrdersClient(), api_key="k"
+        ),
+        metrics=metrics,
+    )
+
+    assert poller.poll_once() == 1
+
+    filled = {order.order_id: order.is_filled for order in store.list()}
+    assert filled == {"bad": False, "good": True}
+    assert metrics.counters["orders.poll_failed"] == 1
@@ -0,0 +1,41 @@
+from my_scalping_kabu_station_example.domain.decision.signal import OrderSide
+from my_scalping_kabu_station_example.domain.market.types import Symbol
+from my_scalping_kabu_station_example.infrastructure.api.position_reconciler import (
+    PositionReconciler,
+)
+from my_scalping_kabu_station_example.infrastructure.memory.metrics import (
+    InMemoryMetrics,
+)
+from my_scalping_kabu_station_example.infrastructure.memory.position_ledger import (
+    PositionLedger,
+)
+
+
+class PositionsClient:
+    def __init__(self, positions) -> None:
+        self.positions = positions
+
+    def list_positions(self, _api_key):
+        return self.positions
+
+
+def test_reconcile_reports_drift_without_touching_ledger() -> None:
+    ledger = PositionLedger()
+    ledger.record_fill("o1", Symbol("7203"), OrderSide.BUY, 200)
+    ledger.record_fill("o2", Symbol("6758"), OrderSide.SELL, 100)
+    client = PositionsClient(
+        [
+            {"Symbol": "7203", "Side": "2", "LeavesQty": 200},
+            {"Symbol": "6758", "Side": "1", "LeavesQty": 300},
+        ]
+    )
+    metrics = InMemoryMetrics()
+    reconciler = PositionReconciler(
+        ledger=ledger, broker_client=client, api_key="k", metrics=metrics
+    )
+
+    drift = reconciler.reconcile_once()
+
+    assert drift == {Symbol("6758"): -200.0}
+    assert metrics.counters["positions.drift"] == 1
+    assert ledger.current_position(Symbol("6758")) == -1.0
@@ -0,0 +1,91 @@
+import threading
+import time
+
+from my_scalping_kabu_station_example.infrastructure.api.request_scheduler import (
+    RequestPriority,
+    RequestScheduler,
+    TokenBucket,
+)
+from my_scalping_kabu_station_example.infrastructure.memory.metrics import (
+    InMemoryMetrics,
+)
+
+
+def _wait_until(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_token_bucket_refills_at_rate() -> None:
+    bucket = TokenBucket(rate_per_second=2.0, burst=2.0)
+
+    bucket.take(0.0)
+    bucket.take(0.0)
+
+    assert bucket.wait_time(0.0) == 0.5
+    assert bucket.wait_time(0.5) == 0.0
+
+
+def test_exit_overtakes_queued_polls_on_shared_bucket() -> None:
+    metrics = InMemoryMetrics()
+    scheduler = RequestScheduler(
+        buckets={"api": TokenBucket(rate_per_second=20.0)},
+        routes={"sendorder": ("api",), "orders": ("api",)},
+        metrics=metrics,
+    )
+    served = []
+    scheduler.call("orders", RequestPriority.POLL, lambda: served.append("first"))
+
+    poll = threading.Thread(
+        target=scheduler.call,
+        args=("orders", RequestPriority.POLL, lambda: served.append("poll")),
+    )
+    poll.start()
+    _wait_until(lambda: scheduler.waiting == 1)
+    exit_order = threading.Thread(
+        target=scheduler.call,
+        args=("sendorder", RequestPriority.EXIT, lambda: served.append("exit")),
+    )
+    exit_order.start()
+    poll.join()
+    exit_order.join()
+
+    assert served == ["first", "exit", "poll"]
+    assert len(metrics.timings["scheduler.queue_delay_ms.poll"]) == 2
+
+
+def test_duplicate_status_polls_share_one_call() -> None:
+    metrics = InMemoryMetrics()
+    scheduler = RequestScheduler(
+        buckets={"info": TokenBucket(rate_per_second=10.0)},
+        routes={"orders": ("info",)},
+        metrics=metrics,
+    )
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(2.0)
+        return ["status"]
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                scheduler.call("orders", RequestPriority.POLL, fetch, coalesce_key="o1")
+            )
+        )
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    _wait_until(lambda: metrics.counters.get("scheduler.coalesced") == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == [["status"]] * 3
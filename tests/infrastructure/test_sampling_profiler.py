@@ -0,0 +1,59 @@
+import threading
+import time
+
+from my_scalping_kabu_station_example.infrastructure.main.sampling_profiler import (
+    SamplingProfiler,
+)
+
+
+def _busy_features(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sum(i * i for i in range(200))
+
+
+def test_toggle_samples_tagged_stacks_and_writes_collapsed_file(tmp_path) -> None:
+    profiler = SamplingProfiler(
+        output_dir=tmp_path,
+        interval_seconds=0.001,
+        poll_seconds=0.01,
+        thread_id=threading.get_ident(),
+        stage_of=lambda: "features",
+    )
+    profiler.start()
+    try:
+        profiler.toggle()
+        _busy_features(0.3)
+        profiler.toggle()
+        deadline = time.monotonic() + 2.0
+        while not list(tmp_path.iterdir()) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        profiler.stop()
+
+    (path,) = tmp_path.iterdir()
+    lines = path.read_text().splitlines()
+    assert lines
+    _, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert all(line.startswith("features;") for line in lines)
+    assert any("_busy_features" in line for line in lines)
+
+
+def test_control_file_switches_profiling(tmp_path) -> None:
+    control = tmp_path / "profile.on"
+    profiler = SamplingProfiler(
+        output_dir=tmp_path / "out", control_path=control, poll_seconds=0.01
+    )
+    profiler.start()
+    try:
+        assert profiler.active is False
+        control.touch()
+        deadline = time.monotonic() + 2.0
+        while not profiler.active and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert profiler.active is True
+    finally:
+        written = profiler.stop()
+
+    assert written is not None and written.exists()
@@ -0,0 +1,60 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from my_scalping_kabu_station_example.infrastructure.main.startup_profile import (
+    PHASE_IMPORT,
+    PHASE_INIT,
+    StartupProfile,
+)
+from my_scalping_kabu_station_example.infrastructure.memory.metrics import (
+    InMemoryMetrics,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_profile_records_phases_and_first_tick_once() -> None:
+    clock = _Clock()
+    metrics = InMemoryMetrics()
+    profile = StartupProfile(target_ms=100.0, metrics=metrics, clock=clock)
+
+    with profile.imports("broker api"):
+        clock.now += 0.030
+    with profile.phase("model store"):
+        clock.now += 0.050
+    clock.now += 0.040
+    profile.first_tick()
+    clock.now += 1.0
+    profile.first_tick()
+
+    assert [(p.name, p.kind) for p in profile.phases] == [
+        ("broker api", PHASE_IMPORT),
+        ("model store", PHASE_INIT),
+    ]
+    assert round(profile.phases[1].elapsed_ms, 6) == 50.0
+    assert round(profile.first_tick_ms, 6) == 120.0
+    assert metrics.timings["startup.first_tick_ms"] == [profile.first_tick_ms]
+    assert profile.report()[-1].startswith("startup total")
+
+
+def test_app_main_import_skips_heavy_dependencies() -> None:
+    code = (
+        "import sys, app_main; "
+        "print(sorted(m for m in ('requests', 'numpy', 'xgboost', 'websockets') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[2] / "src",
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+
+from my_scalping_kabu_station_example.domain.features.expr import MicroPrice
+from my_scalping_kabu_station_example.domain.features.spec import (
+    FeatureDef,
+    FeatureSpec,
+)
+from my_scalping_kabu_station_example.domain.market.level import Level
+from my_scalping_kabu_station_example.domain.market.orderbook_snapshot import (
+    OrderBookSnapshot,
+)
+from my_scalping_kabu_station_example.domain.market.time import Timestamp
+from my_scalping_kabu_station_example.domain.market.types import (
+    Quantity,
+    Symbol,
+    price_key_from,
+)
+from my_scalping_kabu_station_example.infrastructure.main.training_bootstrap import (
+    train_models_from_history,
+)
+from my_scalping_kabu_station_example.infrastructure.persistence.csv_history_store import (
+    CsvHistoryStore,
+)
+
+
+def _make_snapshot(ts: datetime, bid: float) -> OrderBookSnapshot:
+    return OrderBookSnapshot(
+        ts=Timestamp(ts),
+        symbol=Symbol("AAA"),
+        bid_levels=[Level(price_key_from(bid), Quantity(1.0))],
+        ask_levels=[Level(price_key_from(bid + 0.5), Quantity(2.0))],
+    )
+
+
+def test_train_models_skips_symbols_with_model_for_training_day(
+    tmp_path, monkeypatch
+) -> None:
+    monkeypatch.setenv("HISTORY_PATH", str(tmp_path / "history"))
+    monkeypatch.setenv("MODEL_DIR", str(tmp_path / "models"))
+    monkeypatch.setenv("TRAINING_WORKERS", "1")
+    spec = FeatureSpec.from_features(
+        version="v1",
+        eps=1e-9,
+        params={},
+        features=[FeatureDef("microprice", MicroPrice(eps=1e-9))],
+    )
+    store = CsvHistoryStore(path=tmp_path / "history")
+    ts0 = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    for i in range(30):
+        store.append(_make_snapshot(ts0 + timedelta(seconds=5 * i), 100.0 + i % 3))
+    asof = datetime(2024, 1, 2, 8, tzinfo=timezone.utc)
+
+    first = train_models_from_history(asof=asof, feature_spec=spec, skip_existing=True)
+    second = train_models_from_history(asof=asof, feature_spec=spec, skip_existing=True)
+
+    assert [report.symbol for report in first] == ["AAA"]
+    assert first[0].ok
+    assert second == []
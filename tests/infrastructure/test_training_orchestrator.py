@@ -0,0 +1,113 @@
+from datetime import date, datetime, timedelta, timezone
+
+from my_scalping_kabu_station_example.domain.features.expr import MicroPrice
+from my_scalping_kabu_station_example.domain.features.spec import (
+    FeatureDef,
+    FeatureSpec,
+)
+from my_scalping_kabu_station_example.domain.market.level import Level
+from my_scalping_kabu_station_example.domain.market.orderbook_snapshot import (
+    OrderBookSnapshot,
+)
+from my_scalping_kabu_station_example.domain.market.time import Timestamp
+from my_scalping_kabu_station_example.domain.market.types import (
+    Quantity,
+    Symbol,
+    price_key_from,
+)
+from my_scalping_kabu_station_example.infrastructure.main.training_orchestrator import (
+    TrainingOrchestrator,
+)
+from my_scalping_kabu_station_example.infrastructure.persistence.csv_history_store import (
+    CsvHistoryStore,
+)
+from my_scalping_kabu_station_example.infrastructure.persistence.model_artifact_store import (
+    ModelArtifactStore,
+)
+
+
+def _make_snapshot(ts: datetime, symbol: str, bid: float) -> OrderBookSnapshot:
+    return OrderBookSnapshot(
+        ts=Timestamp(ts),
+        symbol=Symbol(symbol),
+        bid_levels=[Level(price_key_from(bid), Quantity(1.0))],
+        ask_levels=[Level(price_key_from(bid + 0.5), Quantity(2.0))],
+    )
+
+
+def test_orchestrator_trains_symbols_in_parallel_and_isolates_failures(
+    tmp_path,
+) -> None:
+    spec = FeatureSpec.from_features(
+        version="v1",
+        eps=1e-9,
+        params={},
+        features=[FeatureDef("microprice", MicroPrice(eps=1e-9))],
+    )
+    history_path = tmp_path / "history"
+    store = CsvHistoryStore(path=history_path)
+    ts0 = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    for i in range(40):
+        ts = ts0 + timedelta(seconds=5 * i)
+        store.append(_make_snapshot(ts, "AAA", 100.0 + (i % 3)))
+        store.append(_make_snapshot(ts, "BBB", 200.0 - (i % 4)))
+    store.append(_make_snapshot(ts0, "CCC", 300.0))
+    orchestrator = TrainingOrchestrator(
+        history_path=history_path,
+        model_dir=tmp_path / "models",
+        spec=spec,
+        max_workers=2,
+        trainer_params={"n_estimators": 5, "max_depth": 2},
+    )
+
+    reports = orchestrator.run(date(2024, 1, 1), ["AAA", "BBB", "CCC"])
+
+    by_symbol = {report.symbol: report for report in reports}
+    assert by_symbol["AAA"].ok and by_symbol["AAA"].rows == 40
+    assert by_symbol["BBB"].ok
+    assert not by_symbol["CCC"].ok
+    assert "Dataset is empty" in by_symbol["CCC"].error
+    active = ModelArtifactStore(base_dir=tmp_path / "models" / "AAA", spec=spec)
+    assert active.active_manifest() is not None
+    # Training never rewrites the recorder's hourly files by default.
+    assert len(store.hourly_files(date(2024, 1, 1))) == 1
+    assert store.symbols_in_range(ts0, ts0 + timedelta(hours=1)) == [
+        "AAA",
+        "BBB",
+        "CCC",
+    ]
+
+
+def test_orchestrator_streams_multi_day_lookback(tmp_path) -> None:
+    spec = FeatureSpec.from_features(
+        version="v1",
+        eps=1e-9,
+        params={},
+        features=[FeatureDef("microprice", MicroPrice(eps=1e-9))],
+    )
+    history_path = tmp_path / "history"
+    store = CsvHistoryStore(path=history_path)
+    days = [date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 3)]
+    for day in days:
+        ts0 = datetime(day.year, day.month, day.day, 9, tzinfo=timezone.utc)
+        for i in range(30):
+            ts = ts0 + timedelta(seconds=5 * i)
+            store.append(_make_snapshot(ts, "AAA", 100.0 + (i % 3)))
+    orchestrator = TrainingOrchestrator(
+        history_path=history_path,
+        model_dir=tmp_path / "models",
+        spec=spec,
+        trainer_params={"n_estimators": 5, "max_depth": 2},
+        external_memory_dir=tmp_path / "xgb-cache",
+    )
+
+    (report,) = orchestrator.run(days[-1], ["AAA"], lookback=days)
+
+    assert report.ok, report.error
+    assert report.rows == 90
+    manifest = ModelArtifactStore(
+        base_dir=tmp_path / "models" / "AAA", spec=spec
+    ).active_manifest()
+    assert manifest.training_start.startswith("2024-01-01")
+    assert manifest.training_end.startswith("2024-01-03")
+    assert manifest.metrics["n_rows"] == 84
@@ -0,0 +1,86 @@
+import csv
+from datetime import date, datetime, timedelta, timezone
+
+from my_scalping_kabu_station_example.domain.features.expr import MicroPrice
+from my_scalping_kabu_station_example.domain.features.spec import (
+    FeatureDef,
+    FeatureSpec,
+)
+from my_scalping_kabu_station_example.domain.market.level import Level
+from my_scalping_kabu_station_example.domain.market.orderbook_snapshot import (
+    OrderBookSnapshot,
+)
+from my_scalping_kabu_station_example.domain.market.time import Timestamp
+from my_scalping_kabu_station_example.domain.market.types import (
+    Quantity,
+    Symbol,
+    price_key_from,
+)
+from my_scalping_kabu_station_example.infrastructure.main.walk_forward import (
+    WalkForwardGrid,
+    WalkForwardRunner,
+    walk_forward_windows,
+    write_walk_forward_report,
+)
+from my_scalping_kabu_station_example.infrastructure.persistence.csv_history_store import (
+    CsvHistoryStore,
+)
+
+
+def _make_snapshot(ts: datetime, bid: float, bid_qty: float) -> OrderBookSnapshot:
+    return OrderBookSnapshot(
+        ts=Timestamp(ts),
+        symbol=Symbol("AAA"),
+        bid_levels=[Level(price_key_from(bid), Quantity(bid_qty))],
+        ask_levels=[Level(price_key_from(bid + 0.5), Quantity(2.0))],
+    )
+
+
+def test_walk_forward_windows_use_preceding_available_days() -> None:
+    days = [date(2024, 1, d) for d in (2, 3, 5, 8)]
+
+    windows = walk_forward_windows(days, train_window_days=2)
+
+    assert windows == [
+        ((date(2024, 1, 2), date(2024, 1, 3)), date(2024, 1, 5)),
+        ((date(2024, 1, 3), date(2024, 1, 5)), date(2024, 1, 8)),
+    ]
+
+
+def test_runner_sweeps_grid_and_writes_report(tmp_path) -> None:
+    spec = FeatureSpec.from_features(
+        version="v1",
+        eps=1e-9,
+        params={},
+        features=[FeatureDef("microprice", MicroPrice(eps=1e-9))],
+    )
+    store = CsvHistoryStore(path=tmp_path / "history")
+    for day in (1, 2, 3):
+        ts0 = datetime(2024, 1, day, 9, tzinfo=timezone.utc)
+        for i in range(60):
+            store.append(
+                _make_snapshot(ts0 + timedelta(seconds=i), 100.0 + (i % 4), 1.0 + i % 3)
+            )
+    runner = WalkForwardRunner(
+        history_path=tmp_path / "history",
+        feature_cache_dir=tmp_path / "cache",
+        spec=spec,
+        grid=WalkForwardGrid(
+            trainer_params={"n_estimators": [3, 5], "max_depth": [2]},
+            label_horizons=(1.0,),
+            score_thresholds=(0.0, 0.6),
+        ),
+        train_window_days=2,
+    )
+
+    results = runner.run(["AAA"])
+    write_walk_forward_report(tmp_path / "report.csv", results)
+
+    assert len(results) == 4
+    assert all(result.error is None for result in results)
+    assert {result.test_day for result in results} == {"2024-01-03"}
+    assert results[0].train_rows == 118 and results[0].test_rows == 59
+    assert results[0].trades == 59
+    with (tmp_path / "report.csv").open() as f:
+        rows = list(csv.DictReader(f))
+    assert [row["score_threshold"] for row in rows] == ["0.0", "0.6", "0.0", "0.6"]
@@ -0,0 +1,157 @@
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+
+from my_scalping_kabu_station_example.application.service.pipelines.inference_pipeline import (
+    InferencePipeline,
+)
+from my_scalping_kabu_station_example.application.service.state.stream_state import (
+    StreamState,
+)
+from my_scalping_kabu_station_example.domain.decision.policy import DecisionPolicy
+from my_scalping_kabu_station_example.domain.decision.risk import RiskParams
+from my_scalping_kabu_station_example.domain.decision.signal import InferenceResult
+from my_scalping_kabu_station_example.domain.features.expr import (
+    DepletionSum,
+    MicroPrice,
+    TimeDecayEma,
+)
+from my_scalping_kabu_station_example.domain.features.spec import (
+    FeatureDef,
+    FeatureSpec,
+)
+from my_scalping_kabu_station_example.domain.market.types import Side
+from my_scalping_kabu_station_example.infrastructure.compute.feature_engine_pandas import (
+    PandasOrderBookFeatureEngine,
+)
+from my_scalping_kabu_station_example.infrastructure.main.warmup import WarmUp
+from my_scalping_kabu_station_example.infrastructure.memory.metrics import (
+    InMemoryMetrics,
+)
+from my_scalping_kabu_station_example.infrastructure.memory.order_port import (
+    InMemoryOrderPort,
+)
+from my_scalping_kabu_station_example.infrastructure.memory.position_port import (
+    InMemoryPositionPort,
+)
+from my_scalping_kabu_station_example.infrastructure.memory.ring_buffer import (
+    InMemoryMarketBuffer,
+)
+from my_scalping_kabu_station_example.infrastructure.persistence.csv_history_store import (
+    CsvHistoryStore,
+)
+from my_scalping_kabu_station_example.infrastructure.persistence.model_store_memory import (
+    InMemoryModelStore,
+)
+from my_scalping_kabu_station_example.infrastructure.websocket.market_data import (
+    WebSocketMarketDataSource,
+)
+from tests.helpers.mock_ws_client import MockWebSocketClient
+
+_SPEC = FeatureSpec.from_features(
+    version="v1",
+    eps=1e-9,
+    params={},
+    features=[
+        FeatureDef(name="microprice", expr=MicroPrice(eps=1e-9)),
+        FeatureDef(
+            name="depletion_ema",
+            expr=TimeDecayEma(DepletionSum(Side.BID), tau_seconds=1.0),
+        ),
+    ],
+)
+_POLICY = DecisionPolicy(score_threshold=0.5, lot_size=1.0)
+_RISK = RiskParams(max_position=1.0, stop_loss=1.0, take_profit=1.0)
+
+
+class _CountingPredictor:
+    def __init__(self, score: float = 0.0) -> None:
+        self.calls = 0
+        self.score = score
+
+    def predict(self, features: dict[str, float]) -> InferenceResult:
+        self.calls += 1
+        return InferenceResult(features=features, score=self.score)
+
+
+def test_warmup_runs_every_path_and_survives_failing_steps(tmp_path) -> None:
+    model_store = InMemoryModelStore()
+    predictor = _CountingPredictor()
+    model_store.swap_active(predictor)
+    history_store = CsvHistoryStore(path=tmp_path / "history.csv")
+    now = datetime.now(timezone.utc)
+
+    def broken() -> None:
+        raise ConnectionError("broker down")
+
+    warmup = WarmUp(
+        feature_engine=PandasOrderBookFeatureEngine(),
+        model_store=model_store,
+        feature_spec=_SPEC,
+        decision_policy=_POLICY,
+        risk_params=_RISK,
+        steps=[
+            (
+                "history writer",
+                lambda: history_store.prepare(int(now.timestamp() * 1e9)),
+            ),
+            ("broker http", broken),
+        ],
+        ticks=9,
+    )
+
+    warmup.run()
+
+    assert warmup.ready.is_set()
+    assert predictor.calls == 9
+    assert warmup.failures == ["broker http"]
+    assert set(warmup.timings_ms) == {"model WARMUP", "history writer", "broker http"}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_pipeline_ingests_but_does_not_trade_before_ready(tmp_path) -> None:
+    ts = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    messages = [
+        json.dumps(
+            {
+                "ts": (ts + timedelta(seconds=i)).isoformat(),
+                "symbol": "TEST",
+                "bids": [[str(100.0 + i), 1.0]],
+                "asks": [[str(100.5 + i), 2.0]],
+            }
+        )
+        for i in range(2)
+    ]
+    market_data = WebSocketMarketDataSource(
+        client=MockWebSocketClient(messages=messages)
+    )
+    market_data.subscribe()
+    model_store = InMemoryModelStore()
+    model_store.swap_active(_CountingPredictor(score=1.0))
+    order_port = InMemoryOrderPort()
+    metrics = InMemoryMetrics()
+    ready = threading.Event()
+    pipeline = InferencePipeline(
+        market_data=market_data,
+        history_store=CsvHistoryStore(path=tmp_path / "history.csv"),
+        buffer=InMemoryMarketBuffer(),
+        feature_engine=PandasOrderBookFeatureEngine(),
+        model_store=model_store,
+        order_port=order_port,
+        position_port=InMemoryPositionPort(position=0.0),
+        feature_spec=_SPEC,
+        decision_policy=_POLICY,
+        risk_params=_RISK,
+        metrics=metrics,
+        ready=ready,
+    )
+    state = StreamState()
+
+    pipeline.run_once(state)
+    assert order_port.intents == []
+    assert metrics.counters["inference.warming_up"] == 1
+    assert state.prev_snapshot is not None
+
+    ready.set()
+    pipeline.run_once(state)
+    assert len(order_port.intents) == 1
@@ -20,3 +20,14 @@ def test_to_domain_sorts_levels_and_builds_snapshot() -> None:
     assert snapshot.best_ask_price == price_key_from("100.5")
     assert snapshot.bid_levels[0].price == price_key_from("100.0")
     assert snapshot.ask_levels[0].price == price_key_from("100.5")
+
+
+def test_to_domain_accepts_iso_and_epoch_ns_timestamps() -> None:
+    ts = datetime(2024, 1, 1, 9, 0, 0, 123456, tzinfo=timezone.utc)
+    expected_ns = 1704099600123456000
+
+    from_iso = to_domain(OrderBookDto(ts=ts.isoformat(), symbol="T", bids=[], asks=[]))
+    from_ns = to_domain(OrderBookDto(ts=expected_ns, symbol="T", bids=[], asks=[]))
+
+    assert from_iso.ts_ns == from_ns.ts_ns == expected_ns
+    assert from_ns.ts == ts
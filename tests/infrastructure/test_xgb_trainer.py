@@ -1,5 +1,10 @@
 import math
 
+import numpy as np
+
+from my_scalping_kabu_station_example.application.service.dataset import (
+    TrainingDataset,
+)
 from my_scalping_kabu_station_example.domain.features.expr import Const
 from my_scalping_kabu_station_example.domain.features.spec import (
     FeatureDef,
@@ -49,3 +54,25 @@ def test_xgb_trainer_returns_default_predictor_without_labels() -> None:
     assert predictor.model is None
     result = predictor.predict({"a": 0.3})
     assert result.score == 0.25
+
+
+def test_xgb_trainer_accepts_dense_dataset() -> None:
+    spec = FeatureSpec.from_features(
+        version="v1",
+        eps=1e-9,
+        params={},
+        features=[FeatureDef("a", Const(1.0)), FeatureDef("b", Const(2.0))],
+    )
+    dataset = TrainingDataset(
+        feature_names=["a", "b"],
+        features=np.array([[0.1, 0.2], [0.2, 0.4], [0.3, 0.1]], dtype=np.float32),
+        timestamps_ns=np.arange(3, dtype=np.int64),
+        labels=np.array([0.0, 1.0, 1.0]),
+    )
+
+    predictor = XgbTrainer(params={"n_estimators": 5, "max_depth": 2}).train(
+        spec, dataset
+    )
+
+    assert predictor.model is not None
+    assert 0.0 <= predictor.predict({"a": 0.15, "b": 0.25}).score <= 1.0